@@ -0,0 +1,76 @@
+"""Compare per-frame server CPU for the JSON and binary browser transports.
+
+Usage:
+    python3 -m scripts.bench_browser_transport [--frames 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import time
+
+import numpy as np
+
+from src.api.voice.browser_protocol import pack_audio_frame, unpack_audio_frame
+
+INBOUND_BYTES = 4096 * 2  # one ScriptProcessor buffer of 48 kHz PCM16
+OUTBOUND_BYTES = 1600  # 200 ms of 8 kHz μ-law from TTS
+
+
+def _per_frame_us(start: float, frames: int) -> float:
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    inbound = rng.bytes(INBOUND_BYTES)
+    outbound = rng.bytes(OUTBOUND_BYTES)
+
+    json_in = json.dumps(
+        {"event": "media", "media": {"payload": base64.b64encode(inbound).decode()}}
+    )
+    binary_in = pack_audio_frame(0, inbound)
+    json_out = json.dumps(
+        {"event": "media", "media": {"payload": base64.b64encode(outbound).decode()}}
+    )
+
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        base64.b64decode(json.loads(json_in)["media"]["payload"])
+    json_recv = _per_frame_us(start, args.frames)
+
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        unpack_audio_frame(binary_in)
+    binary_recv = _per_frame_us(start, args.frames)
+
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        payload = base64.b64encode(outbound).decode("ascii")
+        json.dumps({"event": "media", "media": {"payload": payload}})
+    json_send = _per_frame_us(start, args.frames)
+
+    start = time.perf_counter()
+    for seq in range(args.frames):
+        pack_audio_frame(seq, outbound)
+    binary_send = _per_frame_us(start, args.frames)
+
+    print(f"{'':>8} {'recv us':>10} {'send us':>10} {'in bytes':>10} {'out bytes':>10}")
+    print(
+        f"{'json':>8} {json_recv:>10.2f} {json_send:>10.2f} "
+        f"{len(json_in):>10} {len(json_out):>10}"
+    )
+    print(
+        f"{'binary':>8} {binary_recv:>10.2f} {binary_send:>10.2f} "
+        f"{len(binary_in):>10} {len(pack_audio_frame(0, outbound)):>10}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare μ-law codec throughput: NumPy tables vs audioop.
+
+The codec uses audioop where the interpreter still has it and falls back to
+the tables (Python 3.13+); this shows what the fallback costs.
+
+Usage:
+    python3 -m scripts.bench_codec [--frames 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import warnings
+from collections.abc import Callable
+from unittest.mock import patch
+
+import numpy as np
+
+from src.api.voice import codec as codec_module
+from src.api.voice.codec import MulawCodec
+
+FRAME_SAMPLES = 160  # 20 ms at 8 kHz, one Twilio media frame
+
+
+def _frames_per_sec(fn: Callable[[bytes], object], frame: bytes, frames: int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn(frame)
+    return frames / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    mulaw_frame = rng.integers(0, 256, FRAME_SAMPLES, dtype=np.uint8).tobytes()
+    pcm_frame = rng.integers(-32768, 32768, FRAME_SAMPLES, dtype=np.int16).tobytes()
+
+    # Force the table path regardless of what this interpreter has.
+    with patch.object(codec_module, "audioop", None):
+        codec = MulawCodec(max_frame_samples=FRAME_SAMPLES)
+        results = {
+            "table decode": _frames_per_sec(codec.decode, mulaw_frame, args.frames),
+            "table encode": _frames_per_sec(codec.encode, pcm_frame, args.frames),
+        }
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            import audioop
+        except ImportError:
+            audioop = None  # type: ignore[assignment]
+
+    if audioop is not None:
+        results["audioop decode"] = _frames_per_sec(
+            lambda f: audioop.ulaw2lin(f, 2), mulaw_frame, args.frames
+        )
+        results["audioop encode"] = _frames_per_sec(
+            lambda f: audioop.lin2ulaw(f, 2), pcm_frame, args.frames
+        )
+    else:
+        print("audioop unavailable on this interpreter; skipping baseline")
+
+    for name, fps in results.items():
+        print(f"{name:>15}: {fps:>12,.0f} frames/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measure event-loop cost of idle calls waiting on transcripts and TTS audio.
+
+Each simulated call has one transcript consumer and one audio consumer that
+receive nothing for the whole run, which is what a silent caller looks like.
+"polling" reproduces the previous wait_for(queue.get(), timeout) loops;
+"event" uses ClosableQueue.stream().
+
+Usage:
+    python3 -m scripts.bench_idle_streams [--calls 1000] [--seconds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Callable
+from typing import Any
+
+from src.api.voice.streams import ClosableQueue
+
+TRANSCRIPT_POLL = 0.1
+AUDIO_POLL = 0.5
+
+
+class CountingLoop(asyncio.SelectorEventLoop):
+    def __init__(self) -> None:
+        super().__init__()
+        self.iterations = 0
+        self.timers = 0
+
+    def _run_once(self) -> None:
+        self.iterations += 1
+        super()._run_once()  # type: ignore[misc]
+
+    def call_at(  # type: ignore[override]
+        self, when: float, callback: Callable[..., Any], *args: Any, **kw: Any
+    ) -> asyncio.TimerHandle:
+        self.timers += 1
+        return super().call_at(when, callback, *args, **kw)
+
+
+class Polling:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self.running = True
+
+    async def stream(self, timeout: float) -> AsyncGenerator[bytes, None]:
+        while self.running or not self.queue.empty():
+            try:
+                yield await asyncio.wait_for(self.queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                continue
+
+    def close(self) -> None:
+        self.running = False
+
+
+async def _consume(stream: AsyncGenerator[bytes, None]) -> None:
+    async for _ in stream:
+        pass
+
+
+async def _idle_calls(mode: str, calls: int, seconds: float) -> None:
+    tasks = []
+    closers: list[Callable[[], None]] = []
+    for _ in range(calls):
+        if mode == "polling":
+            polled = Polling(), Polling()
+            streams = [polled[0].stream(TRANSCRIPT_POLL), polled[1].stream(AUDIO_POLL)]
+            closers += [p.close for p in polled]
+        else:
+            queues = ClosableQueue[bytes](), ClosableQueue[bytes]()
+            streams = [q.stream() for q in queues]
+            closers += [q.close for q in queues]
+        tasks += [asyncio.create_task(_consume(s)) for s in streams]
+
+    await asyncio.sleep(seconds)
+    for close in closers:
+        close()
+    await asyncio.gather(*tasks)
+
+
+def _run(mode: str, calls: int, seconds: float) -> None:
+    loop = CountingLoop()
+    try:
+        start = time.process_time()
+        loop.run_until_complete(_idle_calls(mode, calls, seconds))
+        cpu = time.process_time() - start
+    finally:
+        loop.close()
+    print(
+        f"{mode:>8}: {cpu / seconds * 100:>6.1f}% CPU, "
+        f"{loop.iterations / seconds:>9,.0f} loop iterations/s, "
+        f"{loop.timers / seconds:>9,.0f} timers/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.calls} idle calls for {args.seconds:g}s:")
+    for mode in ("polling", "event"):
+        _run(mode, args.calls, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Accuracy vs latency of the local intent tier against the LLM classifier.
+
+Scores the labeled eval set (one {"text", "intent"} JSON object per line,
+labels from VALID_INTENTS) with the keyword rules, the local model, and the
+hybrid used by classify_and_extract at a range of confidence thresholds.
+An utterance the hybrid does not settle locally is charged one LLM call.
+By default LLM calls are assumed to take --llm-ms and to be right; with
+--live each eval utterance is sent to the configured OpenAI endpoint once
+and its measured latency and accuracy are used instead.
+
+Usage:
+    python3 -m scripts.bench_intent_classifier [--eval PATH] [--model PATH]
+        [--llm-ms 450] [--live]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.api.agents.intent_classifier import (
+    DEFAULT_MODEL_PATH,
+    LOCAL_INTENTS,
+    RULE_CONFIDENCE,
+    VALID_INTENTS,
+    LocalIntentClassifier,
+    classify_and_extract,
+    match_intent_rule,
+)
+from src.api.config import settings
+
+DEFAULT_EVAL_PATH = DEFAULT_MODEL_PATH.parent / "intent_eval.jsonl"
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99)
+CALIBRATION_BINS = 10
+TIMING_ROUNDS = 50
+
+
+def _load(path: Path) -> tuple[list[str], list[str]]:
+    texts, intents = [], []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                example = json.loads(line)
+                if example["intent"] not in VALID_INTENTS:
+                    raise ValueError(f"Unknown intent in eval set: {example}")
+                texts.append(example["text"])
+                intents.append(example["intent"])
+    return texts, intents
+
+
+def _local_us(model: LocalIntentClassifier, texts: list[str]) -> float:
+    started = time.perf_counter()
+    for _ in range(TIMING_ROUNDS):
+        for text in texts:
+            if match_intent_rule(text) is None:
+                model.predict(text)
+    return (time.perf_counter() - started) / (TIMING_ROUNDS * len(texts)) * 1e6
+
+
+async def _llm(texts: list[str]) -> tuple[list[str], list[float]]:
+    settings.intent_local_enabled = False
+    predicted, latencies = [], []
+    for text in texts:
+        started = time.perf_counter()
+        intent, _ = await classify_and_extract(text)
+        latencies.append((time.perf_counter() - started) * 1000)
+        predicted.append(intent)
+    return predicted, latencies
+
+
+def _calibration_error(confidences: np.ndarray, correct: np.ndarray) -> float:
+    # Expected calibration error: the gap between stated confidence and
+    # accuracy, averaged over equal-width confidence bins.
+    edges = np.linspace(0, 1, CALIBRATION_BINS + 1)
+    bins = np.clip(np.digitize(confidences, edges) - 1, 0, CALIBRATION_BINS - 1)
+    error = 0.0
+    for b in range(CALIBRATION_BINS):
+        mask = bins == b
+        if mask.any():
+            gap = abs(confidences[mask].mean() - correct[mask].mean())
+            error += mask.mean() * gap
+    return float(error)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--eval", type=Path, default=DEFAULT_EVAL_PATH)
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--llm-ms", type=float, default=450.0)
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    texts, truth = _load(args.eval)
+    model = LocalIntentClassifier.load(args.model)
+    local_us = _local_us(model, texts)
+
+    rules = [match_intent_rule(text) for text in texts]
+    predictions = [model.predict(text) for text in texts]
+    local = [rule or p.intent for rule, p in zip(rules, predictions)]
+    confidences = np.array(
+        [
+            RULE_CONFIDENCE if rule else p.confidence
+            for rule, p in zip(rules, predictions)
+        ]
+    )
+    correct = np.array([p == t for p, t in zip(local, truth)])
+
+    if args.live:
+        llm, latencies = asyncio.run(_llm(texts))
+        llm_correct = np.array([p == t for p, t in zip(llm, truth)])
+        llm_ms = np.array(latencies)
+    else:
+        llm_correct = np.ones(len(texts), dtype=bool)
+        llm_ms = np.full(len(texts), args.llm_ms)
+
+    n = len(texts)
+    ruled = np.array([rule is not None for rule in rules])
+    print(f"{n} eval utterances, local tier {local_us:.0f} us/utterance")
+    print(
+        f"rules: settle {ruled.mean():.0%}, "
+        f"precision {correct[ruled].mean() if ruled.any() else 0:.1%}"
+    )
+    print(
+        f"local model alone: accuracy {correct.mean():.1%}, "
+        f"calibration error {_calibration_error(confidences, correct):.3f}"
+    )
+    source = "measured" if args.live else "assumed correct"
+    print(
+        f"LLM only ({source}): accuracy {llm_correct.mean():.1%}, "
+        f"mean {llm_ms.mean():.0f} ms"
+    )
+    print(
+        f"{'threshold':>9}  {'local':>6}  {'local acc':>9}  "
+        f"{'accuracy':>8}  {'mean ms':>7}"
+    )
+    for threshold in THRESHOLDS:
+        # Rules always settle; the model only for LOCAL_INTENTS.
+        settled = ruled | np.array(
+            [i in LOCAL_INTENTS and c >= threshold for i, c in zip(local, confidences)]
+        )
+        hybrid_correct = np.where(settled, correct, llm_correct)
+        mean_ms = np.where(settled, local_us / 1000, llm_ms + local_us / 1000).mean()
+        local_acc = f"{correct[settled].mean():.1%}" if settled.any() else "-"
+        print(
+            f"{threshold:>9.2f}  {settled.mean():>6.0%}  {local_acc:>9}  "
+            f"{hybrid_correct.mean():>8.1%}  {mean_ms:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Measure streaming resampler throughput and quality against audioop.ratecv.
+
+ratecv is faster per frame but interpolates linearly with no low-pass, so
+downsampling folds energy above the new Nyquist back into the speech band.
+Quality is measured with pure tones fed through in 20 ms frames:
+"passband SNR" is the energy at an in-band tone over everything else in the
+output, and "alias" is the output level for a tone the target rate cannot
+represent, which an ideal resampler removes entirely.
+
+Usage:
+    python3 -m scripts.bench_resampler [--seconds 60]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import warnings
+from collections.abc import Callable
+
+import numpy as np
+
+from src.api.voice.resampler import COMMON_RATES, StreamingResampler
+
+FRAME_MS = 20
+TONE_SECONDS = 2
+SETTLE_MS = 100
+PASSBAND_HZ = 1000
+ALIAS_NYQUIST_RATIO = 1.35
+
+
+def _frames(in_rate: int, seconds: int) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    samples_per_frame = in_rate * FRAME_MS // 1000
+    count = seconds * 1000 // FRAME_MS
+    audio = rng.integers(-8000, 8000, samples_per_frame * count, dtype=np.int16)
+    return [
+        audio[i : i + samples_per_frame].tobytes()
+        for i in range(0, audio.size, samples_per_frame)
+    ]
+
+
+def _tone(rate: int, hz: float) -> bytes:
+    t = np.arange(rate * TONE_SECONDS) / rate
+    return (np.sin(2 * np.pi * hz * t) * 16000).astype(np.int16).tobytes()
+
+
+def _in_frames(audio: bytes, rate: int) -> list[bytes]:
+    size = rate * FRAME_MS // 1000 * 2
+    return [audio[i : i + size] for i in range(0, len(audio), size)]
+
+
+def _settled(audio: bytes, rate: int) -> np.ndarray:
+    return np.frombuffer(audio, dtype=np.int16)[rate * SETTLE_MS // 1000 :]
+
+
+def _passband_snr_db(audio: bytes, rate: int, hz: float) -> float:
+    samples = _settled(audio, rate).astype(np.float64)
+    power = np.abs(np.fft.rfft(samples * np.hanning(samples.size))) ** 2
+    freqs = np.fft.rfftfreq(samples.size, 1 / rate)
+    tone = np.abs(freqs - hz) <= 20
+    return float(10 * np.log10(power[tone].sum() / power[~tone].sum()))
+
+
+def _level_db(audio: bytes, rate: int, reference: bytes) -> float:
+    out = _settled(audio, rate).astype(np.float64)
+    ref = np.frombuffer(reference, dtype=np.int16).astype(np.float64)
+    return float(10 * np.log10((out**2).mean() / (ref**2).mean() + 1e-12))
+
+
+def _quality(
+    convert: Callable[[list[bytes]], bytes], in_rate: int, out_rate: int
+) -> str:
+    passband = _tone(in_rate, PASSBAND_HZ)
+    snr = _passband_snr_db(
+        convert(_in_frames(passband, in_rate)), out_rate, PASSBAND_HZ
+    )
+    line = f"passband SNR {snr:5.1f} dB"
+    if in_rate > out_rate:
+        # Above the new Nyquist: should vanish entirely.
+        alias = _tone(in_rate, ALIAS_NYQUIST_RATIO * out_rate / 2)
+        level = _level_db(convert(_in_frames(alias, in_rate)), out_rate, alias)
+        line += f", alias {level:6.1f} dB"
+    return line
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=int, default=60)
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            import audioop
+        except ImportError:
+            audioop = None  # type: ignore[assignment]
+
+    for in_rate, out_rate in COMMON_RATES:
+        frames = _frames(in_rate, args.seconds)
+
+        resampler = StreamingResampler(in_rate, out_rate)
+        start = time.perf_counter()
+        for frame in frames:
+            resampler.process(frame)
+        elapsed = time.perf_counter() - start
+        line = (
+            f"{in_rate:>6} -> {out_rate}: polyphase {len(frames) / elapsed:>9,.0f} "
+            f"frames/sec ({elapsed / args.seconds * 100:.3f}% of one core per call)"
+        )
+
+        if audioop is not None:
+            state = None
+            start = time.perf_counter()
+            for frame in frames:
+                _, state = audioop.ratecv(frame, 2, 1, in_rate, out_rate, state)
+            baseline = time.perf_counter() - start
+            line += f" | audioop.ratecv {len(frames) / baseline:>9,.0f} frames/sec"
+
+        print(line)
+
+        def polyphase(frames: list[bytes]) -> bytes:
+            resampler = StreamingResampler(in_rate, out_rate)
+            return b"".join(resampler.process(frame) for frame in frames)
+
+        print(f"    polyphase quality: {_quality(polyphase, in_rate, out_rate)}")
+        if audioop is not None:
+
+            def ratecv(frames: list[bytes]) -> bytes:
+                state = None
+                out = []
+                for frame in frames:
+                    converted, state = audioop.ratecv(
+                        frame, 2, 1, in_rate, out_rate, state
+                    )
+                    out.append(converted)
+                return b"".join(out)
+
+            print(f"       ratecv quality: {_quality(ratecv, in_rate, out_rate)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Report upstream STT bytes and ingest CPU per call for each audio profile.
+
+Simulates the per-frame work between the caller's websocket and
+DeepgramSTT.send_audio for a call of the given length.
+
+Usage:
+    python3 -m scripts.bench_stt_profiles [--seconds 180]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from src.api.voice.audio_utils import decode_twilio_media
+from src.api.voice.resampler import StreamingResampler
+from src.api.voice.stt import BROWSER_LINEAR16, TWILIO_MULAW
+
+FRAME_MS = 20
+
+
+def _payloads(sample_width: int, rate: int, seconds: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    frame_bytes = rate * FRAME_MS // 1000 * sample_width
+    return [
+        base64.b64encode(rng.bytes(frame_bytes)).decode("ascii")
+        for _ in range(seconds * 1000 // FRAME_MS)
+    ]
+
+
+def _run(payloads: list[str], ingest: Callable[[str], bytes]) -> tuple[int, float]:
+    sent = 0
+    start = time.process_time()
+    for payload in payloads:
+        sent += len(ingest(payload))
+    return sent, time.process_time() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=int, default=180)
+    args = parser.parse_args()
+
+    twilio = _payloads(1, TWILIO_MULAW.sample_rate, args.seconds)
+    browser = _payloads(2, 48000, args.seconds)
+    resampler = StreamingResampler(48000, BROWSER_LINEAR16.sample_rate)
+
+    cases: dict[str, tuple[list[str], Callable[[str], bytes]]] = {
+        "twilio pcm16 (legacy)": (twilio, decode_twilio_media),
+        "twilio mulaw passthrough": (twilio, base64.b64decode),
+        "browser linear16": (
+            browser,
+            lambda p: resampler.process(base64.b64decode(p)),
+        ),
+    }
+    print(f"per {args.seconds}s call:")
+    for name, (payloads, ingest) in cases.items():
+        sent, cpu = _run(payloads, ingest)
+        print(
+            f"{name:>26}: {sent / 1024:>9,.0f} KiB upstream, "
+            f"{cpu * 1000:>8.1f} ms CPU"
+        )
+
+
+if __name__ == "__main__":
+    main()
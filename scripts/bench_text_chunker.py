@@ -0,0 +1,121 @@
+"""Compare LLM-to-TTS text handoff strategies on a replayed token stream.
+
+"per_token" is the previous Twilio path (one TTS message per token),
+"legacy_buffer" the previous browser path (size threshold plus an
+any(endswith) punctuation rescan per token), "chunker" is chunk_text().
+Tokens arrive every --token-ms with one --stall-ms pause mid-reply, which
+is where a buffer without a time-based flush holds back generated text.
+
+Usage:
+    python3 -m scripts.bench_text_chunker [--token-ms 25] [--stall-ms 800]
+        [--cpu-replies 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterable, Callable
+
+from src.api.voice.text_chunker import TextChunker, chunk_text
+
+REPLY = (
+    "Sure! I can help you book that. We have openings on Tuesday at 3.30 PM "
+    "and Wednesday at 10 AM, which works better for you? If neither suits, "
+    "I can check Thursday morning or put you on the waitlist for an earlier "
+    "slot and call you back as soon as something opens up"
+)
+TOKENS = [REPLY.split(" ")[0]] + [" " + word for word in REPLY.split(" ")[1:]]
+STALL_AFTER = 24
+LEGACY_FIRST, LEGACY_NEXT = 50, 80
+
+Strategy = Callable[[AsyncIterable[str]], AsyncGenerator[str, None]]
+
+
+async def per_token(tokens: AsyncIterable[str]) -> AsyncGenerator[str, None]:
+    async for token in tokens:
+        yield token
+
+
+async def legacy_buffer(tokens: AsyncIterable[str]) -> AsyncGenerator[str, None]:
+    buffer = ""
+    first = True
+    async for token in tokens:
+        buffer += token
+        threshold = LEGACY_FIRST if first else LEGACY_NEXT
+        if len(buffer) >= threshold or any(buffer.rstrip().endswith(p) for p in ".!?,"):
+            yield buffer
+            buffer = ""
+            first = False
+    if buffer:
+        yield buffer
+
+
+async def _replay(token_ms: float, stall_ms: float) -> AsyncGenerator[str, None]:
+    for i, token in enumerate(TOKENS):
+        delay = stall_ms if i == STALL_AFTER else token_ms
+        await asyncio.sleep(delay / 1000)
+        yield token
+
+
+async def _measure(
+    name: str, strategy: Strategy, token_ms: float, stall_ms: float
+) -> None:
+    start = time.monotonic()
+    sends: list[tuple[float, str]] = []
+    async for chunk in strategy(_replay(token_ms, stall_ms)):
+        sends.append(((time.monotonic() - start) * 1000, chunk))
+
+    generated_before_stall = len("".join(TOKENS[:STALL_AFTER]))
+    stall_starts = (STALL_AFTER * token_ms) + token_ms
+    sent_by_stall = sum(
+        len(chunk) for at, chunk in sends if at <= stall_starts + stall_ms / 2
+    )
+    print(
+        f"{name:>14}: {len(sends):>3} TTS messages, "
+        f"first at {sends[0][0]:>5.0f} ms, "
+        f"mean {len(REPLY) / len(sends):>5.1f} chars, "
+        f"{generated_before_stall - sent_by_stall:>3} chars held during stall"
+    )
+
+
+def _cpu(replies: int) -> None:
+    start = time.process_time()
+    for _ in range(replies):
+        chunker = TextChunker()
+        for token in TOKENS:
+            chunker.push(token)
+        chunker.flush()
+    elapsed = time.process_time() - start
+    per_token_us = elapsed / (replies * len(TOKENS)) * 1e6
+    print(f"chunker CPU: {per_token_us:.2f} us/token over {replies:,} replies")
+
+
+async def _run(args: argparse.Namespace) -> None:
+    print(
+        f"{len(TOKENS)} tokens at {args.token_ms:g} ms, "
+        f"{args.stall_ms:g} ms stall after token {STALL_AFTER}:"
+    )
+    strategies: dict[str, Strategy] = {
+        "per_token": per_token,
+        "legacy_buffer": legacy_buffer,
+        "chunker": chunk_text,
+    }
+    for name, strategy in strategies.items():
+        await _measure(name, strategy, args.token_ms, args.stall_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--token-ms", type=float, default=25.0)
+    parser.add_argument("--stall-ms", type=float, default=800.0)
+    parser.add_argument("--cpu-replies", type=int, default=20000)
+    args = parser.parse_args()
+
+    asyncio.run(_run(args))
+    _cpu(args.cpu_replies)
+
+
+if __name__ == "__main__":
+    main()
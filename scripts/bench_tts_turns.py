@@ -0,0 +1,136 @@
+"""Compare per-turn ElevenLabs TTS startup: reconnect-per-turn vs multi-context.
+
+"single" is ElevenLabsTTS on stream-input, which reopens its socket after
+every turn's isFinal and on every interrupt; "multi" is
+ElevenLabsMultiContextTTS on multi-stream-input, which keeps one socket and
+opens a context per turn. Each turn sends one reply and flushes, measures the
+time to its first audio chunk, lets the audio finish, then waits --gap-ms
+(the caller talking) before the next turn. Every --interrupt-every turns the
+reply is cut off shortly after it starts, as on a barge-in.
+
+Run against scripts/provider_simulator.py started with a realistic
+--handshake-ms, with the API settings pointed at it:
+
+    ELEVENLABS_API_URL=http://127.0.0.1:8900 ELEVENLABS_API_KEY=sim \\
+        ELEVENLABS_VOICE_ID=sim \\
+        python3 -m scripts.bench_tts_turns
+
+Usage:
+    python3 -m scripts.bench_tts_turns [--mode single|multi|both]
+        [--turns 30] [--gap-ms 400] [--interrupt-every 4] [--pool-size 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.voice import tts
+from src.api.voice.tts import ElevenLabsMultiContextTTS, ElevenLabsTTS, TTSProvider
+
+REPLY = "We are open from nine to five on weekdays. Would you like to book?"
+QUIET_S = 0.15
+FIRST_AUDIO_TIMEOUT_S = 5.0
+INTERRUPT_AFTER_S = 0.1
+
+
+class AudioTap:
+    def __init__(self, provider: TTSProvider) -> None:
+        self.arrived = asyncio.Event()
+        self.first_at = 0.0
+        self.last_at = 0.0
+        self._task = asyncio.create_task(self._run(provider))
+
+    async def _run(self, provider: TTSProvider) -> None:
+        async for _ in provider.get_audio():
+            self.last_at = time.monotonic()
+            if not self.arrived.is_set():
+                self.first_at = self.last_at
+                self.arrived.set()
+
+    async def wait_quiet(self) -> None:
+        while time.monotonic() - self.last_at < QUIET_S:
+            await asyncio.sleep(QUIET_S / 3)
+
+    def stop(self) -> None:
+        self._task.cancel()
+
+
+async def _run_mode(mode: str, args: argparse.Namespace) -> dict[str, list[float]]:
+    settings.elevenlabs_multi_context = mode == "multi"
+    settings.tts_pool_size = args.pool_size
+    tts._tts_pool = None  # the pool's opener reads the mode when it connects
+    metrics.reset()
+
+    provider: TTSProvider = (
+        ElevenLabsMultiContextTTS() if mode == "multi" else ElevenLabsTTS()
+    )
+    await provider.connect()
+    tap = AudioTap(provider)
+    results: dict[str, list[float]] = {"startup": [], "after_interrupt": []}
+    interrupted = False
+    try:
+        for turn in range(args.turns):
+            tap.arrived.clear()
+            started = time.monotonic()
+            await provider.send_text(REPLY)
+            await provider.flush()
+            await asyncio.wait_for(tap.arrived.wait(), FIRST_AUDIO_TIMEOUT_S)
+            startup_ms = (tap.first_at - started) * 1000
+            results["after_interrupt" if interrupted else "startup"].append(startup_ms)
+
+            interrupted = bool(args.interrupt_every) and (
+                turn % args.interrupt_every == args.interrupt_every - 1
+            )
+            if interrupted:
+                await asyncio.sleep(INTERRUPT_AFTER_S)
+                started = time.monotonic()
+                await provider.interrupt()
+                results.setdefault("interrupt", []).append(
+                    (time.monotonic() - started) * 1000
+                )
+            await tap.wait_quiet()
+            await asyncio.sleep(args.gap_ms / 1000)
+    finally:
+        tap.stop()
+        await provider.close()
+        await tts.get_tts_pool().close()
+    results["connections"] = [
+        metrics.counter("tts.pool_hits") + metrics.counter("tts.pool_misses")
+    ]
+    return results
+
+
+def _report(mode: str, results: dict[str, list[float]]) -> None:
+    print(f"{mode}: {results['connections'][0]:.0f} socket(s) leased")
+    for name in ("startup", "after_interrupt", "interrupt"):
+        values = np.array(results.get(name, []))
+        if values.size:
+            p50, p95 = np.percentile(values, (50, 95))
+            label = f"{name} ms"
+            print(f"  {label:>20}: p50 {p50:6.0f}  p95 {p95:6.0f}  (n={values.size})")
+
+
+async def _run(args: argparse.Namespace) -> None:
+    modes = ["single", "multi"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        _report(mode, await _run_mode(mode, args))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["single", "multi", "both"], default="both")
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--gap-ms", type=int, default=400)
+    parser.add_argument("--interrupt-every", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=0)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
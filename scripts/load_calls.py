@@ -0,0 +1,314 @@
+"""Drive N concurrent simulated calls against the Twilio or browser voice socket.
+
+With --transport twilio (default) each call opens /voice/ws/{phone}, sends the
+Twilio "connected" and "start" events and streams 8 kHz μ-law; with
+--transport browser it opens /voice/browser-ws/{phone}, sends a "config"
+event and streams 16 kHz linear16. Either way, 20 ms frames go out in real
+time: silence while the agent talks, a voiced tone for
+--speech-ms when it is the caller's turn. Turn latency is measured from the
+last speech frame to the first agent media frame that follows it, so it
+includes STT endpointing.
+
+Run the API against scripts/provider_simulator.py to avoid provider quota,
+and seed a business first (scripts/seed_test_data.py) so the phone resolves.
+Pass --server-pid to also report the API process's CPU and RSS per call.
+With --interrupt-ms the caller starts its next turn that long after the
+agent's reply begins instead of waiting for it to finish, which exercises
+barge-in; the server's time to clear the agent's audio and the LLM tokens
+streamed for cancelled replies are reported.
+
+Usage:
+    python3 -m scripts.load_calls [--url ws://127.0.0.1:8000]
+        [--transport twilio|browser] [--phone +14155550100] [--calls 50]
+        [--turns 3] [--ramp-s 5] [--server-pid PID] [--interrupt-ms 800]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+
+import httpx
+import numpy as np
+import websockets
+
+from src.api.voice.audio_utils import pcm16_to_mulaw
+from src.api.voice.browser_protocol import HEADER_SIZE
+
+FRAME_MS = 20
+SAMPLE_RATES = {"twilio": 8000, "browser": 16000}
+PATHS = {"twilio": "/voice/ws", "browser": "/voice/browser-ws"}
+AGENT_QUIET_S = 0.6
+AGENT_AUDIO_BYTES_PER_S = 8000  # TTS is 8 kHz μ-law on both transports
+TURN_TIMEOUT_S = 15.0
+
+
+def _frames(transport: str, speech_ms: int) -> tuple[list[bytes], bytes]:
+    rate = SAMPLE_RATES[transport]
+    # A 140 Hz fundamental with a few harmonics reads as voiced speech to
+    # the local VAD and the simulator's energy detector.
+    t = np.arange(rate * speech_ms // 1000) / rate
+    wave = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 5))
+    audio = (wave / np.abs(wave).max() * 8000).astype(np.int16).tobytes()
+    frame_bytes = rate * FRAME_MS // 1000 * 2
+    silence = bytes(frame_bytes)
+    if transport == "twilio":
+        audio = pcm16_to_mulaw(audio)
+        frame_bytes //= 2
+        silence = b"\xff" * frame_bytes
+    frames = [audio[i : i + frame_bytes] for i in range(0, len(audio), frame_bytes)]
+    return frames, silence
+
+
+@dataclass
+class CallResult:
+    latencies_ms: list[float] = field(default_factory=list)
+    missed_turns: int = 0
+    error: str | None = None
+
+
+class SimulatedCall:
+    def __init__(
+        self,
+        url: str,
+        transport: str,
+        frames: tuple[list[bytes], bytes],
+        turns: int,
+        interrupt_ms: int | None = None,
+    ) -> None:
+        self._url = url
+        self._interrupt_ms = interrupt_ms
+        self._transport = transport
+        self._speech, self._silence = frames
+        self._turns = turns
+        self._sid = f"MZ{uuid.uuid4().hex}"
+        self._last_media = 0.0
+        self._playing_until = 0.0
+        self._media_event = asyncio.Event()
+        self.result = CallResult()
+
+    def _media(self, payload: bytes) -> str:
+        message = {
+            "event": "media",
+            "media": {"payload": base64.b64encode(payload).decode("ascii")},
+        }
+        if self._transport == "twilio":
+            message["streamSid"] = self._sid
+        return json.dumps(message)
+
+    async def _open(self, ws: websockets.ClientConnection) -> None:
+        if self._transport == "browser":
+            rate = SAMPLE_RATES["browser"]
+            await ws.send(json.dumps({"event": "config", "sampleRate": rate}))
+            return
+        await ws.send(json.dumps({"event": "connected", "protocol": "Call"}))
+        await ws.send(
+            json.dumps(
+                {
+                    "event": "start",
+                    "streamSid": self._sid,
+                    "start": {"streamSid": self._sid},
+                }
+            )
+        )
+
+    async def _receive(self, ws: websockets.ClientConnection) -> None:
+        async for message in ws:
+            if isinstance(message, bytes):
+                audio_bytes = len(message) - HEADER_SIZE
+            else:
+                data = json.loads(message)
+                if data.get("event") == "clear":
+                    # Barge-in: the client drops the audio it has queued.
+                    self._playing_until = time.monotonic()
+                if data.get("event") != "media":
+                    continue
+                audio_bytes = len(data["media"]["payload"]) * 3 // 4
+            # Browser audio arrives faster than real time; the caller hears
+            # it until the client's playback queue drains.
+            now = time.monotonic()
+            start = max(now, self._playing_until)
+            self._playing_until = start + audio_bytes / AGENT_AUDIO_BYTES_PER_S
+            self._last_media = now
+            self._media_event.set()
+
+    async def _stream(
+        self, ws: websockets.ClientConnection, frames: list[bytes]
+    ) -> None:
+        next_at = time.monotonic()
+        for frame in frames:
+            await ws.send(self._media(frame))
+            next_at += FRAME_MS / 1000
+            await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+
+    async def _wait_for_agent_quiet(self, ws: websockets.ClientConnection) -> None:
+        while time.monotonic() - self._playing_until < AGENT_QUIET_S:
+            await self._stream(ws, [self._silence] * 5)
+
+    async def _turn(self, ws: websockets.ClientConnection) -> None:
+        if self._interrupt_ms and self.result.latencies_ms:
+            # The previous turn returned on the reply's first frame.
+            frames = self._interrupt_ms // FRAME_MS
+            await self._stream(ws, [self._silence] * frames)
+        else:
+            await self._wait_for_agent_quiet(ws)
+        await self._stream(ws, self._speech)
+        spoke_at = time.monotonic()
+        self._media_event.clear()
+
+        silence = [self._silence] * 5
+        while not self._media_event.is_set():
+            if time.monotonic() - spoke_at > TURN_TIMEOUT_S:
+                self.result.missed_turns += 1
+                return
+            await self._stream(ws, silence)
+        self.result.latencies_ms.append((self._last_media - spoke_at) * 1000)
+
+    async def run(self) -> CallResult:
+        try:
+            async with websockets.connect(self._url) as ws:
+                receiver = asyncio.create_task(self._receive(ws))
+                await self._open(ws)
+                self._playing_until = time.monotonic()
+                for _ in range(self._turns):
+                    await self._turn(ws)
+                await ws.send(json.dumps({"event": "stop", "streamSid": self._sid}))
+                receiver.cancel()
+        except Exception as e:
+            self.result.error = f"{type(e).__name__}: {e}"
+        return self.result
+
+
+def _process_usage(pid: int) -> tuple[float, int]:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    with open(f"/proc/{pid}/status") as f:
+        rss_kib = next(int(line.split()[1]) for line in f if line.startswith("VmRSS"))
+    return cpu, rss_kib * 1024
+
+
+async def _run(args: argparse.Namespace) -> None:
+    url = f"{args.url}{PATHS[args.transport]}/{args.phone}"
+    frames = _frames(args.transport, args.speech_ms)
+    calls = [
+        SimulatedCall(url, args.transport, frames, args.turns, args.interrupt_ms)
+        for _ in range(args.calls)
+    ]
+
+    before = _process_usage(args.server_pid) if args.server_pid else None
+    peak_rss = before[1] if before else 0
+    started = time.monotonic()
+
+    async def launch(i: int, call: SimulatedCall) -> CallResult:
+        await asyncio.sleep(args.ramp_s * i / max(1, args.calls))
+        return await call.run()
+
+    tasks = [asyncio.create_task(launch(i, c)) for i, c in enumerate(calls)]
+    while not all(t.done() for t in tasks):
+        await asyncio.sleep(0.5)
+        if args.server_pid:
+            peak_rss = max(peak_rss, _process_usage(args.server_pid)[1])
+    results = [t.result() for t in tasks]
+    elapsed = time.monotonic() - started
+
+    latencies = np.array([ms for r in results for ms in r.latencies_ms])
+    errors = [r.error for r in results if r.error]
+    missed = sum(r.missed_turns for r in results)
+    print(
+        f"{args.calls} {args.transport} calls x {args.turns} turns "
+        f"in {elapsed:.1f}s"
+    )
+    print(
+        f"  answered turns: {latencies.size}, missed: {missed}, "
+        f"failed calls: {len(errors)}"
+    )
+    if latencies.size:
+        p50, p95, p99 = np.percentile(latencies, (50, 95, 99))
+        print(
+            f"  turn latency ms: p50 {p50:.0f}  p95 {p95:.0f}  p99 {p99:.0f}"
+            f"  max {latencies.max():.0f}"
+        )
+    for error in sorted(set(errors))[:5]:
+        print(f"  error: {error}")
+
+    if before:
+        after = _process_usage(args.server_pid)
+        cpu = after[0] - before[0]
+        print(
+            f"  server CPU: {cpu:.2f}s total, {cpu / args.calls * 1000:.0f} ms/call, "
+            f"{cpu / elapsed * 100:.0f}% of one core"
+        )
+        print(
+            f"  server RSS: peak {peak_rss / 2**20:.0f} MiB, "
+            f"{(peak_rss - before[1]) / args.calls / 1024:.0f} KiB/call above idle"
+        )
+
+    try:
+        http_url = args.url.replace("ws", "http", 1)
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            stages = (await client.get(f"{http_url}/metrics/turns")).json()["stages"]
+        print("  server stages (p50 / p95 ms from final transcript):")
+        for stage, summary in stages.items():
+            print(f"    {stage:>15}: {summary['p50']:>6.0f} / {summary['p95']:>6.0f}")
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            snapshot = (await client.get(f"{http_url}/metrics")).json()
+        counters = snapshot["counters"]
+        templated = sum(
+            value
+            for name, value in counters.items()
+            if name.startswith("reply.template_")
+        )
+        replies = templated + counters.get("reply.llm", 0)
+        if replies:
+            print(
+                f"  replies: {templated:.0f} templated, "
+                f"{counters.get('reply.llm', 0):.0f} via LLM "
+                f"({templated / replies:.0%} without an LLM call)"
+            )
+        answered = counters.get("answer_cache.hits", 0)
+        looked_up = answered + counters.get("answer_cache.misses", 0)
+        if looked_up:
+            print(
+                f"  answer cache: {answered:.0f} of {looked_up:.0f} INQUIRY turns "
+                f"answered without synthesis ({answered / looked_up:.0%})"
+            )
+        if args.interrupt_ms:
+            histograms = snapshot["histograms"]
+            for name in (
+                f"{args.transport}.bargein_time_to_clear_ms",
+                "llm.tokens_before_cancel",
+            ):
+                summary = histograms.get(name)
+                if summary:
+                    print(
+                        f"  {name}: n={summary['count']:.0f} "
+                        f"p50 {summary['p50']:.0f}  p95 {summary['p95']:.0f}"
+                    )
+    except Exception:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="ws://127.0.0.1:8000")
+    parser.add_argument("--transport", choices=sorted(PATHS), default="twilio")
+    parser.add_argument("--phone", default="+14155550100")
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--speech-ms", type=int, default=1200)
+    parser.add_argument("--ramp-s", type=float, default=5.0)
+    parser.add_argument("--server-pid", type=int, default=None)
+    parser.add_argument("--interrupt-ms", type=int, default=None)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+"""Local stand-in for Deepgram, ElevenLabs, OpenAI and Serper.
+
+Serves the endpoints the voice stack calls, speaking the same wire formats,
+so calls can be load-tested without provider quota:
+
+  WS   /v1/listen                                 Deepgram streaming STT
+  WS   /v1/speak                                  Deepgram streaming TTS
+  POST /v1/speak                                  Deepgram REST TTS
+  WS   /v1/text-to-speech/{voice}/stream-input    ElevenLabs streaming TTS
+  WS   /v1/text-to-speech/{voice}/multi-stream-input
+                                                  ElevenLabs multi-context TTS
+  POST /v1/text-to-speech/{voice}                 ElevenLabs REST TTS
+  POST /v1/chat/completions                       OpenAI chat (streaming or not)
+  POST /v1/embeddings                             OpenAI embeddings
+  POST /search                                    Serper web search
+
+Point the API at it with:
+
+  OPENAI_BASE_URL=http://127.0.0.1:8900/v1
+  DEEPGRAM_API_URL=http://127.0.0.1:8900
+  ELEVENLABS_API_URL=http://127.0.0.1:8900
+  SERPER_API_URL=http://127.0.0.1:8900
+  OPENAI_API_KEY=sim DEEPGRAM_API_KEY=sim ELEVENLABS_API_KEY=sim SERPER_API_KEY=sim
+
+The STT side treats any 20 ms window above --speech-dbfs as speech, sends
+interim results that grow by two words every --interim-ms while it lasts,
+and finalises the transcript --endpointing-ms after speech stops (or after
+audio stops arriving, since the API gates silence locally). Every socket
+waits --handshake-ms before accepting, standing in for TLS and upgrade time.
+
+Usage:
+    python3 -m scripts.provider_simulator [--port 8900] [--ttft-ms 250]
+        [--token-ms 15] [--jitter-ms 20] [--failure-rate 0.0]
+        [--handshake-ms 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import math
+import random
+import time
+import uuid
+import zlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from src.api.voice.codec import MULAW_DECODE_TABLE
+
+TTS_BYTES_PER_CHAR = 480  # ~60 ms of 8 kHz μ-law per character
+TTS_CHUNK_BYTES = 1600
+MULAW_SILENCE = b"\xff"
+EMBEDDING_DIM = 1536
+
+TRANSCRIPTS = (
+    "Hi there.",
+    "What are your hours on Saturday?",
+    "Do you take walk-in patients?",
+    "Where are you located?",
+    "How much is a cleaning?",
+    "Okay, thanks, bye.",
+)
+ANSWER = (
+    "We are open from nine to five on weekdays and nine to one on Saturday. "
+    "Is there anything else I can help you with?"
+)
+
+
+@dataclass
+class SimConfig:
+    ttft_ms: float = 250.0
+    token_ms: float = 15.0
+    jitter_ms: float = 20.0
+    failure_rate: float = 0.0
+    tts_first_audio_ms: float = 120.0
+    endpointing_ms: float = 300.0
+    interim_ms: float = 400.0
+    embedding_ms: float = 60.0
+    search_ms: float = 400.0
+    speech_dbfs: float = -45.0
+    handshake_ms: float = 0.0
+
+
+config = SimConfig()
+app = FastAPI(title="Provider simulator")
+_transcripts = itertools.cycle(TRANSCRIPTS)
+
+
+async def _delay(ms: float) -> None:
+    jitter = random.uniform(-config.jitter_ms, config.jitter_ms)
+    await asyncio.sleep(max(0.0, ms + jitter) / 1000)
+
+
+def _should_fail() -> bool:
+    return random.random() < config.failure_rate
+
+
+async def _accept(websocket: WebSocket) -> bool:
+    if config.handshake_ms:
+        await _delay(config.handshake_ms)
+    await websocket.accept()
+    if _should_fail():
+        await websocket.close(code=1011)
+        return False
+    return True
+
+
+def _injected_failure() -> JSONResponse:
+    return JSONResponse({"error": "injected failure"}, status_code=500)
+
+
+def _tokens(text: str) -> list[str]:
+    words = text.split(" ")
+    return [w if i == 0 else f" {w}" for i, w in enumerate(words)]
+
+
+# Deepgram STT
+
+
+def _level_dbfs(audio: bytes, encoding: str) -> float:
+    if encoding == "mulaw":
+        samples = MULAW_DECODE_TABLE[np.frombuffer(audio, dtype=np.uint8)]
+    else:
+        samples = np.frombuffer(audio[: len(audio) // 2 * 2], dtype=np.int16)
+    if not samples.size:
+        return -120.0
+    power = float(np.mean(samples.astype(np.float32) ** 2))
+    return 10 * math.log10(power / 32768.0**2 + 1e-12)
+
+
+def _stt_result(transcript: str, is_final: bool, speech_final: bool) -> str:
+    return json.dumps(
+        {
+            "type": "Results",
+            "is_final": is_final,
+            "speech_final": speech_final,
+            "channel": {"alternatives": [{"transcript": transcript}]},
+        }
+    )
+
+
+@app.websocket("/v1/listen")
+async def deepgram_listen(websocket: WebSocket) -> None:
+    if not await _accept(websocket):
+        return
+    encoding = websocket.query_params.get("encoding", "linear16")
+    in_speech = False
+    endpoint: asyncio.TimerHandle | None = None
+    loop = asyncio.get_running_loop()
+    transcript = ""
+    interim_words = 0
+    last_interim = 0.0
+
+    def finalise() -> None:
+        nonlocal in_speech
+        in_speech = False
+        loop.create_task(_send_final(websocket, transcript))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            audio = message.get("bytes")
+            if audio is None:
+                continue  # KeepAlive / CloseStream
+            speech = _level_dbfs(audio, encoding) > config.speech_dbfs
+            if speech and not in_speech:
+                in_speech = True
+                transcript, interim_words = next(_transcripts), 0
+                last_interim = loop.time()
+                await websocket.send_text(json.dumps({"type": "SpeechStarted"}))
+            if speech and loop.time() - last_interim >= config.interim_ms / 1000:
+                last_interim = loop.time()
+                interim_words += 2
+                interim = " ".join(transcript.split(" ")[:interim_words])
+                await websocket.send_text(_stt_result(interim, False, False))
+            if speech:
+                if endpoint is not None:
+                    endpoint.cancel()
+                endpoint = loop.call_later(config.endpointing_ms / 1000, finalise)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        if endpoint is not None:
+            endpoint.cancel()
+
+
+async def _send_final(websocket: WebSocket, transcript: str) -> None:
+    try:
+        await websocket.send_text(_stt_result(transcript, True, True))
+        await websocket.send_text(json.dumps({"type": "UtteranceEnd"}))
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+
+
+# TTS
+
+
+async def _synthesize(text: str) -> AsyncIterator[bytes]:
+    await _delay(config.tts_first_audio_ms)
+    remaining = max(1, len(text.strip())) * TTS_BYTES_PER_CHAR
+    while remaining > 0:
+        size = min(TTS_CHUNK_BYTES, remaining)
+        remaining -= size
+        yield MULAW_SILENCE * size
+        await asyncio.sleep(0)
+
+
+@app.websocket("/v1/speak")
+async def deepgram_speak(websocket: WebSocket) -> None:
+    if not await _accept(websocket):
+        return
+    pending: list[str] = []
+    speaking: asyncio.Task[None] | None = None
+
+    async def speak(text: str) -> None:
+        async for chunk in _synthesize(text):
+            await websocket.send_bytes(chunk)
+        await websocket.send_text(json.dumps({"type": "Flushed"}))
+
+    try:
+        while True:
+            data = json.loads(await websocket.receive_text())
+            kind = data.get("type")
+            if kind == "Speak":
+                pending.append(data.get("text", ""))
+            elif kind == "Flush" and pending:
+                text, pending = "".join(pending), []
+                if speaking is not None:
+                    await speaking
+                speaking = asyncio.create_task(speak(text))
+            elif kind == "Clear":
+                pending.clear()
+                if speaking is not None:
+                    speaking.cancel()
+                    speaking = None
+                await websocket.send_text(json.dumps({"type": "Cleared"}))
+            elif kind == "Close":
+                break
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        if speaking is not None:
+            speaking.cancel()
+
+
+@app.websocket("/v1/text-to-speech/{voice_id}/stream-input")
+async def elevenlabs_stream_input(websocket: WebSocket, voice_id: str) -> None:
+    if not await _accept(websocket):
+        return
+    pending: list[str] = []
+    try:
+        while True:
+            data = json.loads(await websocket.receive_text())
+            text = data.get("text", "")
+            if text == "":
+                async for chunk in _synthesize("".join(pending)):
+                    audio = base64.b64encode(chunk).decode("ascii")
+                    await websocket.send_text(
+                        json.dumps({"audio": audio, "isFinal": False})
+                    )
+                await websocket.send_text(json.dumps({"audio": None, "isFinal": True}))
+                break
+            if text.strip():
+                pending.append(text)
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+
+
+@app.websocket("/v1/text-to-speech/{voice_id}/multi-stream-input")
+async def elevenlabs_multi_stream_input(websocket: WebSocket, voice_id: str) -> None:
+    if not await _accept(websocket):
+        return
+    pending: dict[str, list[str]] = {}
+    # Per context, the latest flush; each waits on the one before it.
+    speaking: dict[str, asyncio.Task[None]] = {}
+    closing: set[asyncio.Task[None]] = set()
+    send_lock = asyncio.Lock()
+
+    async def send(message: dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_text(json.dumps(message))
+
+    async def speak(
+        context_id: str, text: str, after: asyncio.Task[None] | None
+    ) -> None:
+        if after is not None:
+            await after
+        async for chunk in _synthesize(text):
+            audio = base64.b64encode(chunk).decode("ascii")
+            await send({"audio": audio, "isFinal": None, "contextId": context_id})
+
+    async def finish(context_id: str, after: asyncio.Task[None] | None) -> None:
+        if after is not None:
+            await after
+        await send({"isFinal": True, "contextId": context_id})
+
+    try:
+        while True:
+            data = json.loads(await websocket.receive_text())
+            if data.get("close_socket"):
+                break
+            context_id = data.get("context_id", "")
+            text = data.get("text", "")
+            if text.strip():
+                pending.setdefault(context_id, []).append(text)
+            previous = speaking.get(context_id)
+            if data.get("flush") and pending.get(context_id):
+                text = "".join(pending.pop(context_id))
+                speaking[context_id] = asyncio.create_task(
+                    speak(context_id, text, previous)
+                )
+            elif data.get("close_context"):
+                pending.pop(context_id, None)
+                speaking.pop(context_id, None)
+                task = asyncio.create_task(finish(context_id, previous))
+                closing.add(task)
+                task.add_done_callback(closing.discard)
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        for task in [*speaking.values(), *closing]:
+            task.cancel()
+
+
+@app.post("/v1/speak")
+async def deepgram_speak_rest(request: Request) -> Response:
+    if _should_fail():
+        return _injected_failure()
+    body = await request.json()
+    audio = b"".join([c async for c in _synthesize(body.get("text", ""))])
+    return Response(audio, media_type="audio/basic")
+
+
+@app.post("/v1/text-to-speech/{voice_id}")
+async def elevenlabs_rest(voice_id: str, request: Request) -> Response:
+    if _should_fail():
+        return _injected_failure()
+    body = await request.json()
+    audio = b"".join([c async for c in _synthesize(body.get("text", ""))])
+    return Response(audio, media_type="audio/basic")
+
+
+# OpenAI
+
+
+def _completion_text(body: dict[str, Any]) -> str:
+    if body.get("response_format", {}).get("type") == "json_object":
+        return json.dumps({"intent": "INQUIRY", "booking": None})
+    return ANSWER
+
+
+def _chunk(completion_id: str, model: str, delta: dict[str, Any], done: bool) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "delta": delta,
+                "finish_reason": "stop" if done else None,
+            }
+        ],
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request) -> Response:
+    body = await request.json()
+    if _should_fail():
+        return _injected_failure()
+    model = body.get("model", "gpt-4o-mini")
+    text = _completion_text(body)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+    if not body.get("stream"):
+        await _delay(config.ttft_ms)
+        return JSONResponse(
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "total_tokens": 0,
+                },
+            }
+        )
+
+    async def events() -> AsyncIterator[str]:
+        await _delay(config.ttft_ms)
+        yield _chunk(completion_id, model, {"role": "assistant", "content": ""}, False)
+        for token in _tokens(text):
+            yield _chunk(completion_id, model, {"content": token}, False)
+            await _delay(config.token_ms)
+        yield _chunk(completion_id, model, {}, True)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request) -> Response:
+    body = await request.json()
+    if _should_fail():
+        return _injected_failure()
+    inputs = body.get("input", [])
+    if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]
+    await _delay(config.embedding_ms)
+    # Deterministic per input: a repeated question embeds identically, and
+    # different ones are close to orthogonal.
+    vectors = np.stack(
+        [
+            np.random.default_rng(zlib.crc32(str(text).encode())).normal(
+                size=EMBEDDING_DIM
+            )
+            for text in inputs
+        ]
+    )
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return JSONResponse(
+        {
+            "object": "list",
+            "model": body.get("model", "text-embedding-ada-002"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": v.tolist()}
+                for i, v in enumerate(vectors)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+    )
+
+
+# Serper
+
+
+@app.post("/search")
+async def search(request: Request) -> Response:
+    body = await request.json()
+    if _should_fail():
+        return _injected_failure()
+    await _delay(config.search_ms)
+    query = body.get("q", "")
+    return JSONResponse(
+        {
+            "organic": [
+                {"title": f"Result {i} for {query}", "snippet": "Simulated snippet."}
+                for i in range(1, body.get("num", 3) + 1)
+            ]
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--ttft-ms", type=float, default=config.ttft_ms)
+    parser.add_argument("--token-ms", type=float, default=config.token_ms)
+    parser.add_argument("--jitter-ms", type=float, default=config.jitter_ms)
+    parser.add_argument("--failure-rate", type=float, default=config.failure_rate)
+    parser.add_argument(
+        "--tts-first-audio-ms", type=float, default=config.tts_first_audio_ms
+    )
+    parser.add_argument("--endpointing-ms", type=float, default=config.endpointing_ms)
+    parser.add_argument("--interim-ms", type=float, default=config.interim_ms)
+    parser.add_argument("--embedding-ms", type=float, default=config.embedding_ms)
+    parser.add_argument("--search-ms", type=float, default=config.search_ms)
+    parser.add_argument("--handshake-ms", type=float, default=config.handshake_ms)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    for name in SimConfig.__dataclass_fields__:
+        setattr(config, name, getattr(args, name, getattr(config, name)))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Train the local intent model used ahead of the LLM in classify_and_extract.
+
+Fits a multinomial logistic regression on hashed n-gram features of the
+labeled utterances (one {"text", "intent"} JSON object per line), then fits
+a softmax temperature on a stratified hold-out split so the confidence it
+reports can be thresholded (INTENT_LOCAL_THRESHOLD). The final weights are
+refit on all of the data and keep the hold-out temperature.
+
+Usage:
+    python3 -m scripts.train_intent_classifier [--data PATH] [--out PATH]
+        [--buckets 4096] [--epochs 300] [--l2 1e-4] [--holdout 0.25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src.api.agents.intent_classifier import (
+    DEFAULT_MODEL_PATH,
+    INTENT_LABELS,
+    LocalIntentClassifier,
+    intent_features,
+)
+
+DEFAULT_DATA_PATH = DEFAULT_MODEL_PATH.parent / "intent_train.jsonl"
+LEARNING_RATE = 2.0
+TEMPERATURES = np.linspace(0.2, 5.0, 97)
+
+
+def load_examples(path: Path) -> tuple[list[str], np.ndarray]:
+    texts: list[str] = []
+    labels: list[int] = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                example = json.loads(line)
+                texts.append(example["text"])
+                labels.append(INTENT_LABELS.index(example["intent"]))
+    return texts, np.array(labels)
+
+
+def featurize(texts: list[str], buckets: int) -> np.ndarray:
+    # Dense is fine at this size; rows match LocalIntentClassifier.logits().
+    x = np.zeros((len(texts), buckets), dtype=np.float32)
+    for row, text in enumerate(texts):
+        features = intent_features(text, buckets)
+        x[row, features] = 1 / np.sqrt(max(1, features.size))
+    return x
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return np.asarray(exp / exp.sum(axis=1, keepdims=True))
+
+
+def fit(
+    x: np.ndarray, y: np.ndarray, epochs: int, l2: float
+) -> tuple[np.ndarray, np.ndarray]:
+    # Full-batch gradient descent on softmax cross-entropy with momentum.
+    n, classes = x.shape[0], len(INTENT_LABELS)
+    targets = np.eye(classes, dtype=np.float32)[y]
+    weights = np.zeros((x.shape[1], classes), dtype=np.float32)
+    bias = np.zeros(classes, dtype=np.float32)
+    velocity_w, velocity_b = np.zeros_like(weights), np.zeros_like(bias)
+    for _ in range(epochs):
+        error = (_softmax(x @ weights + bias) - targets) / n
+        velocity_w = 0.9 * velocity_w + x.T @ error + l2 * weights
+        velocity_b = 0.9 * velocity_b + error.sum(axis=0)
+        weights -= LEARNING_RATE * velocity_w
+        bias -= LEARNING_RATE * velocity_b
+    return weights, bias
+
+
+def fit_temperature(logits: np.ndarray, y: np.ndarray) -> float:
+    # The temperature that minimises hold-out negative log-likelihood.
+    def nll(temperature: float) -> float:
+        probabilities = _softmax(logits / temperature)
+        return float(-np.log(probabilities[np.arange(len(y)), y] + 1e-12).mean())
+
+    return float(min(TEMPERATURES, key=nll))
+
+
+def stratified_split(
+    y: np.ndarray, holdout: float, seed: int
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    train: list[int] = []
+    held: list[int] = []
+    for label in np.unique(y):
+        rows = rng.permutation(np.flatnonzero(y == label))
+        cut = max(1, round(len(rows) * holdout))
+        held.extend(rows[:cut])
+        train.extend(rows[cut:])
+    return np.array(train), np.array(held)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_PATH)
+    parser.add_argument("--out", type=Path, default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--buckets", type=int, default=4096)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--holdout", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts, y = load_examples(args.data)
+    x = featurize(texts, args.buckets)
+    train, held = stratified_split(y, args.holdout, args.seed)
+
+    weights, bias = fit(x[train], y[train], args.epochs, args.l2)
+    held_logits = x[held] @ weights + bias
+    temperature = fit_temperature(held_logits, y[held])
+    accuracy = float((held_logits.argmax(axis=1) == y[held]).mean())
+    print(
+        f"hold-out: {accuracy:.1%} accuracy on {len(held)} utterances, "
+        f"temperature {temperature:.2f}"
+    )
+
+    weights, bias = fit(x, y, args.epochs, args.l2)
+    LocalIntentClassifier(weights, bias, temperature).save(args.out)
+    print(f"trained on {len(y)} utterances, wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import numpy as np
+import numpy.typing as npt
+
+from src.api.config import settings
+from src.api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Embedding = npt.NDArray[np.float32]
+
+# Words that change the answer but barely move the embedding: "hours on
+# Saturday" and "hours on Sunday" are near neighbours, as are "at 3" and
+# "at 3:30". A reused answer's question has to name the same ones.
+_KEY_TERM_RE = re.compile(
+    r"\b(\d+(?::\d+)?|monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+    r"|today|tonight|tomorrow|weekends?|weekdays?|morning|afternoon|evening"
+    r"|january|february|march|april|may|june|july|august|september|october"
+    r"|november|december)\b"
+)
+
+
+@dataclass(eq=False)
+class CachedAnswer:
+    query: str
+    key_terms: frozenset[str]
+    answer: str
+    embedding: Embedding  # unit length
+    expires_at: float
+    answer_ms: float
+    last_used: float = field(default_factory=time.monotonic)
+    # μ-law clip of the answer, rendered the first time it is reused.
+    audio: bytes | None = None
+
+
+class _BusinessAnswers:
+    def __init__(self) -> None:
+        self.entries: list[CachedAnswer] = []
+        self._matrix: Embedding | None = None
+
+    def matrix(self) -> Embedding:
+        if self._matrix is None:
+            self._matrix = np.stack([entry.embedding for entry in self.entries])
+        return self._matrix
+
+    def remove(self, entries: list[CachedAnswer]) -> None:
+        dropped = {id(entry) for entry in entries}
+        self.entries = [entry for entry in self.entries if id(entry) not in dropped]
+        self._matrix = None
+
+    def add(self, entry: CachedAnswer) -> None:
+        self.entries.append(entry)
+        self._matrix = None
+
+
+def key_terms(query: str) -> frozenset[str]:
+    return frozenset(_KEY_TERM_RE.findall(query.lower()))
+
+
+def normalize(embedding: npt.ArrayLike) -> Embedding | None:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if vector.ndim != 1 or not norm:
+        return None
+    return vector / norm
+
+
+# Final INQUIRY answers per business, found by cosine similarity of the
+# caller's query embedding and an exact match on its key terms (days, dates,
+# times and other numbers), which similarity alone does not separate. A
+# business's answers are dropped together when its knowledge base, services
+# or profile change; within a business the least recently used answer goes
+# first once max_entries is reached, and the least recently used business
+# once max_businesses is. Invalidation is in-process, so with several
+# workers the TTL bounds how stale another worker's answers can get. Only
+# touched from the event loop.
+class SemanticAnswerCache:
+    def __init__(
+        self,
+        max_entries: int,
+        max_businesses: int,
+        ttl_s: float,
+        threshold: float,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_businesses = max_businesses
+        self._ttl_s = ttl_s
+        self._threshold = threshold
+        self._businesses: OrderedDict[uuid.UUID, _BusinessAnswers] = OrderedDict()
+        # Bumped on invalidation, so an answer synthesized from the old
+        # knowledge base is not stored once the new one is live.
+        self._generations: dict[uuid.UUID, int] = {}
+        self._renders: dict[int, asyncio.Task[None]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(answers.entries) for answers in self._businesses.values())
+
+    def clear(self) -> None:
+        self._businesses.clear()
+
+    def generation(self, business_id: uuid.UUID) -> int:
+        return self._generations.get(business_id, 0)
+
+    def lookup(
+        self, business_id: uuid.UUID, query: str, embedding: Embedding
+    ) -> CachedAnswer | None:
+        answers = self._businesses.get(business_id)
+        if answers is not None:
+            self._prune(business_id, answers)
+        if not answers or not answers.entries:
+            metrics.incr("answer_cache.misses")
+            return None
+
+        similarities = answers.matrix() @ embedding
+        metrics.observe("answer_cache.similarity", float(similarities.max()))
+        terms = key_terms(query)
+        entry: CachedAnswer | None = None
+        for index in np.argsort(-similarities):
+            if similarities[index] < self._threshold:
+                break
+            if answers.entries[index].key_terms == terms:
+                entry = answers.entries[index]
+                break
+            metrics.incr("answer_cache.key_term_mismatches")
+        if entry is None:
+            metrics.incr("answer_cache.misses")
+            return None
+
+        entry.last_used = time.monotonic()
+        self._businesses.move_to_end(business_id)
+        metrics.incr("answer_cache.hits")
+        metrics.observe("answer_cache.saved_ms", entry.answer_ms)
+        return entry
+
+    def store(
+        self,
+        business_id: uuid.UUID,
+        query: str,
+        embedding: Embedding,
+        answer: str,
+        generation: int,
+        answer_ms: float = 0.0,
+    ) -> CachedAnswer | None:
+        if self._max_entries <= 0 or generation != self.generation(business_id):
+            return None
+        answers = self._businesses.get(business_id)
+        if answers is not None:
+            self._prune(business_id, answers)
+        answers = self._businesses.setdefault(business_id, _BusinessAnswers())
+        self._businesses.move_to_end(business_id)
+        if len(answers.entries) >= self._max_entries:
+            oldest = min(answers.entries, key=lambda entry: entry.last_used)
+            answers.remove([oldest])
+            metrics.incr("answer_cache.evictions")
+
+        entry = CachedAnswer(
+            query=query,
+            key_terms=key_terms(query),
+            answer=answer,
+            embedding=embedding,
+            expires_at=time.monotonic() + self._ttl_s,
+            answer_ms=answer_ms,
+        )
+        answers.add(entry)
+        metrics.incr("answer_cache.stores")
+        while len(self._businesses) > self._max_businesses:
+            _, dropped = self._businesses.popitem(last=False)
+            metrics.incr("answer_cache.evictions", len(dropped.entries))
+        return entry
+
+    def invalidate(self, business_id: uuid.UUID) -> None:
+        self._generations[business_id] = self.generation(business_id) + 1
+        answers = self._businesses.pop(business_id, None)
+        metrics.incr("answer_cache.invalidations")
+        if answers is not None:
+            metrics.incr("answer_cache.invalidated", len(answers.entries))
+
+    def schedule_audio(
+        self, entry: CachedAnswer, render: Callable[[str], Awaitable[bytes]]
+    ) -> None:
+        # Rendered off the call, once per answer, and only for answers that
+        # have been reused: most answers are never asked for twice.
+        key = id(entry)
+        if entry.audio is not None or key in self._renders:
+            return
+        task = asyncio.create_task(self._render(entry, render))
+        self._renders[key] = task
+        task.add_done_callback(lambda _: self._renders.pop(key, None))
+
+    async def _render(
+        self, entry: CachedAnswer, render: Callable[[str], Awaitable[bytes]]
+    ) -> None:
+        try:
+            audio = await render(entry.answer)
+        except Exception as e:
+            logger.warning("Answer render failed for %r: %s", entry.answer, e)
+            return
+        if audio:
+            entry.audio = audio
+            metrics.incr("answer_cache.renders")
+
+    def _prune(self, business_id: uuid.UUID, answers: _BusinessAnswers) -> None:
+        now = time.monotonic()
+        expired = [entry for entry in answers.entries if entry.expires_at <= now]
+        if expired:
+            answers.remove(expired)
+            metrics.incr("answer_cache.expired", len(expired))
+        if not answers.entries:
+            del self._businesses[business_id]
+
+
+_answer_cache: SemanticAnswerCache | None = None
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = SemanticAnswerCache(
+            settings.answer_cache_max_entries,
+            settings.answer_cache_max_businesses,
+            settings.answer_cache_ttl_s,
+            settings.answer_cache_threshold,
+        )
+    return _answer_cache
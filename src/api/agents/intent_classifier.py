@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
+import logging
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from src.api.cache import AsyncLRUCache
 from src.api.clients import get_openai_client
+from src.api.config import settings
+from src.api.metrics import metrics
 from src.api.prompts.intent import (
     INTENT_CLASSIFIER_SYSTEM,
     INTENT_CLASSIFIER_USER,
@@ -11,7 +23,138 @@ from src.api.prompts.intent import (
     UNIFIED_INTENT_USER,
 )
 
+logger = logging.getLogger(__name__)
+
 VALID_INTENTS = {"BOOKING", "INQUIRY", "SEARCH", "GREETING", "GOODBYE", "UNKNOWN"}
+# Output order of the local model's classes.
+INTENT_LABELS = ("BOOKING", "INQUIRY", "SEARCH", "GREETING", "GOODBYE", "UNKNOWN")
+# Built by scripts/train_intent_classifier.py from data/intent_train.jsonl.
+DEFAULT_MODEL_PATH = Path(__file__).parent / "data" / "intent_model.npz"
+# Intents the local model may settle on its own. BOOKING still needs the
+# LLM's field extraction, and UNKNOWN is mostly short replies ("yes", "that
+# works") that only the conversation history can resolve. GREETING and
+# GOODBYE are settled by the rules alone: the model also scores a greeting
+# with a question after it ("hi, are you open Saturday?") as GREETING.
+LOCAL_INTENTS = frozenset({"INQUIRY", "SEARCH"})
+RULE_CONFIDENCE = 0.99
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_GREETING_RULE_RE = re.compile(
+    r"^(hi|hello|hey|hiya|howdy|good (morning|afternoon|evening))( there)?$"
+)
+_GOODBYE_RULE_RE = re.compile(
+    r"^((ok|okay|thanks|thank you) )?(bye( bye)?|goodbye|see you( later)?)$"
+    r"|^that's all( thanks| thank you)?$"
+)
+
+
+@dataclass(frozen=True)
+class IntentPrediction:
+    intent: str
+    confidence: float
+    source: str  # "rule" or "model"
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def intent_features(text: str, buckets: int) -> np.ndarray:
+    # Hashed word unigrams, word bigrams (with start/end markers, so a bare
+    # "hi" differs from "hi I'd like to book") and within-word character
+    # trigrams, which soften transcription slips. crc32 rather than hash()
+    # so buckets are stable across processes.
+    words = _words(text)
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(["<s>", *words], [*words, "</s>"])]
+    for word in words:
+        padded = f"<{word}>"
+        grams += [f"c:{padded[i : i + 3]}" for i in range(len(padded) - 2)]
+    hashed = [zlib.crc32(gram.encode()) % buckets for gram in grams]
+    return np.unique(np.array(hashed, dtype=np.int64))
+
+
+def match_intent_rule(utterance: str) -> str | None:
+    text = " ".join(_words(utterance))
+    if _GREETING_RULE_RE.match(text):
+        return "GREETING"
+    if _GOODBYE_RULE_RE.match(text):
+        return "GOODBYE"
+    return None
+
+
+# Multinomial logistic regression over intent_features(), with a softmax
+# temperature fitted on held-out data so confidences are calibrated.
+class LocalIntentClassifier:
+    def __init__(
+        self, weights: np.ndarray, bias: np.ndarray, temperature: float = 1.0
+    ) -> None:
+        self.weights = weights
+        self.bias = bias
+        self.temperature = temperature
+
+    @property
+    def buckets(self) -> int:
+        return int(self.weights.shape[0])
+
+    @classmethod
+    def load(cls, path: Path | str) -> LocalIntentClassifier:
+        with np.load(path) as data:
+            labels = tuple(str(label) for label in data["labels"])
+            if labels != INTENT_LABELS:
+                raise ValueError(f"Model labels {labels} != {INTENT_LABELS}")
+            return cls(data["weights"], data["bias"], float(data["temperature"]))
+
+    def save(self, path: Path | str) -> None:
+        np.savez_compressed(
+            path,
+            weights=self.weights.astype(np.float32),
+            bias=self.bias.astype(np.float32),
+            temperature=np.float32(self.temperature),
+            labels=np.array(INTENT_LABELS),
+        )
+
+    def logits(self, utterance: str) -> np.ndarray:
+        features = intent_features(utterance, self.buckets)
+        scale = 1 / np.sqrt(max(1, features.size))
+        logits = self.weights[features].sum(axis=0) * scale + self.bias
+        return np.asarray(logits, dtype=np.float64)
+
+    def probabilities(self, utterance: str) -> np.ndarray:
+        scaled = self.logits(utterance) / self.temperature
+        exp = np.exp(scaled - scaled.max())
+        return np.asarray(exp / exp.sum(), dtype=np.float64)
+
+    def predict(self, utterance: str) -> IntentPrediction:
+        probabilities = self.probabilities(utterance)
+        best = int(probabilities.argmax())
+        return IntentPrediction(
+            INTENT_LABELS[best], float(probabilities[best]), "model"
+        )
+
+
+_local_classifier: LocalIntentClassifier | None = None
+_local_classifier_loaded = False
+
+
+def get_local_classifier() -> LocalIntentClassifier | None:
+    global _local_classifier, _local_classifier_loaded
+    if not _local_classifier_loaded:
+        _local_classifier_loaded = True
+        path = settings.intent_model_path or DEFAULT_MODEL_PATH
+        try:
+            _local_classifier = LocalIntentClassifier.load(path)
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("Local intent model unavailable, rules only: %s", e)
+    return _local_classifier
+
+
+def classify_locally(utterance: str) -> IntentPrediction | None:
+    rule = match_intent_rule(utterance)
+    if rule is not None:
+        return IntentPrediction(rule, RULE_CONFIDENCE, "rule")
+    model = get_local_classifier()
+    return model.predict(utterance) if model else None
 
 
 async def classify_intent(utterance: str) -> str:
@@ -32,9 +175,61 @@ async def classify_intent(utterance: str) -> str:
     return intent if intent in VALID_INTENTS else "UNKNOWN"
 
 
+_llm_cache: AsyncLRUCache[bytes, tuple[str, dict[str, Any] | None]] | None = None
+
+
+def _get_llm_cache() -> AsyncLRUCache[bytes, tuple[str, dict[str, Any] | None]]:
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = AsyncLRUCache(
+            "intent.cache", settings.intent_cache_size, settings.intent_cache_ttl_s
+        )
+    return _llm_cache
+
+
+def _cache_key(
+    utterance: str, conversation_history: list[dict[str, str]] | None
+) -> bytes:
+    # Normalized utterance plus the recent history the prompt shows, hashed
+    # to a fixed 16 bytes however long the turns are.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(" ".join(_words(utterance)).encode())
+    for turn in conversation_history or ():
+        digest.update(f"\x1e{turn['role']}\x1f".encode())
+        digest.update(" ".join(_words(turn["content"])).encode())
+    return digest.digest()
+
+
 async def classify_and_extract(
     utterance: str,
     conversation_history: list[dict[str, str]] | None = None,
+) -> tuple[str, dict[str, Any] | None]:
+    if settings.intent_local_enabled:
+        local = classify_locally(utterance)
+        if local is not None and (
+            local.source == "rule"
+            or (
+                local.intent in LOCAL_INTENTS
+                and local.confidence >= settings.intent_local_threshold
+            )
+        ):
+            metrics.incr(f"intent.local_{local.source}")
+            return local.intent, None
+    metrics.incr("intent.llm")
+
+    if settings.intent_cache_size <= 0:
+        return await _classify_with_llm(utterance, conversation_history)
+    intent, booking = await _get_llm_cache().get_or_load(
+        _cache_key(utterance, conversation_history),
+        lambda: _classify_with_llm(utterance, conversation_history),
+    )
+    # Callers may fill in the booking dict; the cached one stays pristine.
+    return intent, copy.deepcopy(booking)
+
+
+async def _classify_with_llm(
+    utterance: str,
+    conversation_history: list[dict[str, str]] | None,
 ) -> tuple[str, dict[str, Any] | None]:
     client = get_openai_client()
 
@@ -1,12 +1,31 @@
 from __future__ import annotations
 
+import logging
 import uuid
 
-from src.api.rag.retriever import retrieve_relevant_chunks
+from src.api.agents.answer_cache import Embedding, normalize
+from src.api.rag.retriever import embed_query, retrieve_relevant_chunks
+
+logger = logging.getLogger(__name__)
 
 
 async def retrieve_knowledge(business_id: uuid.UUID, query: str) -> str:
-    chunks = await retrieve_relevant_chunks(business_id, query, n_results=5)
+    try:
+        chunks = await retrieve_relevant_chunks(business_id, query, n_results=5)
+    except Exception as e:
+        # The caller still gets an answer from the business profile alone.
+        logger.warning("Knowledge retrieval failed: %s", e)
+        return ""
     if not chunks:
         return ""
     return "\n\n".join(chunks)
+
+
+async def embed_utterance(query: str) -> Embedding | None:
+    # Unit-length query embedding for the answer cache; usually the one
+    # retrieval already computed for this turn.
+    try:
+        return normalize(await embed_query(query))
+    except Exception as e:
+        logger.warning("Query embedding failed: %s", e)
+        return None
@@ -2,17 +2,24 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 import re
+import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable
+from contextlib import aclosing
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
+from src.api.agents.answer_cache import CachedAnswer, get_answer_cache
 from src.api.agents.booking_agent import handle_booking
-from src.api.agents.intent_classifier import classify_and_extract
-from src.api.agents.kb_retrieval import retrieve_knowledge
+from src.api.agents.intent_classifier import classify_and_extract, classify_locally
+from src.api.agents.kb_retrieval import embed_utterance, retrieve_knowledge
 from src.api.agents.search_agent import web_search
 from src.api.agents.synthesizer import synthesize_response
+from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.tracing import mark, traced
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,6 +27,14 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 MAX_HISTORY_ENTRIES = 12
+SHAREABLE_ANSWER_NOTE = (
+    "\nNote: This answer may be reused for other callers. Answer only from "
+    "the business information; do not address the caller by name or repeat "
+    "anything personal they said."
+)
+
+# Intent, extracted booking fields and knowledge-base context for an utterance.
+Understanding = tuple[str, dict[str, Any] | None, str | None]
 
 _SIMPLE_INTENT_RE = re.compile(
     r"^\s*(hi|hello|hey|good\s*(morning|afternoon|evening)|bye|goodbye|see\s*you|thanks|thank\s*you)\s*[.!?]*\s*$",
@@ -31,12 +46,52 @@ _BOOKING_RE = re.compile(
     re.IGNORECASE,
 )
 
+# GOODBYE templates need the caller to actually say goodbye: "thanks" or
+# "no thanks" classify as GOODBYE but often come mid-call.
+_FAREWELL_RE = re.compile(
+    r"\b(bye|goodbye|see you|that's all|have a (good|great|nice) (day|one))\b",
+    re.IGNORECASE,
+)
+
 _QUESTION_RE = re.compile(
     r"\b(what|when|where|how|can|do you|is there|are there|tell me|info)\b",
     re.IGNORECASE,
 )
 
 
+FILLER_BOOKING = "Let me check that for you."
+FILLER_QUESTION = "Let me look into that."
+FILLER_DEFAULT = "One moment."
+DELAY_FILLER = "Still looking, one moment..."
+FILLER_PHRASES = (FILLER_BOOKING, FILLER_QUESTION, FILLER_DEFAULT, DELAY_FILLER)
+
+# Replies to bare greetings and goodbyes, spoken without any LLM call.
+TEMPLATE_REPLIES = {
+    "GREETING": (
+        "Hi there! How can I help you today?",
+        "Hello! What can I do for you today?",
+        "Hi! What can I help you with?",
+    ),
+    "GOODBYE": (
+        "Thanks for calling {business}. Have a great day!",
+        "Thank you for calling {business}. Take care!",
+        "Goodbye, and thanks for calling {business}!",
+    ),
+}
+
+
+def greeting_for(business_name: str) -> str:
+    return f"Hi, thanks for calling {business_name}. How can I help you?"
+
+
+def template_replies(business_name: str) -> list[str]:
+    return [
+        reply.format(business=business_name)
+        for replies in TEMPLATE_REPLIES.values()
+        for reply in replies
+    ]
+
+
 def _is_simple_intent(utterance: str) -> bool:
     return _SIMPLE_INTENT_RE.match(utterance) is not None
 
@@ -45,10 +100,10 @@ def pick_filler_phrase(utterance: str) -> str | None:
     if _is_simple_intent(utterance):
         return None
     if _BOOKING_RE.search(utterance):
-        return "Let me check that for you."
+        return FILLER_BOOKING
     if _QUESTION_RE.search(utterance):
-        return "Let me look into that."
-    return "One moment."
+        return FILLER_QUESTION
+    return FILLER_DEFAULT
 
 
 @dataclass
@@ -67,32 +122,105 @@ class CallSession:
     conversation_history: list[dict[str, str]] = field(default_factory=list)
     booking_draft: dict[str, Any] = field(default_factory=dict)
     booking_completed: bool = False
+    # Set while the current turn is being answered from the answer cache.
+    cached_answer: CachedAnswer | None = None
+
+
+def template_reply(call_session: CallSession, utterance: str) -> str | None:
+    # Fast path for turns that need no business knowledge: a bare greeting or
+    # goodbye gets a templated reply and skips classification and synthesis
+    # entirely. The model alone is not enough: it scores "hi, are you open
+    # Saturday?" as a confident GREETING, so the utterance must also match a
+    # rule or be nothing but the greeting. A greeting mid-booking still goes
+    # to the booking flow, as process_utterance would route it.
+    if not settings.template_replies_enabled:
+        return None
+    started = time.perf_counter()
+    prediction = classify_locally(utterance)
+    if (
+        prediction is None
+        or prediction.intent not in TEMPLATE_REPLIES
+        or prediction.confidence < settings.template_reply_threshold
+    ):
+        return None
+    if prediction.source != "rule" and not _is_simple_intent(utterance):
+        return None
+    if (
+        prediction.intent == "GREETING"
+        and call_session.booking_draft
+        and not call_session.booking_completed
+    ):
+        return None
+    if prediction.intent == "GOODBYE" and not _FAREWELL_RE.search(utterance):
+        return None
+
+    history = call_session.conversation_history
+    last_reply = next(
+        (turn["content"] for turn in reversed(history) if turn["role"] == "agent"),
+        None,
+    )
+    options = [
+        reply.format(business=call_session.business.name)
+        for reply in TEMPLATE_REPLIES[prediction.intent]
+    ]
+    reply = random.choice([r for r in options if r != last_reply] or options)
+    history.append({"role": "caller", "content": utterance})
+    history.append({"role": "agent", "content": reply})
+    metrics.incr(f"reply.template_{prediction.intent.lower()}")
+    metrics.observe("reply.template_ms", (time.perf_counter() - started) * 1000)
+    return reply
+
+
+async def understand_utterance(
+    business_id: uuid.UUID,
+    utterance: str,
+    recent_history: list[dict[str, str]],
+) -> Understanding:
+    if _is_simple_intent(utterance):
+        intent, booking_info = await traced(
+            "classify",
+            classify_and_extract(utterance, conversation_history=recent_history),
+        )
+        return intent, booking_info, None
+
+    intent_task = classify_and_extract(utterance, conversation_history=recent_history)
+    kb_task = retrieve_knowledge(business_id, utterance)
+    (intent, booking_info), kb_result = await asyncio.gather(
+        traced("classify", intent_task), traced("kb", kb_task)
+    )
+    return intent, booking_info, kb_result
 
 
 async def process_utterance(
     call_session: CallSession,
     utterance: str,
+    prefetched: Awaitable[Understanding] | None = None,
 ) -> AsyncGenerator[str, None]:
+    # Template turns never get here: the caller checks template_reply()
+    # first, since it decides how the turn is played.
+    call_session.cached_answer = None
+    metrics.incr("reply.llm")
+
     call_session.conversation_history.append({"role": "caller", "content": utterance})
 
     biz = call_session.business
     biz_id = biz.business_id
-
-    is_simple = _is_simple_intent(utterance)
+    answer_cache = get_answer_cache()
+    # Taken before retrieval: an answer built from a knowledge base that
+    # changes mid-turn is not stored.
+    generation = answer_cache.generation(biz_id)
 
     recent_history = call_session.conversation_history[-4:]
 
-    if is_simple:
-        intent, booking_info = await classify_and_extract(
-            utterance, conversation_history=recent_history
-        )
-        kb_result = None
-    else:
-        intent_task = classify_and_extract(
-            utterance, conversation_history=recent_history
-        )
-        kb_task = retrieve_knowledge(biz_id, utterance)
-        (intent, booking_info), kb_result = await asyncio.gather(intent_task, kb_task)
+    understanding = None
+    if prefetched is not None:
+        try:
+            understanding = await prefetched
+        except Exception as e:
+            logger.warning("Speculative understanding failed, redoing it: %s", e)
+    if understanding is None:
+        understanding = await understand_utterance(biz_id, utterance, recent_history)
+    intent, booking_info, kb_result = understanding
 
     if (
         call_session.booking_draft
@@ -101,6 +229,29 @@ async def process_utterance(
     ):
         intent = "BOOKING"
 
+    # INQUIRY answers depend on the business, not the caller, so a close
+    # enough earlier question's answer is reused without synthesis. Turns
+    # after a booking are left out: their prompt differs. Answers that may
+    # be cached are synthesized without the conversation, so no caller's
+    # details can reach another caller.
+    query_embedding = None
+    if (
+        settings.answer_cache_enabled
+        and intent == "INQUIRY"
+        and not call_session.booking_completed
+    ):
+        query_embedding = await embed_utterance(utterance)
+    if query_embedding is not None:
+        cached = answer_cache.lookup(biz_id, utterance, query_embedding)
+        if cached is not None:
+            call_session.cached_answer = cached
+            call_session.conversation_history.append(
+                {"role": "agent", "content": cached.answer}
+            )
+            mark("first_token")
+            yield cached.answer
+            return
+
     additional_context = ""
     context_section = ""
 
@@ -137,9 +288,14 @@ async def process_utterance(
 
     full_response_parts: list[str] = []
 
-    trimmed_history = call_session.conversation_history[-MAX_HISTORY_ENTRIES:]
+    trimmed_history: list[dict[str, str]] | None = None
+    if query_embedding is None:
+        trimmed_history = call_session.conversation_history[-MAX_HISTORY_ENTRIES:]
+    else:
+        additional_context += SHAREABLE_ANSWER_NOTE
 
-    async for token in synthesize_response(
+    synthesis_started = time.perf_counter()
+    tokens = synthesize_response(
         business_name=biz.name,
         location=biz.location,
         hours=biz.hours,
@@ -149,11 +305,24 @@ async def process_utterance(
         additional_context=additional_context,
         context_section=context_section,
         conversation_history=trimmed_history,
-    ):
-        full_response_parts.append(token)
-        yield token
+    )
+    # aclosing: an abandoned turn closes the LLM stream now, not at GC.
+    async with aclosing(tokens):
+        async for token in tokens:
+            mark("first_token")
+            full_response_parts.append(token)
+            yield token
 
     full_response = "".join(full_response_parts)
     call_session.conversation_history.append(
         {"role": "agent", "content": full_response}
     )
+    if query_embedding is not None and full_response:
+        answer_cache.store(
+            biz_id,
+            utterance,
+            query_embedding,
+            full_response,
+            generation,
+            answer_ms=(time.perf_counter() - synthesis_started) * 1000,
+        )
@@ -11,7 +11,7 @@ async def web_search(query: str) -> str:
 
     async with httpx.AsyncClient(timeout=10.0) as client:
         response = await client.post(
-            "https://google.serper.dev/search",
+            f"{settings.serper_api_url}/search",
             headers={"X-API-KEY": settings.serper_api_key, "Content-Type": "application/json"},
             json={"q": query, "num": 3},
         )
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from difflib import SequenceMatcher
+
+from src.api.agents.orchestrator import (
+    CallSession,
+    Understanding,
+    understand_utterance,
+)
+from src.api.config import settings
+from src.api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s']")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_PUNCTUATION_RE.sub(" ", text.lower()).split())
+
+
+def _similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+async def _without_booking_fields(
+    task: asyncio.Task[Understanding],
+) -> Understanding:
+    intent, _, kb_result = await task
+    return intent, None, kb_result
+
+
+# Classifies and retrieves for a turn while the caller is still talking.
+# Interim transcripts start speculation once their wording settles; the final
+# transcript then either adopts the speculative result or drops it. Booking
+# fields are only adopted when the final says exactly what was speculated on:
+# a close match can still differ in the day or time ("Tuesday at 3" against
+# "Thursday at 3:30"), so then only the intent and knowledge-base context are
+# kept and the booking agent extracts the fields from the final itself.
+class SpeculativeUnderstanding:
+    def __init__(
+        self,
+        call_session: CallSession,
+        min_words: int | None = None,
+        match_ratio: float | None = None,
+    ) -> None:
+        self._call_session = call_session
+        self._min_words = min_words or settings.speculation_min_words
+        self._match_ratio = match_ratio or settings.speculation_match_ratio
+        self._previous_words: list[str] = []
+        self._text = ""
+        self._task: asyncio.Task[Understanding] | None = None
+        self._started_at = 0.0
+        self._finished_at: float | None = None
+        self.turns = 0
+        self.hits = 0
+        self.saved_ms = 0.0
+
+    def observe(self, interim: str) -> None:
+        words = _normalize(interim).split()
+        # Settled: the previous interim grew without any word being revised.
+        previous = self._previous_words
+        settled = bool(previous) and words[: len(previous)] == previous
+        self._previous_words = words
+        if len(words) < self._min_words or not settled:
+            return
+
+        text = " ".join(words)
+        if self._task and _similarity(text, self._text) >= self._match_ratio:
+            return
+        self._cancel()
+        self._text = text
+        self._started_at = time.monotonic()
+        self._finished_at = None
+        self._task = asyncio.create_task(self._understand(interim))
+        metrics.incr("speculation.started")
+
+    def take(self, final: str) -> asyncio.Task[Understanding] | None:
+        self.turns += 1
+        task, text = self._task, self._text
+        self._task = None
+        self._previous_words = []
+        if task is None:
+            return None
+
+        failed = task.done() and (task.cancelled() or task.exception() is not None)
+        final_text = _normalize(final)
+        if failed or _similarity(final_text, text) < self._match_ratio:
+            task.cancel()
+            metrics.incr("speculation.misses")
+            return None
+        if final_text != text:
+            task = asyncio.create_task(_without_booking_fields(task))
+            metrics.incr("speculation.reextracted")
+
+        # Time the speculative work already had before the final arrived.
+        end = self._finished_at or time.monotonic()
+        saved_ms = (end - self._started_at) * 1000
+        self.hits += 1
+        self.saved_ms += saved_ms
+        metrics.incr("speculation.hits")
+        metrics.observe("speculation.saved_ms", saved_ms)
+        return task
+
+    def close(self) -> None:
+        self._cancel()
+        if self.turns:
+            metrics.observe("speculation.hit_rate_per_call", self.hits / self.turns)
+            metrics.observe("speculation.saved_ms_per_call", self.saved_ms)
+            logger.info(
+                "Speculation: %d/%d turns reused, %.0f ms saved",
+                self.hits,
+                self.turns,
+                self.saved_ms,
+            )
+
+    def _cancel(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _understand(self, interim: str) -> Understanding:
+        history = self._call_session.conversation_history
+        recent = [*history, {"role": "caller", "content": interim}][-4:]
+        try:
+            return await understand_utterance(
+                self._call_session.business.business_id, interim, recent
+            )
+        finally:
+            if asyncio.current_task() is self._task:
+                self._finished_at = time.monotonic()
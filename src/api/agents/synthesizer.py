@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from collections.abc import AsyncGenerator
+from typing import cast
+
+from openai import AsyncStream
+from openai.types.chat import ChatCompletionChunk
 
 from src.api.clients import get_openai_client
+from src.api.metrics import metrics
 from src.api.prompts.synthesizer import SYNTHESIZER_SYSTEM, SYNTHESIZER_USER
 
 
@@ -42,15 +47,35 @@ async def synthesize_response(
             messages.append({"role": role, "content": turn["content"]})
     messages.append({"role": "user", "content": user_msg})
 
-    stream = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        temperature=0.7,
-        max_tokens=300,
-        stream=True,
+    # stream=True always returns a stream; the overloads cannot tell with
+    # untyped messages.
+    stream = cast(
+        AsyncStream[ChatCompletionChunk],
+        await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=0.7,
+            max_tokens=300,
+            stream=True,
+        ),
     )
 
-    async for chunk in stream:
-        delta = chunk.choices[0].delta
-        if delta.content:
-            yield delta.content
+    received = 0
+    completed = False
+    try:
+        async for chunk in stream:
+            delta = chunk.choices[0].delta
+            if delta.content:
+                received += 1
+                yield delta.content
+        completed = True
+    finally:
+        if not completed:
+            # The turn was cut short (barge-in or hang-up). Closing the
+            # response stops generation instead of paying for the rest.
+            # Counts the chunks (about a token each) already streamed for
+            # the abandoned reply; what the model would have gone on to
+            # generate is not known.
+            await stream.close()
+            metrics.incr("llm.cancelled_streams")
+            metrics.observe("llm.tokens_before_cancel", received)
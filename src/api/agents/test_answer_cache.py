@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import uuid
+import zlib
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from src.api.agents.answer_cache import Embedding, SemanticAnswerCache, normalize
+from src.api.config import settings
+from src.api.metrics import metrics
+
+BUSINESS = uuid.uuid4()
+EMBEDDING_DIM = 1536
+# text-embedding-ada-002 is strongly anisotropic: unrelated questions still
+# score about 0.7, and questions that differ in one word about 0.95.
+# _ada_like reproduces that with a direction every text shares plus a
+# random direction per word.
+SHARED_WEIGHT = 1.53
+
+
+def _embedding(*values: float) -> Embedding:
+    vector = normalize(values)
+    assert vector is not None
+    return vector
+
+
+def _direction(seed: str) -> Embedding:
+    rng = np.random.default_rng(zlib.crc32(seed.encode()))
+    vector = normalize(rng.normal(size=EMBEDDING_DIM))
+    assert vector is not None
+    return vector
+
+
+def _ada_like(text: str) -> Embedding:
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    meaning = sum(_direction(word) for word in words) / np.sqrt(len(words))
+    vector = normalize(SHARED_WEIGHT * _direction("<shared>") + meaning)
+    assert vector is not None
+    return vector
+
+
+def _cache(**kwargs: float) -> SemanticAnswerCache:
+    options = {"max_entries": 8, "max_businesses": 8, "ttl_s": 60.0, "threshold": 0.9}
+    options.update(kwargs)
+    return SemanticAnswerCache(**options)  # type: ignore[arg-type]
+
+
+def test_similar_query_hits_and_dissimilar_misses() -> None:
+    metrics.reset()
+    cache = _cache()
+    cache.store(BUSINESS, "hours?", _embedding(1, 0, 0), "Nine to five.", 0)
+
+    hit = cache.lookup(BUSINESS, "hours?", _embedding(1, 0.1, 0))
+    assert hit is not None and hit.answer == "Nine to five."
+    assert cache.lookup(BUSINESS, "parking?", _embedding(0, 1, 0)) is None
+    assert cache.lookup(uuid.uuid4(), "hours?", _embedding(1, 0, 0)) is None
+
+    assert metrics.counter("answer_cache.hits") == 1
+    assert metrics.counter("answer_cache.misses") == 2
+    assert metrics.summary("answer_cache.similarity") is not None
+
+
+def test_invalidate_drops_answers_and_rejects_stale_stores() -> None:
+    cache = _cache()
+    generation = cache.generation(BUSINESS)
+    cache.store(BUSINESS, "hours?", _embedding(1, 0), "Nine to five.", generation)
+
+    cache.invalidate(BUSINESS)
+
+    assert cache.lookup(BUSINESS, "hours?", _embedding(1, 0)) is None
+    # Synthesized from the knowledge base as it was before the change.
+    assert (
+        cache.store(BUSINESS, "parking?", _embedding(0, 1), "Out back.", generation)
+        is None
+    )
+    assert len(cache) == 0
+
+
+def test_least_recently_used_answer_and_business_are_evicted() -> None:
+    cache = _cache(max_entries=2, max_businesses=2)
+    cache.store(BUSINESS, "a", _embedding(1, 0, 0), "A", 0)
+    cache.store(BUSINESS, "b", _embedding(0, 1, 0), "B", 0)
+    cache.lookup(BUSINESS, "a", _embedding(1, 0, 0))  # "b" is now least recent
+    cache.store(BUSINESS, "c", _embedding(0, 0, 1), "C", 0)
+
+    assert cache.lookup(BUSINESS, "b", _embedding(0, 1, 0)) is None
+    assert cache.lookup(BUSINESS, "a", _embedding(1, 0, 0)) is not None
+
+    others = [uuid.uuid4(), uuid.uuid4()]
+    for other in others:
+        cache.store(other, "a", _embedding(1, 0, 0), "A", 0)
+    assert cache.lookup(BUSINESS, "a", _embedding(1, 0, 0)) is None
+    assert len(cache) == 2
+
+
+def test_expired_answers_are_not_served() -> None:
+    cache = _cache()
+    cache.store(BUSINESS, "hours?", _embedding(1, 0), "Nine to five.", 0)
+
+    with patch("src.api.agents.answer_cache.time.monotonic", return_value=1e12):
+        assert cache.lookup(BUSINESS, "hours?", _embedding(1, 0)) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_audio_is_rendered_once_per_answer() -> None:
+    cache = _cache()
+    entry = cache.store(BUSINESS, "hours?", _embedding(1, 0), "Nine to five.", 0)
+    assert entry is not None
+    render = AsyncMock(return_value=b"\xff" * 160)
+
+    cache.schedule_audio(entry, render)
+    cache.schedule_audio(entry, render)
+    await asyncio.sleep(0)
+
+    render.assert_awaited_once_with("Nine to five.")
+    assert entry.audio == b"\xff" * 160
+
+
+def test_normalize_rejects_zero_vectors() -> None:
+    assert normalize([0.0, 0.0]) is None
+    assert np.isclose(np.linalg.norm(_embedding(3, 4)), 1.0)
+
+
+@pytest.mark.parametrize(
+    ("stored", "asked"),
+    [
+        ("What are your hours on Saturday?", "What are your hours on Sunday?"),
+        ("Can I come in at 3?", "Can I come in at 3:30?"),
+        ("Are you open on Monday morning?", "Are you open on Monday evening?"),
+    ],
+)
+def test_near_miss_questions_are_not_answered_from_cache(
+    stored: str, asked: str
+) -> None:
+    cache = _cache(threshold=settings.answer_cache_threshold)
+    cache.store(BUSINESS, stored, _ada_like(stored), "Some answer.", 0)
+
+    # Close enough to clear any similarity threshold worth using...
+    assert float(_ada_like(stored) @ _ada_like(asked)) > 0.9
+    # ...so the day or time in the question has to match too.
+    assert cache.lookup(BUSINESS, asked, _ada_like(asked)) is None
+
+
+def test_paraphrase_is_answered_and_unrelated_question_is_not() -> None:
+    cache = _cache(threshold=settings.answer_cache_threshold)
+    stored = "What are your hours on Saturday?"
+    cache.store(BUSINESS, stored, _ada_like(stored), "Nine to noon.", 0)
+
+    paraphrase = "What are your Saturday hours?"
+    unrelated = "Do you take walk-ins?"
+    assert cache.lookup(BUSINESS, paraphrase, _ada_like(paraphrase)) is not None
+    assert float(_ada_like(stored) @ _ada_like(unrelated)) > 0.6
+    assert cache.lookup(BUSINESS, unrelated, _ada_like(unrelated)) is None
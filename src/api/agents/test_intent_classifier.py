@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from src.api.agents.intent_classifier import classify_and_extract
+from src.api.agents import intent_classifier
+from src.api.agents.intent_classifier import (
+    classify_and_extract,
+    classify_locally,
+    match_intent_rule,
+)
+from src.api.config import settings
+from src.api.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_cache() -> Iterator[None]:
+    with patch.object(intent_classifier, "_llm_cache", None):
+        yield
 
 
 class _FakeChoice:
@@ -18,6 +32,11 @@ class _FakeResponse:
 
 
 class TestClassifyAndExtract:
+    @pytest.fixture(autouse=True)
+    def llm_only(self) -> Iterator[None]:
+        with patch.object(settings, "intent_local_enabled", False):
+            yield
+
     @pytest.mark.asyncio
     async def test_booking_intent_returns_intent_and_booking(self) -> None:
         payload = (
@@ -93,3 +112,120 @@ class TestClassifyAndExtract:
         call_args = mock_client.chat.completions.create.call_args
         user_msg = call_args.kwargs["messages"][1]["content"]
         assert "physical therapy" in user_msg
+
+
+class TestLocalTier:
+    def test_rules_settle_bare_greetings_and_goodbyes(self) -> None:
+        assert match_intent_rule("Hello there!") == "GREETING"
+        assert match_intent_rule("Okay, bye.") == "GOODBYE"
+        assert match_intent_rule("Hello, I'd like to book a cleaning") is None
+
+    def test_bundled_model_is_confident_on_clear_utterances(self) -> None:
+        prediction = classify_locally("What time do you open on Saturdays?")
+
+        assert prediction is not None
+        assert prediction.intent == "INQUIRY"
+        assert prediction.source == "model"
+        assert prediction.confidence >= settings.intent_local_threshold
+
+    @pytest.mark.asyncio
+    async def test_confident_local_intent_skips_llm(self) -> None:
+        metrics.reset()
+        mock_client = AsyncMock()
+
+        with patch(
+            "src.api.agents.intent_classifier.get_openai_client",
+            return_value=mock_client,
+        ):
+            result = await classify_and_extract("Is there a pharmacy near you?")
+
+        assert result == ("SEARCH", None)
+        mock_client.chat.completions.create.assert_not_awaited()
+        assert metrics.counter("intent.local_model") == 1
+
+    @pytest.mark.asyncio
+    async def test_greeting_with_a_question_goes_to_llm(self) -> None:
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create.return_value = _FakeResponse(
+            '{"intent": "INQUIRY", "booking": null}'
+        )
+
+        with patch(
+            "src.api.agents.intent_classifier.get_openai_client",
+            return_value=mock_client,
+        ):
+            intent, _ = await classify_and_extract("hi my tooth hurts")
+
+        assert intent == "INQUIRY"
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_booking_still_goes_to_llm_for_extraction(self) -> None:
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create.return_value = _FakeResponse(
+            '{"intent": "BOOKING", "booking": {"action": "schedule"}}'
+        )
+
+        with patch(
+            "src.api.agents.intent_classifier.get_openai_client",
+            return_value=mock_client,
+        ):
+            intent, booking = await classify_and_extract("Can I book a cleaning?")
+
+        assert intent == "BOOKING"
+        assert booking == {"action": "schedule"}
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_falls_back_to_llm(self) -> None:
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create.return_value = _FakeResponse(
+            '{"intent": "INQUIRY", "booking": null}'
+        )
+
+        with (
+            patch.object(settings, "intent_local_threshold", 1.0),
+            patch(
+                "src.api.agents.intent_classifier.get_openai_client",
+                return_value=mock_client,
+            ),
+        ):
+            intent, _ = await classify_and_extract("What are your hours?")
+
+        assert intent == "INQUIRY"
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    def test_missing_model_leaves_rules_only(self) -> None:
+        with (
+            patch.object(settings, "intent_model_path", "/nonexistent/model.npz"),
+            patch.object(intent_classifier, "_local_classifier", None),
+            patch.object(intent_classifier, "_local_classifier_loaded", False),
+        ):
+            assert classify_locally("What are your hours?") is None
+            prediction = classify_locally("hi")
+
+        assert prediction is not None
+        assert prediction.source == "rule"
+
+
+class TestLLMCache:
+    @pytest.mark.asyncio
+    async def test_repeated_utterance_reuses_llm_result(self) -> None:
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create.return_value = _FakeResponse(
+            '{"intent": "BOOKING", "booking": {"action": "schedule"}}'
+        )
+        history = [{"role": "agent", "content": "How can I help?"}]
+
+        with patch(
+            "src.api.agents.intent_classifier.get_openai_client",
+            return_value=mock_client,
+        ):
+            _, first = await classify_and_extract("I'd like to book.", history)
+            assert first is not None
+            first["customer_name"] = "Ann"
+            _, second = await classify_and_extract("i'd like to  BOOK", history)
+            await classify_and_extract("I'd like to book.", [])
+
+        assert second == {"action": "schedule"}
+        assert mock_client.chat.completions.create.await_count == 2
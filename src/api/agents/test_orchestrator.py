@@ -1,17 +1,30 @@
 from __future__ import annotations
 
 import uuid
+from collections.abc import Iterator
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
+from src.api.agents.answer_cache import SemanticAnswerCache
 from src.api.agents.orchestrator import (
     BusinessContext,
     CallSession,
     _is_simple_intent,
     pick_filler_phrase,
     process_utterance,
+    template_reply,
 )
+from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.tracing import TurnTrace, current_trace
+
+
+@pytest.fixture(autouse=True)
+def no_answer_cache() -> Iterator[None]:
+    with patch.object(settings, "answer_cache_enabled", False):
+        yield
 
 
 class TestIsSimpleIntent:
@@ -87,7 +100,7 @@ class TestConversationHistoryTrimming:
                 {"role": "caller", "content": f"message {i}"}
             )
 
-        async for _ in process_utterance(session, "hello"):
+        async for _ in process_utterance(session, "and one more thing"):
             pass
 
         assert captured_history is not None
@@ -253,3 +266,203 @@ class TestPickFillerPhrase:
 
     def test_default_filler_for_unknown(self) -> None:
         assert pick_filler_phrase("something random blah") == "One moment."
+
+
+class TestTurnTracing:
+    @pytest.mark.asyncio
+    @patch("src.api.agents.orchestrator.classify_and_extract")
+    @patch("src.api.agents.orchestrator.retrieve_knowledge")
+    @patch("src.api.agents.orchestrator.synthesize_response")
+    async def test_marks_pipeline_stages_on_current_trace(
+        self,
+        mock_synthesize: MagicMock,
+        mock_kb: AsyncMock,
+        mock_classify: AsyncMock,
+    ) -> None:
+        mock_classify.return_value = ("INQUIRY", None)
+        mock_kb.return_value = "Open 9-5"
+
+        async def fake_synthesize(**kwargs):  # type: ignore[no-untyped-def]
+            yield "We are "
+            yield "open 9-5."
+
+        mock_synthesize.side_effect = fake_synthesize
+
+        context = BusinessContext(
+            business_id=uuid.uuid4(),
+            name="Test Clinic",
+            location="123 St",
+            hours="9-5",
+            policies="None",
+        )
+        session = CallSession(business=context, session=MagicMock())
+        trace = TurnTrace("test")
+        token = current_trace.set(trace)
+        try:
+            async for _ in process_utterance(session, "What are your hours?"):
+                pass
+        finally:
+            current_trace.reset(token)
+
+        for stage in ("classify_start", "classify_end", "kb_start", "kb_end"):
+            assert trace.has(stage)
+        assert trace.marks["first_token"] >= trace.marks["classify_end"]
+
+
+def _call_session() -> CallSession:
+    context = BusinessContext(
+        business_id=uuid.uuid4(),
+        name="Test Clinic",
+        location="123 St",
+        hours="9-5",
+        policies="None",
+    )
+    return CallSession(business=context, session=MagicMock())
+
+
+class TestTemplateReply:
+    def test_greeting_gets_template_and_is_recorded(self) -> None:
+        metrics.reset()
+        session = _call_session()
+
+        reply = template_reply(session, "Hello there!")
+
+        assert reply is not None
+        assert session.conversation_history == [
+            {"role": "caller", "content": "Hello there!"},
+            {"role": "agent", "content": reply},
+        ]
+        assert metrics.counter("reply.template_greeting") == 1
+
+    def test_goodbye_names_the_business(self) -> None:
+        reply = template_reply(_call_session(), "okay bye")
+
+        assert reply is not None
+        assert "Test Clinic" in reply
+
+    def test_does_not_repeat_the_previous_reply(self) -> None:
+        session = _call_session()
+        for _ in range(10):
+            previous = template_reply(session, "hi")
+            assert template_reply(session, "hi") != previous
+
+    def test_substantive_turns_and_mid_booking_greetings_fall_through(self) -> None:
+        session = _call_session()
+        assert template_reply(session, "What are your hours?") is None
+
+        session.booking_draft = {"service_name": "Cleaning"}
+        assert template_reply(session, "hello") is None
+        assert template_reply(session, "bye") is not None
+
+    @pytest.mark.parametrize(
+        "utterance",
+        [
+            "Good morning, are you open Saturday?",
+            "Hi, I want to know your hours",
+            "hi my tooth hurts",
+        ],
+    )
+    def test_greeting_with_a_question_falls_through(self, utterance: str) -> None:
+        assert template_reply(_call_session(), utterance) is None
+
+    @pytest.mark.parametrize("utterance", ["thanks", "great, thanks", "no thanks"])
+    def test_thanks_without_a_farewell_falls_through(self, utterance: str) -> None:
+        assert template_reply(_call_session(), utterance) is None
+
+    @pytest.mark.parametrize("utterance", ["thanks, bye", "goodbye"])
+    def test_explicit_farewell_gets_goodbye_template(self, utterance: str) -> None:
+        assert template_reply(_call_session(), utterance) is not None
+
+
+class TestAnswerCache:
+    @pytest.fixture(autouse=True)
+    def answer_cache(self) -> Iterator[SemanticAnswerCache]:
+        cache = SemanticAnswerCache(
+            max_entries=8, max_businesses=8, ttl_s=60.0, threshold=0.9
+        )
+        with (
+            patch.object(settings, "answer_cache_enabled", True),
+            patch("src.api.agents.orchestrator.get_answer_cache", return_value=cache),
+            patch(
+                "src.api.agents.orchestrator.embed_utterance",
+                AsyncMock(return_value=np.array([1.0, 0.0], dtype=np.float32)),
+            ),
+            patch(
+                "src.api.agents.orchestrator.classify_and_extract",
+                AsyncMock(return_value=("INQUIRY", None)),
+            ),
+            patch(
+                "src.api.agents.orchestrator.retrieve_knowledge",
+                AsyncMock(return_value="Open 9-5"),
+            ),
+        ):
+            yield cache
+
+    @pytest.mark.asyncio
+    @patch("src.api.agents.orchestrator.synthesize_response")
+    async def test_reuses_answer_within_business_until_invalidated(
+        self, mock_synthesize: MagicMock, answer_cache: SemanticAnswerCache
+    ) -> None:
+        async def fake_synthesize(**kwargs):  # type: ignore[no-untyped-def]
+            yield "We are open 9-5."
+
+        mock_synthesize.side_effect = fake_synthesize
+        first, second = _call_session(), _call_session()
+        second.business = first.business
+
+        async for _ in process_utterance(first, "What are your hours?"):
+            pass
+        tokens = [t async for t in process_utterance(second, "When are you open?")]
+
+        assert tokens == ["We are open 9-5."]
+        assert mock_synthesize.call_count == 1
+        assert second.cached_answer is not None
+        assert second.conversation_history[-1] == {
+            "role": "agent",
+            "content": "We are open 9-5.",
+        }
+
+        answer_cache.invalidate(first.business.business_id)
+        async for _ in process_utterance(second, "When are you open?"):
+            pass
+        assert mock_synthesize.call_count == 2
+        assert second.cached_answer is None
+
+    @pytest.mark.asyncio
+    @patch("src.api.agents.orchestrator.synthesize_response")
+    async def test_cacheable_answers_are_synthesized_without_the_conversation(
+        self, mock_synthesize: MagicMock, answer_cache: SemanticAnswerCache
+    ) -> None:
+        async def fake_synthesize(**kwargs):  # type: ignore[no-untyped-def]
+            yield "We are open 9-5."
+
+        mock_synthesize.side_effect = fake_synthesize
+        session = _call_session()
+        session.conversation_history.append(
+            {"role": "caller", "content": "This is Jane Doe, born 4/2/1961."}
+        )
+
+        async for _ in process_utterance(session, "What are your hours?"):
+            pass
+
+        kwargs = mock_synthesize.call_args.kwargs
+        assert kwargs["conversation_history"] is None
+        assert "reused for other callers" in kwargs["additional_context"]
+        assert len(answer_cache) == 1
+
+    @pytest.mark.asyncio
+    @patch("src.api.agents.orchestrator.synthesize_response")
+    async def test_turns_after_a_booking_skip_the_cache(
+        self, mock_synthesize: MagicMock, answer_cache: SemanticAnswerCache
+    ) -> None:
+        async def fake_synthesize(**kwargs):  # type: ignore[no-untyped-def]
+            yield "We are open 9-5."
+
+        mock_synthesize.side_effect = fake_synthesize
+        session = _call_session()
+        session.booking_completed = True
+
+        async for _ in process_utterance(session, "What are your hours?"):
+            pass
+
+        assert len(answer_cache) == 0
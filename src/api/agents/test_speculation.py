@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import AsyncGenerator, Iterator
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.api.agents.orchestrator import BusinessContext, CallSession, process_utterance
+from src.api.agents.speculation import SpeculativeUnderstanding
+
+UNDERSTOOD = ("BOOKING", {"service": "checkup"}, "Checkups take 30 minutes.")
+
+
+def _call_session() -> CallSession:
+    context = BusinessContext(
+        business_id=uuid.uuid4(), name="Clinic", location="", hours="", policies=""
+    )
+    return CallSession(business=context, session=AsyncMock())
+
+
+def _speculation() -> SpeculativeUnderstanding:
+    return SpeculativeUnderstanding(_call_session(), min_words=3, match_ratio=0.9)
+
+
+@pytest.fixture
+def understand() -> Iterator[AsyncMock]:
+    mock = AsyncMock(return_value=UNDERSTOOD)
+    with patch("src.api.agents.speculation.understand_utterance", mock):
+        yield mock
+
+
+@pytest.mark.asyncio
+async def test_settled_interim_starts_one_speculation(understand: AsyncMock) -> None:
+    speculation = _speculation()
+
+    speculation.observe("I'd like")
+    speculation.observe("I'd like to book")
+    speculation.observe("I'd like to book a")
+    await asyncio.sleep(0)
+
+    understand.assert_awaited_once()
+    assert understand.await_args is not None
+    assert understand.await_args.args[1] == "I'd like to book"
+
+
+@pytest.mark.asyncio
+async def test_revised_interim_does_not_start(understand: AsyncMock) -> None:
+    speculation = _speculation()
+
+    speculation.observe("I'd like to look")
+    speculation.observe("I'd like a book now")
+    await asyncio.sleep(0)
+
+    understand.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_matching_final_reuses_result(understand: AsyncMock) -> None:
+    speculation = _speculation()
+    speculation.observe("I want to book")
+    speculation.observe("I want to book a checkup")
+    await asyncio.sleep(0)
+
+    task = speculation.take("I want to book a checkup.")
+
+    assert task is not None
+    assert await task == UNDERSTOOD
+    assert (speculation.hits, speculation.turns) == (1, 1)
+    assert speculation.saved_ms >= 0
+
+
+@pytest.mark.asyncio
+async def test_close_final_drops_speculated_booking_fields(
+    understand: AsyncMock,
+) -> None:
+    understand.return_value = (
+        "BOOKING",
+        {"date": "Tuesday", "time": "3:00"},
+        "Checkups take 30 minutes.",
+    )
+    speculation = _speculation()
+    speculation.observe("book a checkup on")
+    speculation.observe("book a checkup on Tuesday at 3")
+    await asyncio.sleep(0)
+
+    task = speculation.take("Book a checkup on Thursday at 3:30.")
+
+    assert task is not None
+    assert await task == ("BOOKING", None, "Checkups take 30 minutes.")
+    assert speculation.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_different_final_cancels_speculation(understand: AsyncMock) -> None:
+    async def slow(*args: Any) -> None:
+        await asyncio.sleep(10)
+
+    understand.side_effect = slow
+    speculation = _speculation()
+    speculation.observe("what are your")
+    speculation.observe("what are your hours")
+    await asyncio.sleep(0)
+    pending = speculation._task
+
+    assert speculation.take("Do you take walk-ins on Saturday?") is None
+    await asyncio.sleep(0)
+
+    assert pending is not None and pending.cancelled()
+    assert (speculation.hits, speculation.turns) == (0, 1)
+
+
+@pytest.mark.asyncio
+@patch("src.api.agents.orchestrator.handle_booking", new_callable=AsyncMock)
+@patch("src.api.agents.orchestrator.synthesize_response")
+@patch("src.api.agents.orchestrator.classify_and_extract")
+async def test_process_utterance_skips_classification_when_prefetched(
+    mock_classify: AsyncMock, mock_synthesize: AsyncMock, mock_booking: AsyncMock
+) -> None:
+    captured: dict[str, Any] = {}
+
+    async def fake_synthesize(**kwargs: Any) -> AsyncGenerator[str, None]:
+        captured.update(kwargs)
+        yield "Sure."
+
+    mock_synthesize.side_effect = fake_synthesize
+    mock_booking.return_value = "Which day works?"
+    prefetched = asyncio.get_running_loop().create_future()
+    prefetched.set_result(UNDERSTOOD)
+
+    tokens = [
+        t
+        async for t in process_utterance(
+            _call_session(), "I want to book a checkup", prefetched
+        )
+    ]
+
+    assert tokens == ["Sure."]
+    mock_classify.assert_not_called()
+    assert mock_booking.await_args is not None
+    assert mock_booking.await_args.kwargs["pre_extracted"] == UNDERSTOOD[1]
+    assert captured["intent"] == "BOOKING"
+    assert "Checkups take 30 minutes." in captured["context_section"]
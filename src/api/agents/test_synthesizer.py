@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.api.agents.synthesizer import synthesize_response
+from src.api.metrics import metrics
+
+
+class FakeStream:
+    def __init__(self, tokens: list[str]) -> None:
+        self._tokens = tokens
+        self.close = AsyncMock()
+
+    async def __aiter__(self) -> AsyncIterator[SimpleNamespace]:
+        for token in self._tokens:
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+@pytest.fixture
+def client() -> Iterator[MagicMock]:
+    metrics.reset()
+    client = MagicMock()
+    with patch("src.api.agents.synthesizer.get_openai_client", return_value=client):
+        yield client
+
+
+def _reply(client: MagicMock, stream: FakeStream) -> AsyncGenerator[str, None]:
+    client.chat.completions.create = AsyncMock(return_value=stream)
+    return synthesize_response(
+        business_name="Clinic",
+        location="",
+        hours="",
+        policies="",
+        intent="FAQ",
+        utterance="are you open",
+    )
+
+
+@pytest.mark.asyncio
+async def test_completed_stream_is_not_counted_as_cancelled(client: MagicMock) -> None:
+    stream = FakeStream(["We", " are", " open."])
+
+    tokens = [token async for token in _reply(client, stream)]
+
+    assert tokens == ["We", " are", " open."]
+    stream.close.assert_not_awaited()
+    assert metrics.counter("llm.cancelled_streams") == 0
+
+
+@pytest.mark.asyncio
+async def test_abandoned_reply_closes_llm_stream(client: MagicMock) -> None:
+    stream = FakeStream(["We", " are", " open", " until", " six."])
+    reply = _reply(client, stream)
+
+    assert await anext(reply) == "We"
+    assert await anext(reply) == " are"
+    await reply.aclose()
+
+    stream.close.assert_awaited_once()
+    assert metrics.counter("llm.cancelled_streams") == 1
+    summary = metrics.summary("llm.tokens_before_cancel")
+    assert summary is not None and summary["max"] == 2
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from src.api.metrics import metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# In-process LRU cache with a per-entry TTL, for results of slow upstream
+# calls. get_or_load() is single-flight: concurrent misses on one key share
+# one load. Only touched from the event loop, so lookups and inserts need no
+# lock (nothing awaits between checking and updating the maps).
+class AsyncLRUCache(Generic[K, V]):
+    def __init__(self, name: str, max_entries: int, ttl_s: float) -> None:
+        self._name = name
+        self._max_entries = max_entries
+        self._ttl_s = ttl_s
+        # key -> (expires_at, load_ms, value)
+        self._entries: OrderedDict[K, tuple[float, float, V]] = OrderedDict()
+        self._loads: dict[K, asyncio.Task[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_load(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, load_ms, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                metrics.incr(f"{self._name}.hits")
+                metrics.observe(f"{self._name}.saved_ms", load_ms)
+                return value
+            del self._entries[key]
+
+        task = self._loads.get(key)
+        if task is None:
+            metrics.incr(f"{self._name}.misses")
+            task = asyncio.ensure_future(self._load(key, load))
+            self._loads[key] = task
+            task.add_done_callback(lambda done: self._load_finished(key, done))
+        else:
+            metrics.incr(f"{self._name}.coalesced")
+        # shield: a caller that gives up (a barge-in cancelling its turn)
+        # does not cancel the load the other waiters share.
+        return await asyncio.shield(task)
+
+    def _load_finished(self, key: K, task: asyncio.Task[V]) -> None:
+        self._loads.pop(key, None)
+        if not task.cancelled():
+            # Failures reach every waiter; this just keeps one whose waiters
+            # all gave up from being logged as never retrieved.
+            task.exception()
+
+    async def _load(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        started = time.monotonic()
+        value = await load()
+        load_ms = (time.monotonic() - started) * 1000
+        self._entries[key] = (time.monotonic() + self._ttl_s, load_ms, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return value
@@ -14,12 +14,61 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     deepgram_api_key: str = ""
     elevenlabs_api_key: str = ""
+    # Provider endpoints, overridable to point at scripts/provider_simulator.py
+    openai_base_url: str = ""
+    deepgram_api_url: str = "https://api.deepgram.com"
+    elevenlabs_api_url: str = "https://api.elevenlabs.io"
+    serper_api_url: str = "https://google.serper.dev"
     elevenlabs_voice_id: str = ""
     elevenlabs_model_id: str = "eleven_turbo_v2_5"
+    elevenlabs_multi_context: bool = False
     twilio_account_sid: str = ""
     twilio_auth_token: str = ""
     tts_provider: str = "deepgram"
     deepgram_tts_model: str = "aura-2-thalia-en"
+    tts_pool_size: int = 2
+    tts_pool_max_age_s: float = 300.0
+    tts_stall_timeout_ms: int = 2000
+    tts_failover_timeout_ms: int = 1500
+    audio_cache_dir: str = ".cache/tts_audio"
+    tts_chunk_first_chars: int = 50
+    tts_chunk_max_chars: int = 80
+    tts_chunk_max_delay_ms: int = 150
+    stt_batch_ms: int = 60
+    stt_batch_max_delay_ms: int = 60
+    stt_pool_size: int = 2
+    stt_pool_max_age_s: float = 300.0
+    stt_endpointing_ms: int = 200
+    stt_utterance_end_ms: int = 1000
+    stt_dictation_hold_ms: int = 900
+    stt_continuation_hold_ms: int = 500
+    speculation_enabled: bool = False
+    speculation_min_words: int = 3
+    speculation_match_ratio: float = 0.9
+    intent_local_enabled: bool = True
+    intent_local_threshold: float = 0.8
+    intent_model_path: str = ""
+    intent_cache_size: int = 4096
+    intent_cache_ttl_s: float = 600.0
+    template_replies_enabled: bool = True
+    template_reply_threshold: float = 0.9
+    # Off until the threshold is calibrated against real traffic for the
+    # embedding model in use.
+    answer_cache_enabled: bool = False
+    answer_cache_threshold: float = 0.95
+    answer_cache_max_entries: int = 256
+    answer_cache_max_businesses: int = 1000
+    answer_cache_ttl_s: float = 3600.0
+    answer_cache_audio: bool = True
+    twilio_max_lead_ms: int = 200
+    vad_enabled: bool = True
+    vad_energy_threshold_db: float = -45.0
+    vad_zcr_max: float = 0.3
+    vad_start_ms: int = 60
+    vad_hangover_ms: int = 500
+    vad_preroll_ms: int = 300
+    trace_buffer_size: int = 1000
+    latency_target_ms: float = 300.0
     serper_api_key: str = ""
 
     chroma_host: str = "localhost"
@@ -27,5 +76,13 @@ class Settings(BaseSettings):
 
     model_config = {"env_file": ".env", "extra": "ignore"}
 
+    @property
+    def deepgram_ws_url(self) -> str:
+        return "ws" + self.deepgram_api_url.removeprefix("http")
+
+    @property
+    def elevenlabs_ws_url(self) -> str:
+        return "ws" + self.elevenlabs_api_url.removeprefix("http")
+
 
 settings = Settings()
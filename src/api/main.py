@@ -1,7 +1,11 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from src.api.config import settings
 from src.api.routers import (
     auth,
     booking_rules,
@@ -10,12 +14,28 @@ from src.api.routers import (
     call_logs,
     health,
     knowledge_base,
+    metrics,
     services,
     voice_gateway,
 )
+from src.api.voice.stt import BROWSER_LINEAR16, TWILIO_MULAW, get_stt_pool
+from src.api.voice.tts import configured_providers, get_tts_pool
 from src.shared.errors import AppError
 
-app = FastAPI(title="Voice Agent Healthcare", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    stt_pool = get_stt_pool()
+    tts_pool = get_tts_pool()
+    if settings.deepgram_api_key:
+        stt_pool.prewarm([TWILIO_MULAW, BROWSER_LINEAR16])
+    tts_pool.prewarm(configured_providers())
+    yield
+    await stt_pool.close()
+    await tts_pool.close()
+
+
+app = FastAPI(title="Voice Agent Healthcare", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +46,7 @@ app.add_middleware(
 )
 
 app.include_router(health.router)
+app.include_router(metrics.router)
 app.include_router(auth.router)
 app.include_router(businesses.router)
 app.include_router(services.router)
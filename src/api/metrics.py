@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict, deque
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+MAX_SAMPLES_PER_SERIES = 2048
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(values: npt.NDArray[np.float64]) -> dict[str, float]:
+    result = {"count": float(values.size), "mean": float(values.mean())}
+    for pct, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        result[f"p{pct}"] = float(value)
+    result["max"] = float(values.max())
+    return result
+
+
+class MetricsRegistry:
+    def __init__(self, max_samples: int = MAX_SAMPLES_PER_SERIES) -> None:
+        self._lock = threading.Lock()
+        self._max_samples = max_samples
+        self._counters: defaultdict[str, float] = defaultdict(float)
+        self._series: dict[str, deque[float]] = {}
+
+    def incr(self, name: str, value: float = 1.0) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = deque(maxlen=self._max_samples)
+            series.append(value)
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0.0)
+
+    def summary(self, name: str) -> dict[str, float] | None:
+        with self._lock:
+            series = self._series.get(name)
+            values = np.fromiter(series, dtype=np.float64) if series else None
+        if values is None:
+            return None
+        return summarize(values)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._series)
+        summaries = {name: self.summary(name) for name in names}
+        return {
+            "counters": counters,
+            "histograms": {k: v for k, v in summaries.items() if v is not None},
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._series.clear()
+
+
+metrics = MetricsRegistry()
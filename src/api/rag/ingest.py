@@ -31,7 +31,10 @@ async def ingest_document(
     splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
     chunks = splitter.split_text(content)
 
-    embeddings_model = OpenAIEmbeddings(api_key=settings.openai_api_key)
+    embeddings_model = OpenAIEmbeddings(
+        api_key=settings.openai_api_key,
+        openai_api_base=settings.openai_base_url or None,
+    )
     embeddings = await embeddings_model.aembed_documents(chunks)
 
     client = get_chroma_client()
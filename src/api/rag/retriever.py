@@ -4,17 +4,48 @@ import uuid
 
 from langchain_openai import OpenAIEmbeddings
 
+from src.api.cache import AsyncLRUCache
 from src.api.config import settings
 from src.api.rag.ingest import collection_name_for_business, get_chroma_client
 
+# Long enough for one turn's retrieval and answer-cache lookup to share a
+# query embedding.
+EMBEDDING_CACHE_SIZE = 512
+EMBEDDING_CACHE_TTL_S = 60.0
+
+_embedding_cache: AsyncLRUCache[str, list[float]] | None = None
+
+
+def _get_embedding_cache() -> AsyncLRUCache[str, list[float]]:
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = AsyncLRUCache(
+            "embedding.cache", EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_TTL_S
+        )
+    return _embedding_cache
+
+
+async def embed_query(query: str) -> list[float]:
+    return await _get_embedding_cache().get_or_load(query, lambda: _embed(query))
+
+
+async def _embed(query: str) -> list[float]:
+    # A caller utterance is far below the model's context length, so skip
+    # the tiktoken length check (and its encoding download on first use).
+    embeddings_model = OpenAIEmbeddings(
+        api_key=settings.openai_api_key,
+        openai_api_base=settings.openai_base_url or None,
+        check_embedding_ctx_length=False,
+    )
+    return await embeddings_model.aembed_query(query)
+
 
 async def retrieve_relevant_chunks(
     business_id: uuid.UUID,
     query: str,
     n_results: int = 5,
 ) -> list[str]:
-    embeddings_model = OpenAIEmbeddings(api_key=settings.openai_api_key)
-    query_embedding = await embeddings_model.aembed_query(query)
+    query_embedding = await embed_query(query)
 
     client = get_chroma_client()
     col_name = collection_name_for_business(business_id)
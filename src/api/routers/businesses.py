@@ -3,9 +3,10 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from passlib.context import CryptContext
 
+from src.api.agents.answer_cache import get_answer_cache
 from src.api.db.engine import get_session
 from src.api.db.queries import (
     create_admin_user,
@@ -14,6 +15,7 @@ from src.api.db.queries import (
     update_business,
 )
 from src.api.dependencies import get_current_business_id
+from src.api.voice.audio_cache import get_audio_cache
 from src.api_schema.schemas import BusinessCreate, BusinessResponse, BusinessUpdate
 
 if TYPE_CHECKING:
@@ -26,6 +28,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 @router.post("", response_model=BusinessResponse, status_code=status.HTTP_201_CREATED)
 async def register_business(
     body: BusinessCreate,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
 ) -> BusinessResponse:
     business = await create_business(
@@ -43,6 +46,7 @@ async def register_business(
         email=body.admin_email,
         hashed_password=pwd_context.hash(body.admin_password),
     )
+    background_tasks.add_task(get_audio_cache().warm_business, business.name)
     return BusinessResponse.model_validate(business)
 
 
@@ -62,6 +66,7 @@ async def get_business(
 async def patch_business(
     business_id: uuid.UUID,
     body: BusinessUpdate,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
     _current_business: uuid.UUID = Depends(get_current_business_id),
 ) -> BusinessResponse:
@@ -70,4 +75,7 @@ async def patch_business(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business not found")
     updates = body.model_dump(exclude_unset=True)
     updated = await update_business(session, business, **updates)
+    get_answer_cache().invalidate(business_id)
+    if "name" in updates:
+        background_tasks.add_task(get_audio_cache().warm_business, updated.name)
     return BusinessResponse.model_validate(updated)
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from fastapi import APIRouter, Depends, HTTPException, status
 from starlette.responses import Response
 
+from src.api.agents.answer_cache import get_answer_cache
 from src.api.db.engine import get_session
 from src.api.db.queries import (
     create_document,
@@ -46,6 +47,7 @@ async def upload_document(
         content=body.content,
     )
     # TODO: trigger RAG ingest asynchronously
+    get_answer_cache().invalidate(business_id)
     return DocumentResponse.model_validate(doc)
 
 
@@ -59,3 +61,4 @@ async def remove_document(
     if not doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
     await delete_document(session, doc)
+    get_answer_cache().invalidate(doc.business_id)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.tracing import traces
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict[str, Any]:
+    return metrics.snapshot()
+
+
+@router.get("/metrics/turns")
+async def get_turn_latency(recent: int = 0) -> dict[str, Any]:
+    result = traces.summary(settings.latency_target_ms)
+    if recent:
+        result["recent"] = traces.recent(recent)
+    return result
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from fastapi import APIRouter, Depends, HTTPException, status
 from starlette.responses import Response
 
+from src.api.agents.answer_cache import get_answer_cache
 from src.api.db.engine import get_session
 from src.api.db.queries import (
     create_service,
@@ -41,6 +42,7 @@ async def add_service(
     _current_business: uuid.UUID = Depends(get_current_business_id),
 ) -> ServiceResponse:
     service = await create_service(session, business_id=business_id, **body.model_dump())
+    get_answer_cache().invalidate(business_id)
     return ServiceResponse.model_validate(service)
 
 
@@ -55,6 +57,7 @@ async def patch_service(
     if not service:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Service not found")
     updated = await update_service(session, service, **body.model_dump(exclude_unset=True))
+    get_answer_cache().invalidate(updated.business_id)
     return ServiceResponse.model_validate(updated)
 
 
@@ -68,3 +71,4 @@ async def remove_service(
     if not service:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Service not found")
     await delete_service(session, service)
+    get_answer_cache().invalidate(service.business_id)
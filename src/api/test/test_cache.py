@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.api.cache import AsyncLRUCache
+from src.api.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_load_and_reports_saved_time() -> None:
+    metrics.reset()
+    cache: AsyncLRUCache[str, int] = AsyncLRUCache("test.cache", 10, 60.0)
+    load = AsyncMock(return_value=1)
+
+    assert await cache.get_or_load("a", load) == 1
+    assert await cache.get_or_load("a", load) == 1
+
+    load.assert_awaited_once()
+    assert metrics.counter("test.cache.hits") == 1
+    assert metrics.counter("test.cache.misses") == 1
+    assert metrics.summary("test.cache.saved_ms") is not None
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_least_recent_is_evicted() -> None:
+    cache: AsyncLRUCache[str, str] = AsyncLRUCache("test.cache", 2, 60.0)
+    for key in ("a", "b"):
+        await cache.get_or_load(key, AsyncMock(return_value=key))
+    await cache.get_or_load("a", AsyncMock())  # "b" is now least recent
+    await cache.get_or_load("c", AsyncMock(return_value="c"))
+
+    reload = AsyncMock(return_value="b2")
+    assert await cache.get_or_load("b", reload) == "b2"
+    assert len(cache) == 2
+
+    with patch("src.api.cache.time.monotonic", return_value=1e12):
+        assert await cache.get_or_load("b", AsyncMock(return_value="b3")) == "b3"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load() -> None:
+    metrics.reset()
+    cache: AsyncLRUCache[str, int] = AsyncLRUCache("test.cache", 10, 60.0)
+    release = asyncio.Event()
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 7
+
+    waiters = [asyncio.create_task(cache.get_or_load("k", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+    waiters[0].cancel()  # one caller giving up does not cancel the others' load
+    release.set()
+    results = await asyncio.gather(*waiters[1:])
+
+    assert results == [7, 7]
+    assert calls == 1
+    assert metrics.counter("test.cache.coalesced") == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_not_cached() -> None:
+    cache: AsyncLRUCache[str, int] = AsyncLRUCache("test.cache", 10, 60.0)
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("k", AsyncMock(side_effect=RuntimeError("boom")))
+
+    assert await cache.get_or_load("k", AsyncMock(return_value=3)) == 3
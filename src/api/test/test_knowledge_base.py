@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from src.api.agents.answer_cache import get_answer_cache
+
 if TYPE_CHECKING:
     from httpx import AsyncClient
 
@@ -85,3 +87,23 @@ async def test_delete_nonexistent_document(client: AsyncClient) -> None:
     )
     assert resp.status_code == 404
     assert resp.json() == {"detail": "Document not found"}
+
+
+@pytest.mark.asyncio
+async def test_document_changes_invalidate_cached_answers(client: AsyncClient) -> None:
+    biz_id = await _create_business(client, "inval")
+    cache = get_answer_cache()
+    before = cache.generation(uuid.UUID(biz_id))
+
+    create_resp = await client.post(
+        f"/businesses/{biz_id}/knowledge-base",
+        json={"title": "Parking", "content": "Free parking behind the clinic."},
+        headers=AUTH_HEADERS,
+    )
+    assert cache.generation(uuid.UUID(biz_id)) == before + 1
+
+    doc_id = create_resp.json()["id"]
+    await client.delete(
+        f"/businesses/{biz_id}/knowledge-base/{doc_id}", headers=AUTH_HEADERS
+    )
+    assert cache.generation(uuid.UUID(biz_id)) == before + 2
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from src.api.metrics import MetricsRegistry, metrics
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+
+
+def test_registry_counters_and_summaries() -> None:
+    registry = MetricsRegistry(max_samples=100)
+    registry.incr("hits")
+    registry.incr("hits", 2)
+    for value in range(1, 101):
+        registry.observe("latency_ms", value)
+
+    assert registry.counter("hits") == 3
+    summary = registry.summary("latency_ms")
+    assert summary is not None
+    assert summary["count"] == 100
+    assert summary["p50"] == pytest.approx(50.5)
+    assert summary["max"] == 100
+
+
+def test_registry_series_are_bounded() -> None:
+    registry = MetricsRegistry(max_samples=10)
+    for value in range(50):
+        registry.observe("latency_ms", value)
+
+    summary = registry.summary("latency_ms")
+    assert summary is not None
+    assert summary["count"] == 10
+    assert registry.summary("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient) -> None:
+    metrics.reset()
+    metrics.incr("stt.calls")
+    metrics.observe("stt.bytes_per_call.mulaw", 1600)
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["counters"]["stt.calls"] == 1
+    assert body["histograms"]["stt.bytes_per_call.mulaw"]["count"] == 1
@@ -4,6 +4,8 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from src.api.agents.answer_cache import get_answer_cache
+
 if TYPE_CHECKING:
     from httpx import AsyncClient
 
@@ -98,3 +100,28 @@ async def test_patch_service_not_found(client: AsyncClient) -> None:
     )
     assert resp.status_code == 404
     assert resp.json() == {"detail": "Service not found"}
+
+
+@pytest.mark.asyncio
+async def test_service_changes_invalidate_cached_answers(client: AsyncClient) -> None:
+    import uuid
+
+    biz_id = await _create_business(client, "5")
+    headers = {"Authorization": "Bearer fake"}
+    cache = get_answer_cache()
+    generation = cache.generation(uuid.UUID(biz_id))
+
+    create_resp = await client.post(
+        f"/businesses/{biz_id}/services",
+        json={"name": "Checkup", "duration_minutes": 30},
+        headers=headers,
+    )
+    svc_id = create_resp.json()["id"]
+    await client.patch(
+        f"/businesses/{biz_id}/services/{svc_id}",
+        json={"price": 120.0},
+        headers=headers,
+    )
+    await client.delete(f"/businesses/{biz_id}/services/{svc_id}", headers=headers)
+
+    assert cache.generation(uuid.UUID(biz_id)) == generation + 3
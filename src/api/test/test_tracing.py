@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from src.api.tracing import (
+    TraceRecorder,
+    TurnTrace,
+    current_trace,
+    mark,
+    traced,
+    traces,
+)
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+
+
+def _trace(first_frame_ms: float) -> TurnTrace:
+    trace = TurnTrace("twilio", started_at=0.0)
+    with patch("src.api.tracing.time.monotonic", return_value=first_frame_ms / 1000):
+        trace.mark("first_token")
+        trace.mark("first_frame")
+    return trace
+
+
+def test_mark_keeps_first_timestamp() -> None:
+    trace = TurnTrace("twilio", started_at=0.0)
+    with patch("src.api.tracing.time.monotonic", return_value=0.1):
+        trace.mark("first_audio")
+    with patch("src.api.tracing.time.monotonic", return_value=0.5):
+        trace.mark("first_audio")
+
+    assert trace.marks["first_audio"] == pytest.approx(100.0)
+
+
+def test_recorder_is_bounded_and_summarizes_stages() -> None:
+    recorder = TraceRecorder(capacity=3)
+    for ms in (100, 200, 300, 400):
+        recorder.record(_trace(ms))
+
+    summary = recorder.summary(target_ms=300)
+
+    assert summary["turns"] == 3
+    assert summary["stages"]["first_frame"]["p50"] == pytest.approx(300.0)
+    assert summary["within_target"] == pytest.approx(2 / 3)
+    assert "kb_start" not in summary["stages"]
+    assert len(recorder.recent(2)) == 2
+
+
+def test_finish_records_once() -> None:
+    traces.reset()
+    trace = _trace(120)
+
+    trace.finish()
+    trace.finish()
+
+    assert traces.summary(target_ms=300)["turns"] == 1
+
+
+@pytest.mark.asyncio
+async def test_traced_marks_start_and_end_on_current_trace() -> None:
+    trace = TurnTrace("browser")
+    token = current_trace.set(trace)
+
+    async def work() -> str:
+        mark("first_token")
+        return "done"
+
+    try:
+        assert await traced("classify", work()) == "done"
+    finally:
+        current_trace.reset(token)
+
+    assert list(trace.marks) == ["classify_start", "first_token", "classify_end"]
+
+
+@pytest.mark.asyncio
+async def test_turn_latency_endpoint(client: AsyncClient) -> None:
+    traces.reset()
+    _trace(250).finish()
+
+    response = await client.get("/metrics/turns", params={"recent": 5})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["turns"] == 1
+    assert body["target_ms"] == 300
+    assert body["within_target"] == 1.0
+    assert body["stages"]["first_frame"]["max"] == pytest.approx(250.0)
+    assert body["recent"][0]["channel"] == "twilio"
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 from typing import TYPE_CHECKING
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -56,31 +56,36 @@ async def test_twilio_incoming_uses_host_header(client: AsyncClient) -> None:
     assert "wss://my-domain.io/voice/ws/+15550000000" in resp.text
 
 
+async def _found(context: BusinessContext) -> BusinessContext:
+    return context
+
+
 @pytest.mark.asyncio
-async def test_twilio_call_handler_init() -> None:
+async def test_twilio_call_handler_closes_when_business_not_found() -> None:
     mock_ws = AsyncMock()
-    mock_session = AsyncMock()
-    biz_id = uuid.uuid4()
-    context = BusinessContext(
-        business_id=biz_id,
-        name="Test",
-        location="123 Main",
-        hours="9-5",
-        policies="None",
-    )
+    mock_ws.__aiter__ = lambda self: self
+    mock_ws.__anext__ = AsyncMock(side_effect=StopAsyncIteration)
+
+    async def not_found() -> None:
+        return None
 
+    mock_stt = AsyncMock()
+    mock_tts = AsyncMock()
     with (
-        patch("src.api.voice.twilio_handler.DeepgramSTT"),
-        patch("src.api.voice.twilio_handler.TTSWithFallback"),
+        patch("src.api.voice.pipeline.DeepgramSTT", return_value=mock_stt),
+        patch("src.api.voice.pipeline.TTSWithFallback", return_value=mock_tts),
     ):
         handler = TwilioCallHandler(
             twilio_ws=mock_ws,
-            business_context=context,
-            db_session=mock_session,
+            business=not_found(),
+            db_session=AsyncMock(),
         )
+        await handler.handle()
 
-    assert handler._call_session.business.business_id == biz_id
-    assert handler._call_session.business.name == "Test"
+    mock_ws.close.assert_awaited_once_with(code=1008, reason="Business not found")
+    mock_stt.close.assert_awaited_once()
+    mock_tts.close.assert_awaited_once()
+    mock_tts.send_text.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -114,24 +119,76 @@ async def test_twilio_call_handler_handle_stop_event() -> None:
     mock_tts = AsyncMock()
     mock_tts.connect = AsyncMock()
     mock_tts.close = AsyncMock()
-    mock_tts.get_audio = AsyncMock(
+    mock_tts.get_audio = MagicMock(
         return_value=AsyncMock(
             __aiter__=lambda s: s, __anext__=AsyncMock(side_effect=StopAsyncIteration)
         )
     )
 
     with (
-        patch("src.api.voice.twilio_handler.DeepgramSTT", return_value=mock_stt),
-        patch("src.api.voice.twilio_handler.TTSWithFallback", return_value=mock_tts),
+        patch("src.api.voice.pipeline.DeepgramSTT", return_value=mock_stt),
+        patch("src.api.voice.pipeline.TTSWithFallback", return_value=mock_tts),
     ):
         handler = TwilioCallHandler(
             twilio_ws=mock_ws,
-            business_context=context,
+            business=_found(context),
             db_session=mock_session,
         )
         await handler.handle()
 
+    assert handler._pipeline.call_session.business.business_id == context.business_id
     mock_stt.connect.assert_awaited_once()
     mock_tts.connect.assert_awaited_once()
     mock_stt.close.assert_awaited_once()
     mock_tts.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_twilio_call_handler_forwards_raw_mulaw() -> None:
+    import base64
+    import json
+
+    from src.api.voice.stt import TWILIO_MULAW
+
+    mulaw = bytes(range(160))
+    messages = [
+        json.dumps({"event": "start", "start": {"streamSid": "MZ1"}}),
+        json.dumps(
+            {"event": "media", "media": {"payload": base64.b64encode(mulaw).decode()}}
+        ),
+        json.dumps({"event": "stop"}),
+    ]
+    mock_ws = AsyncMock()
+    mock_ws.__aiter__ = lambda self: self
+    mock_ws.__anext__ = AsyncMock(side_effect=[*messages, StopAsyncIteration])
+
+    context = BusinessContext(
+        business_id=uuid.uuid4(),
+        name="Test",
+        location="",
+        hours="",
+        policies="",
+    )
+
+    empty_stream = AsyncMock(
+        __aiter__=lambda s: s, __anext__=AsyncMock(side_effect=StopAsyncIteration)
+    )
+    mock_stt = AsyncMock()
+    mock_stt.get_transcripts = AsyncMock(return_value=empty_stream)
+    mock_stt.wait_for_speech = AsyncMock(side_effect=Exception("stop"))
+    mock_tts = AsyncMock()
+    mock_tts.get_audio = MagicMock(return_value=empty_stream)
+
+    with (
+        patch("src.api.voice.pipeline.DeepgramSTT", return_value=mock_stt),
+        patch("src.api.voice.pipeline.TTSWithFallback", return_value=mock_tts),
+    ):
+        handler = TwilioCallHandler(
+            twilio_ws=mock_ws,
+            business=_found(context),
+            db_session=AsyncMock(),
+        )
+        await handler.handle()
+
+    mock_stt.connect.assert_awaited_once_with(TWILIO_MULAW)
+    mock_stt.send_audio.assert_awaited_once_with(mulaw)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import numpy as np
+
+from src.api.config import settings
+from src.api.metrics import summarize
+
+T = TypeVar("T")
+
+# Offsets from the final transcript arriving, in the order a turn reaches them.
+STAGES = (
+    "classify_start",
+    "classify_end",
+    "kb_start",
+    "kb_end",
+    "first_token",
+    "first_tts_text",
+    "first_audio",
+    "first_frame",
+)
+
+current_trace: ContextVar[TurnTrace | None] = ContextVar("current_trace", default=None)
+
+
+@dataclass
+class TurnTrace:
+    channel: str
+    started_at: float = field(default_factory=time.monotonic)
+    marks: dict[str, float] = field(default_factory=dict)
+    finished: bool = False
+
+    def mark(self, stage: str) -> None:
+        if stage not in self.marks:
+            self.marks[stage] = (time.monotonic() - self.started_at) * 1000
+
+    def has(self, stage: str) -> bool:
+        return stage in self.marks
+
+    def finish(self) -> None:
+        if not self.finished:
+            self.finished = True
+            traces.record(self)
+
+
+def mark(stage: str) -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.mark(stage)
+
+
+async def traced(stage: str, awaitable: Awaitable[T]) -> T:
+    mark(f"{stage}_start")
+    try:
+        return await awaitable
+    finally:
+        mark(f"{stage}_end")
+
+
+class TraceRecorder:
+    def __init__(self, capacity: int | None = None) -> None:
+        self._lock = threading.Lock()
+        self._traces: deque[TurnTrace] = deque(
+            maxlen=capacity or settings.trace_buffer_size
+        )
+
+    def record(self, trace: TurnTrace) -> None:
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(self, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            latest = list(self._traces)[-limit:] if limit > 0 else []
+        return [{"channel": t.channel, "marks": dict(t.marks)} for t in latest]
+
+    def summary(self, target_ms: float) -> dict[str, Any]:
+        with self._lock:
+            snapshot = [dict(t.marks) for t in self._traces]
+        stages: dict[str, dict[str, float]] = {}
+        for stage in STAGES:
+            values = np.array([m[stage] for m in snapshot if stage in m])
+            if values.size:
+                stages[stage] = summarize(values)
+
+        answered = [m["first_frame"] for m in snapshot if "first_frame" in m]
+        within = sum(1 for ms in answered if ms <= target_ms)
+        return {
+            "turns": len(snapshot),
+            "target_ms": target_ms,
+            "within_target": within / len(answered) if answered else None,
+            "stages": stages,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+
+traces = TraceRecorder()
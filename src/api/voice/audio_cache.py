@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from collections.abc import Awaitable, Callable, Iterable
+from pathlib import Path
+
+from src.api.agents.orchestrator import (
+    FILLER_PHRASES,
+    greeting_for,
+    template_replies,
+)
+from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.voice.tts import OUTPUT_FORMAT, provider_voice, synthesize_clip
+
+logger = logging.getLogger(__name__)
+
+Renderer = Callable[[str, str], Awaitable[bytes]]
+
+
+def phrases_for_business(business_name: str) -> list[str]:
+    return [
+        greeting_for(business_name),
+        *FILLER_PHRASES,
+        *template_replies(business_name),
+    ]
+
+
+class RenderedAudioCache:
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        renderer: Renderer = synthesize_clip,
+    ) -> None:
+        self._root = Path(root or settings.audio_cache_dir)
+        self._renderer = renderer
+        self._maps: dict[str, mmap.mmap] = {}
+        self._renders: dict[str, asyncio.Task[None]] = {}
+
+    @property
+    def provider(self) -> str:
+        return settings.tts_provider.lower()
+
+    def key(self, text: str) -> str:
+        provider = self.provider
+        voice = provider_voice(provider)
+        identity = "\0".join((text, provider, voice, OUTPUT_FORMAT))
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._root / f"{key}.ulaw"
+
+    def _lookup(self, key: str) -> mmap.mmap | None:
+        mapped = self._maps.get(key)
+        if mapped is None:
+            mapped = self._map_file(key)
+        return mapped
+
+    def get(self, text: str) -> memoryview | None:
+        mapped = self._lookup(self.key(text))
+        if mapped is None:
+            metrics.incr("audio_cache.misses")
+            return None
+        metrics.incr("audio_cache.hits")
+        return memoryview(mapped)
+
+    def get_or_schedule(self, text: str) -> memoryview | None:
+        clip = self.get(text)
+        if clip is None:
+            self.schedule(text)
+        return clip
+
+    def schedule(self, text: str) -> asyncio.Task[None]:
+        key = self.key(text)
+        task = self._renders.get(key)
+        if task is None:
+            task = asyncio.create_task(self._render(key, text))
+            self._renders[key] = task
+            task.add_done_callback(lambda _: self._renders.pop(key, None))
+        return task
+
+    async def warm(self, texts: Iterable[str]) -> None:
+        pending = [
+            self.schedule(text)
+            for text in texts
+            if self._lookup(self.key(text)) is None
+        ]
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def warm_business(self, business_name: str) -> None:
+        await self.warm(phrases_for_business(business_name))
+
+    def _map_file(self, key: str) -> mmap.mmap | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        self._maps[key] = mapped
+        return mapped
+
+    async def _render(self, key: str, text: str) -> None:
+        try:
+            audio = await self._renderer(text, self.provider)
+        except Exception as e:
+            logger.warning("Pre-render failed for %r: %s", text, e)
+            return
+        if audio:
+            await asyncio.to_thread(self._write, key, audio)
+            metrics.incr("audio_cache.renders")
+
+    def _write(self, key: str, audio: bytes) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio)
+        os.replace(tmp, self._path(key))
+
+
+_audio_cache: RenderedAudioCache | None = None
+
+
+def get_audio_cache() -> RenderedAudioCache:
+    global _audio_cache
+    if _audio_cache is None:
+        _audio_cache = RenderedAudioCache()
+    return _audio_cache
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-import audioop
 import base64
 
+from src.api.voice.codec import decode_mulaw, encode_mulaw
+
 
 def mulaw_to_pcm16(mulaw_bytes: bytes) -> bytes:
-    return audioop.ulaw2lin(mulaw_bytes, 2)
+    return decode_mulaw(mulaw_bytes)
 
 
 def pcm16_to_mulaw(pcm_bytes: bytes) -> bytes:
-    return audioop.lin2ulaw(pcm_bytes, 2)
+    return encode_mulaw(pcm_bytes)
 
 
 def decode_twilio_media(payload: str) -> bytes:
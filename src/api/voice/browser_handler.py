@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from fastapi import WebSocketDisconnect
+
+from src.api.voice.browser_protocol import (
+    TRANSPORT_BINARY,
+    TRANSPORT_JSON,
+    negotiate_transport,
+    pack_audio_frame,
+    unpack_audio_frame,
+)
+from src.api.voice.pipeline import CallPipeline
+from src.api.voice.resampler import StreamingResampler
+from src.api.voice.stt import BROWSER_LINEAR16
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from fastapi import WebSocket
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.api.agents.orchestrator import BusinessContext
+
+logger = logging.getLogger(__name__)
+
+ECHO_SUPPRESSION_SECONDS = 0.5
+DEFAULT_SAMPLE_RATE = 48000
+CONFIG_TIMEOUT_SECONDS = 5.0
+OUTBOUND_BYTES_PER_SECOND = 8000  # 8 kHz μ-law, as TTS renders it
+
+
+class BrowserTransport:
+    channel = "browser"
+    # Relies on the client's echo cancellation (getUserMedia's default);
+    # echo suppression still covers the tail once playback has ended.
+    barge_in = True
+    echo_suppression_s = ECHO_SUPPRESSION_SECONDS
+
+    def __init__(self, websocket: WebSocket) -> None:
+        self._websocket = websocket
+        self.wire_format = TRANSPORT_JSON
+        self._sequence = 0
+        # The client plays chunks back to back as they arrive, so its
+        # playout end is estimated from the audio sent so far.
+        self._playout_end = 0.0
+        # The wire format is only known once the config exchange is over.
+        self.ready = asyncio.Event()
+
+    async def send_audio(self, audio: bytes | memoryview) -> bool:
+        if self.wire_format == TRANSPORT_BINARY:
+            await self._websocket.send_bytes(pack_audio_frame(self._sequence, audio))
+            self._sequence += 1
+        else:
+            payload = base64.b64encode(audio).decode("ascii")
+            await self._websocket.send_json(
+                {"event": "media", "media": {"payload": payload}}
+            )
+        now = time.monotonic()
+        duration = len(audio) / OUTBOUND_BYTES_PER_SECOND
+        self._playout_end = max(self._playout_end, now) + duration
+        return True
+
+    def in_flight(self) -> float:
+        return max(0.0, self._playout_end - time.monotonic())
+
+    async def clear(self) -> None:
+        self._playout_end = 0.0
+        await self._websocket.send_json({"event": "clear"})
+
+
+class BrowserCallHandler:
+    def __init__(
+        self,
+        websocket: WebSocket,
+        business: Awaitable[BusinessContext | None],
+        db_session: AsyncSession,
+    ) -> None:
+        self._websocket = websocket
+        self._business = business
+        self._transport = BrowserTransport(websocket)
+        self._pipeline = CallPipeline(self._transport, BROWSER_LINEAR16, db_session)
+
+    async def handle(self) -> None:
+        # The client's config exchange runs alongside call setup.
+        negotiation = asyncio.create_task(self._negotiate())
+        try:
+            try:
+                opened = await self._pipeline.open(self._business)
+            except Exception as e:
+                logger.error("Failed to connect voice providers: %s", e)
+                await self._websocket.close(code=1011, reason="Voice connection failed")
+                return
+            if not opened:
+                await self._websocket.close(code=1008, reason="Business not found")
+                return
+
+            client_sample_rate = await negotiation
+            resampler = StreamingResampler(
+                client_sample_rate, BROWSER_LINEAR16.sample_rate
+            )
+            while True:
+                message = await self._websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+
+                frame = message.get("bytes")
+                if frame is not None:
+                    pcm = unpack_audio_frame(frame)
+                else:
+                    data = json.loads(message["text"])
+                    event = data.get("event")
+                    if event == "stop":
+                        break
+                    if event != "media":
+                        continue
+                    pcm = base64.b64decode(data["media"]["payload"])
+
+                await self._pipeline.receive_audio(resampler.process(pcm))
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.error("Error in browser voice loop: %s", e)
+        finally:
+            negotiation.cancel()
+            await self._pipeline.close()
+
+    async def _negotiate(self) -> int:
+        try:
+            raw = await asyncio.wait_for(
+                self._websocket.receive_text(), timeout=CONFIG_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            self._transport.ready.set()
+            return DEFAULT_SAMPLE_RATE
+        data = json.loads(raw)
+        if data.get("event") != "config":
+            self._transport.ready.set()
+            return DEFAULT_SAMPLE_RATE
+        self._transport.wire_format = negotiate_transport(data)
+        await self._websocket.send_json(
+            {"event": "config_ack", "transport": self._transport.wire_format}
+        )
+        self._transport.ready.set()
+        return int(data.get("sampleRate", DEFAULT_SAMPLE_RATE))
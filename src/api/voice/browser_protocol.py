@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import struct
+
+TRANSPORT_JSON = "json"
+TRANSPORT_BINARY = "binary"
+
+FRAME_AUDIO = 0x01
+
+# kind (u8), flags (u8), sequence (u16, big-endian), followed by raw audio
+FRAME_HEADER = struct.Struct("!BBH")
+HEADER_SIZE = FRAME_HEADER.size
+
+
+def negotiate_transport(config: dict[str, object]) -> str:
+    if config.get("transport") == TRANSPORT_BINARY:
+        return TRANSPORT_BINARY
+    return TRANSPORT_JSON
+
+
+def pack_audio_frame(sequence: int, audio: bytes | memoryview) -> bytes:
+    return FRAME_HEADER.pack(FRAME_AUDIO, 0, sequence & 0xFFFF) + audio
+
+
+def unpack_audio_frame(frame: bytes) -> bytes:
+    if len(frame) < HEADER_SIZE:
+        raise ValueError(f"Binary frame too short: {len(frame)} bytes")
+    kind, _flags, _sequence = FRAME_HEADER.unpack_from(frame)
+    if kind != FRAME_AUDIO:
+        raise ValueError(f"Unknown binary frame kind: {kind}")
+    return frame[HEADER_SIZE:]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import warnings
+from types import ModuleType
+
+import numpy as np
+import numpy.typing as npt
+
+# audioop's C loops beat the tables by several times per 20 ms frame
+# (scripts/bench_codec.py), so it is used wherever it still exists; the
+# tables are the fallback for Python 3.13+, where it was removed.
+audioop: ModuleType | None
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop
+    except ImportError:
+        audioop = None
+
+MULAW_BIAS = 0x84
+MULAW_CLIP = 8159
+_SEGMENT_ENDS = np.array(
+    [0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], dtype=np.int32
+)
+
+
+def _build_decode_table() -> npt.NDArray[np.int16]:
+    inverted = ~np.arange(256, dtype=np.int32) & 0xFF
+    magnitude = ((inverted & 0x0F) << 3) + MULAW_BIAS
+    magnitude <<= (inverted & 0x70) >> 4
+    linear = np.where(inverted & 0x80, MULAW_BIAS - magnitude, magnitude - MULAW_BIAS)
+    return linear.astype(np.int16)
+
+
+def _build_encode_table() -> npt.NDArray[np.uint8]:
+    # Indexed by the uint16 bit pattern of each int16 sample, so a PCM buffer
+    # can be encoded with a single ``take`` on its ``view(np.uint16)``.
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32)
+    value = samples >> 2
+    mask = np.where(value < 0, 0x7F, 0xFF)
+    value = np.minimum(np.abs(value), MULAW_CLIP) + (MULAW_BIAS >> 2)
+    segment = np.searchsorted(_SEGMENT_ENDS, value)
+    mantissa = (value >> (np.minimum(segment, 7) + 1)) & 0x0F
+    encoded = np.where(segment >= 8, 0x7F, (segment << 4) | mantissa)
+    return (encoded ^ mask).astype(np.uint8)
+
+
+MULAW_DECODE_TABLE = _build_decode_table()
+MULAW_ENCODE_TABLE = _build_encode_table()
+
+
+def decode_mulaw_into(
+    mulaw: bytes | bytearray | memoryview, out: npt.NDArray[np.int16]
+) -> npt.NDArray[np.int16]:
+    codes = np.frombuffer(mulaw, dtype=np.uint8)
+    target = out[: codes.size]
+    np.take(MULAW_DECODE_TABLE, codes, out=target)
+    return target
+
+
+def encode_mulaw_into(
+    pcm: bytes | bytearray | memoryview, out: npt.NDArray[np.uint8]
+) -> npt.NDArray[np.uint8]:
+    indices = np.frombuffer(pcm, dtype=np.uint16)
+    target = out[: indices.size]
+    np.take(MULAW_ENCODE_TABLE, indices, out=target)
+    return target
+
+
+def decode_mulaw(mulaw: bytes | bytearray | memoryview) -> bytes:
+    if audioop is not None:
+        pcm: bytes = audioop.ulaw2lin(mulaw, 2)
+        return pcm
+    out = np.empty(len(mulaw), dtype=np.int16)
+    return decode_mulaw_into(mulaw, out).tobytes()
+
+
+def encode_mulaw(pcm: bytes | bytearray | memoryview) -> bytes:
+    if audioop is not None:
+        mulaw: bytes = audioop.lin2ulaw(pcm, 2)
+        return mulaw
+    out = np.empty(len(pcm) // 2, dtype=np.uint8)
+    return encode_mulaw_into(pcm, out).tobytes()
+
+
+# Per-stream codec. Without audioop it reuses its output buffers, so a
+# returned view is only valid until the next call.
+class MulawCodec:
+    def __init__(self, max_frame_samples: int = 8000) -> None:
+        self._pcm_out = np.empty(max_frame_samples, dtype=np.int16)
+        self._mulaw_out = np.empty(max_frame_samples, dtype=np.uint8)
+
+    def _ensure_capacity(self, samples: int) -> None:
+        if samples > self._pcm_out.size:
+            self._pcm_out = np.empty(samples, dtype=np.int16)
+            self._mulaw_out = np.empty(samples, dtype=np.uint8)
+
+    def decode(self, mulaw: bytes | bytearray | memoryview) -> memoryview:
+        if audioop is not None:
+            return memoryview(audioop.ulaw2lin(mulaw, 2))
+        self._ensure_capacity(len(mulaw))
+        return decode_mulaw_into(mulaw, self._pcm_out).data.cast("B")
+
+    def encode(self, pcm: bytes | bytearray | memoryview) -> memoryview:
+        if audioop is not None:
+            return memoryview(audioop.lin2ulaw(pcm, 2))
+        self._ensure_capacity(len(pcm) // 2)
+        return encode_mulaw_into(pcm, self._mulaw_out).data
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Coroutine, Hashable, Iterable
+from typing import Any, Generic, TypeVar
+
+from src.api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+C = TypeVar("C")
+
+
+class WarmConnectionPool(Generic[K, C]):
+    def __init__(
+        self,
+        name: str,
+        opener: Callable[[K], Awaitable[C]],
+        closer: Callable[[C], Awaitable[None]],
+        is_open: Callable[[C], bool],
+        size: int,
+        max_age: float,
+        keepalive: Callable[[K, C], Awaitable[None]] | None = None,
+        keepalive_interval: float = 8.0,
+    ) -> None:
+        self.name = name
+        self.size = size
+        self.max_age = max_age
+        self._opener = opener
+        self._closer = closer
+        self._is_open = is_open
+        self._keepalive = keepalive
+        self._keepalive_interval = keepalive_interval
+        self._idle: defaultdict[K, deque[tuple[C, float]]] = defaultdict(deque)
+        self._opening: defaultdict[K, int] = defaultdict(int)
+        self._healthy: dict[K, bool] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._keepalive_task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    def idle_count(self, key: K) -> int:
+        return len(self._idle[key])
+
+    def healthy(self, key: K) -> bool:
+        # Keys that have not been tried yet count as healthy.
+        return self._healthy.get(key, True)
+
+    def prewarm(self, keys: Iterable[K]) -> None:
+        for key in keys:
+            self._refill(key)
+
+    async def acquire(self, key: K) -> C:
+        idle = self._idle[key]
+        conn: C | None = None
+        while idle:
+            candidate, opened_at = idle.popleft()
+            if self._usable(candidate, opened_at):
+                conn = candidate
+                break
+            self._evict(candidate)
+        self._refill(key)
+
+        if conn is not None:
+            metrics.incr(f"{self.name}.pool_hits")
+            return conn
+        metrics.incr(f"{self.name}.pool_misses")
+        return await self._open(key)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        for idle in self._idle.values():
+            while idle:
+                conn, _ = idle.popleft()
+                await self._discard(conn)
+
+    def _usable(self, conn: C, opened_at: float) -> bool:
+        return self._is_open(conn) and time.monotonic() - opened_at < self.max_age
+
+    def _refill(self, key: K) -> None:
+        if self._closed:
+            return
+        missing = self.size - len(self._idle[key]) - self._opening[key]
+        for _ in range(missing):
+            self._opening[key] += 1
+            self._spawn(self._fill(key))
+        stopped = self._keepalive_task is None or self._keepalive_task.done()
+        if self._keepalive and self.size and stopped:
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _open(self, key: K) -> C:
+        start = time.monotonic()
+        try:
+            conn = await self._opener(key)
+        except Exception:
+            self._healthy[key] = False
+            raise
+        self._healthy[key] = True
+        metrics.observe(f"{self.name}.handshake_ms", (time.monotonic() - start) * 1000)
+        return conn
+
+    async def _fill(self, key: K) -> None:
+        try:
+            conn = await self._open(key)
+        except Exception as e:
+            metrics.incr(f"{self.name}.pool_open_failures")
+            logger.warning("[%s pool] Failed to open connection: %s", self.name, e)
+            return
+        finally:
+            self._opening[key] -= 1
+        if self._closed:
+            await self._discard(conn)
+            return
+        self._idle[key].append((conn, time.monotonic()))
+
+    async def _keepalive_loop(self) -> None:
+        assert self._keepalive is not None
+        while not self._closed:
+            await asyncio.sleep(self._keepalive_interval)
+            for key, idle in list(self._idle.items()):
+                for entry in list(idle):
+                    conn, opened_at = entry
+                    if self._usable(conn, opened_at):
+                        try:
+                            await self._keepalive(key, conn)
+                            continue
+                        except Exception:
+                            pass
+                    # The entry may have been handed out while we were awaiting.
+                    if entry in idle:
+                        idle.remove(entry)
+                        self._evict(conn)
+                self._refill(key)
+
+    def _evict(self, conn: C) -> None:
+        metrics.incr(f"{self.name}.pool_evictions")
+        self._spawn(self._discard(conn))
+
+    async def _discard(self, conn: C) -> None:
+        try:
+            await self._closer(conn)
+        except Exception:
+            pass
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import re
+
+from src.api.config import settings
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+_DIGIT_WORDS = frozenset(
+    "zero oh one two three four five six seven eight nine double triple".split()
+)
+_MONTHS = frozenset(
+    "january february march april may june july august september october "
+    "november december".split()
+)
+_NUMBER_CUES = frozenset("number phone cell mobile".split())
+# Word sequences a caller uses to start giving their name, as opposed to
+# asking for one ("what's your name").
+_NAME_STATEMENTS = (
+    ("name", "is"),
+    ("name's",),
+    ("surname", "is"),
+    ("spelled",),
+    ("spelling", "is"),
+    ("i", "spell", "it"),
+)
+_QUESTION_WORDS = frozenset("what what's how who which can could do does is".split())
+# Words a caller rarely ends a turn on; Deepgram's endpointing still fires on
+# the pause after them.
+_CONTINUATIONS = frozenset(
+    "and or but so because um uh the a an to my is at on for with of like".split()
+)
+
+
+def _is_number(word: str) -> bool:
+    return word.isdigit() or word in _DIGIT_WORDS
+
+
+def _gives_name(words: list[str]) -> bool:
+    if words[0] in _QUESTION_WORDS:
+        return False
+    # The cue has to be recent: "my name is Sarah Jane Smith" still holds.
+    for cue in _NAME_STATEMENTS:
+        for end in range(max(len(cue), len(words) - 3), len(words) + 1):
+            if tuple(words[end - len(cue) : end]) == cue:
+                return True
+    return False
+
+
+def _is_dictating(words: list[str]) -> bool:
+    run = 0
+    while run < len(words) and _is_number(words[-1 - run]):
+        run += 1
+    if run:
+        # "At 3", "at 10" or "3:30" is a whole answer. A long number, three
+        # or more spoken digits, or digits after "my number is" are not.
+        numbers = words[-run:]
+        if run >= 3 or any(len(word) >= 3 and word.isdigit() for word in numbers):
+            return True
+        if _NUMBER_CUES.intersection(words[-run - 4 : -run]):
+            return True
+    if words[-1] in _MONTHS:
+        return True
+    if _gives_name(words):
+        return True
+    # Spelling out letters: "J O H N".
+    return len(words) >= 2 and all(len(w) == 1 and w.isalpha() for w in words[-2:])
+
+
+def endpoint_hold_ms(text: str) -> int:
+    # How much longer to wait after Deepgram's speech_final before treating
+    # the buffered text as the caller's whole turn.
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return 0
+    if _is_dictating(words):
+        return settings.stt_dictation_hold_ms
+    if words[-1] in _CONTINUATIONS:
+        return settings.stt_continuation_hold_ms
+    return 0
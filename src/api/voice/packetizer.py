@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import time
+from typing import TYPE_CHECKING
+
+from src.api.config import settings
+from src.api.metrics import metrics
+
+if TYPE_CHECKING:
+    from websockets.asyncio.server import ServerConnection
+
+    from src.api.voice.twilio_handler import TwilioSocket
+
+TWILIO_FRAME_BYTES = 160  # 20 ms of 8 kHz μ-law
+TWILIO_FRAME_SECONDS = 0.02
+MULAW_SILENCE = 0xFF
+
+
+class FramePacketizer:
+    def __init__(self, frame_bytes: int = TWILIO_FRAME_BYTES) -> None:
+        self._frame_bytes = frame_bytes
+        self._pending = bytearray()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def push(self, audio: bytes | memoryview) -> list[bytes]:
+        self._pending += audio
+        whole = len(self._pending) - len(self._pending) % self._frame_bytes
+        if not whole:
+            return []
+        view = memoryview(self._pending)
+        frames = [
+            bytes(view[i : i + self._frame_bytes])
+            for i in range(0, whole, self._frame_bytes)
+        ]
+        view.release()
+        del self._pending[:whole]
+        return frames
+
+    def flush(self) -> bytes | None:
+        if not self._pending:
+            return None
+        padding = self._frame_bytes - len(self._pending)
+        frame = bytes(self._pending) + bytes([MULAW_SILENCE]) * padding
+        self._pending.clear()
+        return frame
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+
+class TwilioMediaSender:
+    def __init__(
+        self,
+        twilio_ws: TwilioSocket | ServerConnection,
+        max_lead_ms: int | None = None,
+    ) -> None:
+        self._ws = twilio_ws
+        lead_ms = settings.twilio_max_lead_ms if max_lead_ms is None else max_lead_ms
+        self._max_lead = lead_ms / 1000
+        self._packetizer = FramePacketizer()
+        self._lock = asyncio.Lock()
+        self._prefix: str | None = None
+        self._playout_end = 0.0
+        self._epoch = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self.frames_sent = 0
+
+    def start(self, stream_sid: str) -> None:
+        # Only the payload changes between frames, so the envelope is
+        # serialized once and the base64 text is spliced in.
+        self._prefix = (
+            '{"event": "media", "streamSid": '
+            f'{json.dumps(stream_sid)}, "media": {{"payload": "'
+        )
+
+    def in_flight(self) -> float:
+        return max(0.0, self._playout_end - time.monotonic())
+
+    async def send(self, audio: bytes | memoryview) -> None:
+        if self._prefix is None:
+            return
+        self._cancel_flush_timer()
+        epoch = self._epoch
+        async with self._lock:
+            for frame in self._packetizer.push(audio):
+                if not await self._send_frame(frame, epoch):
+                    return
+        if self._packetizer.pending:
+            # Hold the partial frame until the audio already queued at Twilio
+            # runs out, so a following chunk can still complete it seamlessly.
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                max(0.0, self.in_flight() - TWILIO_FRAME_SECONDS), self._on_flush_timer
+            )
+
+    async def flush(self) -> None:
+        self._cancel_flush_timer()
+        epoch = self._epoch
+        async with self._lock:
+            frame = self._packetizer.flush()
+            if frame is not None:
+                await self._send_frame(frame, epoch)
+
+    def clear(self) -> None:
+        metrics.observe("twilio.bargein_in_flight_ms", self.in_flight() * 1000)
+        self._epoch += 1
+        self._cancel_flush_timer()
+        self._packetizer.clear()
+        self._playout_end = 0.0
+
+    def _on_flush_timer(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self.flush())
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    async def _send_frame(self, frame: bytes, epoch: int) -> bool:
+        now = time.monotonic()
+        ahead = self._playout_end - now - self._max_lead
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+            now = time.monotonic()
+        if epoch != self._epoch or self._prefix is None:
+            return False
+        payload = base64.b64encode(frame).decode("ascii")
+        await self._ws.send(f'{self._prefix}{payload}"}}}}')
+        self._playout_end = max(self._playout_end, now) + TWILIO_FRAME_SECONDS
+        self.frames_sent += 1
+        return True
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, Protocol
+
+from src.api.agents.answer_cache import get_answer_cache
+from src.api.agents.orchestrator import (
+    DELAY_FILLER,
+    BusinessContext,
+    CallSession,
+    greeting_for,
+    pick_filler_phrase,
+    process_utterance,
+    template_reply,
+)
+from src.api.agents.speculation import SpeculativeUnderstanding
+from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.tracing import TurnTrace, current_trace, mark
+from src.api.voice.audio_cache import get_audio_cache
+from src.api.voice.stt import AudioProfile, DeepgramSTT
+from src.api.voice.text_chunker import chunk_text
+from src.api.voice.tts import TTSWithFallback, synthesize_clip
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Coroutine
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+TURN_FAILURE_REPLY = "Sorry, I had trouble with that. Could you say that again?"
+DELAY_FILLER_SECONDS = 4.0
+CACHED_CLIP_CHUNK_BYTES = 3200  # 400 ms of 8 kHz μ-law
+# A reply has finished playing once nothing is in flight and no TTS audio
+# has arrived for this long.
+PLAYBACK_SETTLE_SECONDS = 0.25
+
+
+class CallTransport(Protocol):
+    channel: str
+    # Without barge-in, transcripts that arrive while the agent is talking
+    # are treated as echo and dropped.
+    barge_in: bool
+    echo_suppression_s: float
+    # Set once audio can go out, e.g. after Twilio's "start" event.
+    ready: asyncio.Event
+
+    # Returns True once some of the audio has actually gone out to the caller.
+    async def send_audio(self, audio: bytes | memoryview) -> bool: ...
+
+    # Seconds of audio already sent that the caller has not heard yet.
+    def in_flight(self) -> float: ...
+
+    async def clear(self) -> None: ...
+
+
+class CallPipeline:
+    def __init__(
+        self,
+        transport: CallTransport,
+        profile: AudioProfile,
+        db_session: AsyncSession,
+    ) -> None:
+        self._transport = transport
+        self._profile = profile
+        self._db_session = db_session
+        self._stt = DeepgramSTT()
+        self._tts = TTSWithFallback()
+        self._call_session: CallSession | None = None
+        # Set once each provider's connect attempt has finished, whatever
+        # its outcome.
+        self._stt_ready = asyncio.Event()
+        self._tts_ready = asyncio.Event()
+        self._is_speaking = False
+        self._response_task: asyncio.Task[None] | None = None
+        self._filler_task: asyncio.Task[None] | None = None
+        # Held for the whole of a cached clip, so TTS audio cannot be
+        # interleaved with it on the transport.
+        self._clip_lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._trace: TurnTrace | None = None
+        self._opened_at = time.monotonic()
+        self._first_audio_sent = False
+        self._last_audio_at = 0.0
+        # When the caller will have heard the last audio sent so far.
+        self._playout_end_at = 0.0
+        self._speculation: SpeculativeUnderstanding | None = None
+
+    @property
+    def call_session(self) -> CallSession:
+        if self._call_session is None:
+            raise RuntimeError("Call pipeline has not been opened")
+        return self._call_session
+
+    async def open(self, business: Awaitable[BusinessContext | None]) -> bool:
+        # The business lookup and both provider handshakes run side by side.
+        # The greeting goes out as soon as it has an audio path: straight
+        # away when its clip is cached, otherwise once TTS is up, without
+        # waiting on STT. Returns False if the business does not exist.
+        stt_connect = asyncio.create_task(self._stt.connect(self._profile))
+        tts_connect = asyncio.create_task(self._tts.connect())
+        stt_connect.add_done_callback(lambda _: self._stt_ready.set())
+        tts_connect.add_done_callback(lambda _: self._tts_ready.set())
+        connects = (stt_connect, tts_connect)
+        try:
+            context = await business
+        except BaseException:
+            await self._abandon(connects)
+            raise
+        if context is None:
+            await self._abandon(connects)
+            return False
+
+        self._call_session = CallSession(business=context, session=self._db_session)
+        if settings.speculation_enabled:
+            self._speculation = SpeculativeUnderstanding(self._call_session)
+            self._stt.on_interim = self._on_interim
+        greeting = greeting_for(context.name)
+        self._call_session.conversation_history.append(
+            {"role": "agent", "content": greeting}
+        )
+        self._spawn(self._speak_phrase(greeting))
+        self._spawn(self._play_tts())
+
+        results = await asyncio.gather(*connects, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        self._spawn(self._process_transcripts())
+        if self._transport.barge_in:
+            self._spawn(self._monitor_bargein())
+        return True
+
+    async def receive_audio(self, audio: bytes) -> None:
+        # Hold caller audio that arrives during setup until STT can take it.
+        if not self._stt_ready.is_set():
+            await self._stt_ready.wait()
+        # Echo suppression covers the tail after the caller's playback has
+        # ended; during playback the client's echo cancellation has to cope,
+        # or barge-in could never be heard.
+        suppress_s = self._transport.echo_suppression_s
+        since_playout = time.monotonic() - self._playout_end_at
+        if suppress_s and 0 <= since_playout < suppress_s:
+            return
+        await self._stt.send_audio(audio)
+
+    async def close(self) -> None:
+        await self._stt.close()
+        await self._tts.close()
+        for task in self._tasks:
+            task.cancel()
+        if self._response_task:
+            self._response_task.cancel()
+        if self._filler_task:
+            self._filler_task.cancel()
+        if self._trace:
+            self._trace.finish()
+        if self._speculation:
+            self._speculation.close()
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        self._tasks.append(asyncio.create_task(coro))
+
+    async def _abandon(self, connects: tuple[asyncio.Task[None], ...]) -> None:
+        for task in connects:
+            task.cancel()
+        await asyncio.gather(*connects, return_exceptions=True)
+
+    async def _send_audio(self, audio: bytes | memoryview) -> bool:
+        await self._transport.ready.wait()
+        sent_at = time.monotonic()
+        delivered = await self._transport.send_audio(audio)
+        self._last_audio_at = time.monotonic()
+        self._playout_end_at = self._last_audio_at + self._transport.in_flight()
+        if delivered and not self._first_audio_sent:
+            # Measured to the start of the send: paced transports only
+            # return once most of the chunk has gone out.
+            self._first_audio_sent = True
+            metrics.observe(
+                f"{self._transport.channel}.time_to_first_audio_ms",
+                (sent_at - self._opened_at) * 1000,
+            )
+        return delivered
+
+    async def _speak_phrase(self, text: str, trace: TurnTrace | None = None) -> None:
+        # With a trace, the phrase is the turn's reply and is timed as one.
+        clip = get_audio_cache().get_or_schedule(text)
+        if clip is None:
+            # Only the greeting can get here before TTS has connected.
+            await self._tts_ready.wait()
+            if trace:
+                trace.mark("first_tts_text")
+            await self._tts.send_text(text)
+            await self._tts.flush()
+            return
+        await self._play_clip(clip, trace)
+
+    async def _play_clip(
+        self, clip: bytes | memoryview, trace: TurnTrace | None = None
+    ) -> None:
+        async with self._clip_lock:
+            if trace:
+                trace.mark("first_audio")
+            for i in range(0, len(clip), CACHED_CLIP_CHUNK_BYTES):
+                chunk = clip[i : i + CACHED_CLIP_CHUNK_BYTES]
+                delivered = await self._send_audio(chunk)
+                if trace and delivered and not trace.finished:
+                    trace.mark("first_frame")
+                    trace.finish()
+
+    async def _process_transcripts(self) -> None:
+        async for transcript in self._stt.get_transcripts():
+            if self._is_speaking and not self._transport.barge_in:
+                continue
+            self._begin_turn()
+            self._response_task = asyncio.create_task(self._respond(transcript))
+            # wait() rather than await, so a barge-in that cancels the turn
+            # before it starts does not end this loop.
+            await asyncio.wait({self._response_task})
+            if not self._transport.barge_in:
+                self._stt._transcript_queue.clear()
+
+    def _on_interim(self, interim: str) -> None:
+        # Without barge-in, speech over the agent is echo and never a turn.
+        if self._speculation and (self._transport.barge_in or not self._is_speaking):
+            self._speculation.observe(interim)
+
+    def _begin_turn(self) -> None:
+        if self._trace:
+            self._trace.finish()
+        started_at = self._stt.last_final_at or time.monotonic()
+        self._trace = TurnTrace(self._transport.channel, started_at=started_at)
+        current_trace.set(self._trace)
+
+    async def _respond(self, transcript: str) -> None:
+        self._is_speaking = True
+        try:
+            await self._reply(transcript)
+            await self._wait_for_playback()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._is_speaking = False
+
+    async def _reply(self, transcript: str) -> None:
+        delay_filler: asyncio.Task[None] | None = None
+        prefetched = self._speculation.take(transcript) if self._speculation else None
+        try:
+            quick_reply = template_reply(self.call_session, transcript)
+            if quick_reply is not None:
+                if prefetched:
+                    prefetched.cancel()
+                await self._speak_phrase(quick_reply, self._trace)
+                return
+
+            filler = pick_filler_phrase(transcript)
+            if filler:
+                # Played alongside the LLM call; _play_tts holds the reply
+                # back until the filler has finished.
+                self._filler_task = asyncio.create_task(self._speak_filler(filler))
+            delay_filler = asyncio.create_task(self._delay_filler())
+
+            reply = process_utterance(self.call_session, transcript, prefetched)
+            # A barge-in cancels this task; closing the chunker closes the
+            # reply generator and the LLM stream behind it.
+            async with aclosing(chunk_text(reply)) as chunks:
+                async for text_chunk in chunks:
+                    delay_filler.cancel()
+                    answer = self.call_session.cached_answer
+                    if answer is not None and answer.audio is not None:
+                        await self._play_answer(answer.audio)
+                        return
+                    mark("first_tts_text")
+                    await self._tts.send_text(text_chunk)
+            await self._tts.flush()
+            answer = self.call_session.cached_answer
+            if answer is not None and settings.answer_cache_audio:
+                provider = get_audio_cache().provider
+                get_answer_cache().schedule_audio(
+                    answer, lambda text: synthesize_clip(text, provider)
+                )
+        except Exception as e:
+            logger.error("Error generating response: %s", e)
+            try:
+                await self._tts.send_text(TURN_FAILURE_REPLY)
+                await self._tts.flush()
+            except Exception:
+                pass
+        finally:
+            if delay_filler:
+                delay_filler.cancel()
+
+    async def _wait_for_playback(self) -> None:
+        # The reply is still being heard after it has all been handed over:
+        # TTS is rendering its tail and the transport holds audio ahead of
+        # playout. Until both drain, speech over it is a barge-in. If TTS
+        # goes quiet with text outstanding, give up after the stall timeout.
+        handed_over_at = time.monotonic()
+        stall_s = settings.tts_stall_timeout_ms / 1000
+        while True:
+            in_flight = self._transport.in_flight()
+            if in_flight > 0:
+                await asyncio.sleep(in_flight)
+                continue
+            now = time.monotonic()
+            settled = now - self._last_audio_at >= PLAYBACK_SETTLE_SECONDS
+            stalled = now - max(handed_over_at, self._last_audio_at) >= stall_s
+            if (settled and not self._tts.pending) or stalled:
+                return
+            await asyncio.sleep(PLAYBACK_SETTLE_SECONDS)
+
+    async def _play_answer(self, clip: bytes) -> None:
+        # A reused answer's clip follows the filler, as a streamed reply
+        # would in _play_tts.
+        if self._filler_task and not self._filler_task.done():
+            await asyncio.wait({self._filler_task})
+        await self._play_clip(clip, self._trace)
+
+    async def _speak_filler(self, text: str) -> None:
+        try:
+            await self._speak_phrase(text)
+        except Exception as e:
+            logger.warning("Filler playback failed: %s", e)
+
+    async def _delay_filler(self) -> None:
+        await asyncio.sleep(DELAY_FILLER_SECONDS)
+        await self._speak_phrase(DELAY_FILLER)
+
+    async def _play_tts(self) -> None:
+        await self._tts_ready.wait()
+        async for audio_chunk in self._tts.get_audio():
+            trace = self._trace
+            if trace and trace.has("first_tts_text"):
+                trace.mark("first_audio")
+            if self._filler_task and not self._filler_task.done():
+                await asyncio.wait({self._filler_task})
+            try:
+                async with self._clip_lock:
+                    delivered = await self._send_audio(audio_chunk)
+            except Exception as e:
+                logger.warning("Stopping %s playback: %s", self._transport.channel, e)
+                return
+            if trace and delivered and trace.has("first_audio"):
+                trace.mark("first_frame")
+                trace.finish()
+
+    async def _monitor_bargein(self) -> None:
+        while True:
+            await self._stt.wait_for_speech()
+            if self._is_speaking:
+                await self._handle_bargein()
+            self._stt.clear_speech_flag()
+
+    async def _handle_bargein(self) -> None:
+        if self._response_task and not self._response_task.done():
+            self._response_task.cancel()
+        if self._filler_task:
+            self._filler_task.cancel()
+        await self._tts.interrupt()
+        await self._transport.clear()
+        self._is_speaking = False
+        # The caller is talking over a reply that has just been cut off, so
+        # there is no tail to suppress.
+        self._playout_end_at = 0.0
+        started_at = self._stt.speech_started_at
+        if started_at is not None:
+            # Up to the clear going out; the client stops playback a network
+            # hop later, which the server does not see.
+            metrics.observe(
+                f"{self._transport.channel}.bargein_time_to_clear_ms",
+                (time.monotonic() - started_at) * 1000,
+            )
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
+
+COMMON_RATES = ((48000, 16000), (44100, 16000), (8000, 16000))
+
+_ZERO_CROSSINGS = 8
+_KAISER_BETA = 8.0
+_ROLLOFF = 0.92
+
+
+class FilterBank:
+    def __init__(self, in_rate: int, out_rate: int) -> None:
+        g = math.gcd(in_rate, out_rate)
+        self.up = out_rate // g
+        self.down = in_rate // g
+        half_width = math.ceil(_ZERO_CROSSINGS * max(1.0, self.down / self.up))
+        self.taps_per_phase = 2 * half_width
+
+        num_taps = self.taps_per_phase * self.up
+        cutoff = _ROLLOFF * 0.5 / max(self.up, self.down)
+        n = np.arange(num_taps, dtype=np.float64) - (num_taps - 1) / 2
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * n)
+        prototype *= np.kaiser(num_taps, _KAISER_BETA)
+        prototype *= self.up / prototype.sum()
+
+        # phases[p, c] weights input sample k - (taps - 1) + c for output phase p,
+        # so a contiguous window of the input lines up with each row.
+        phases = prototype.reshape(self.taps_per_phase, self.up).T[:, ::-1]
+        self.phases: npt.NDArray[np.float32] = np.ascontiguousarray(phases, np.float32)
+
+        # Consecutive outputs step through phases in a fixed cycle; keeping the
+        # cycle unrolled lets a block take its coefficients as a slice.
+        order = (np.arange(self.up) * self.down) % self.up
+        self._cycle_start = np.empty(self.up, dtype=np.intp)
+        self._cycle_start[order] = np.arange(self.up)
+        self._order = order
+        self._unrolled = self.phases[order]
+
+    def coefficients(self, phase: int, count: int) -> npt.NDArray[np.float32]:
+        start = int(self._cycle_start[phase])
+        if start + count > len(self._unrolled):
+            self._unrolled = self.phases[np.resize(self._order, start + 2 * count)]
+        return self._unrolled[start : start + count]
+
+
+_FILTER_BANKS: dict[tuple[int, int], FilterBank] = {
+    rates: FilterBank(*rates) for rates in COMMON_RATES
+}
+
+
+def get_filter_bank(in_rate: int, out_rate: int) -> FilterBank:
+    key = (in_rate, out_rate)
+    bank = _FILTER_BANKS.get(key)
+    if bank is None:
+        bank = _FILTER_BANKS[key] = FilterBank(in_rate, out_rate)
+    return bank
+
+
+class StreamingResampler:
+    def __init__(
+        self, in_rate: int, out_rate: int, max_frame_samples: int = 2048
+    ) -> None:
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError(f"Invalid sample rates: {in_rate} -> {out_rate}")
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self._bank = get_filter_bank(in_rate, out_rate)
+        self._history_len = self._bank.taps_per_phase - 1
+        self._plans: dict[tuple[int, int], tuple[npt.NDArray[np.intp], int]] = {}
+        self._block: npt.NDArray[np.float32] = np.zeros(
+            self._history_len, dtype=np.float32
+        )
+        self._allocate(max_frame_samples)
+        # Position of the next output sample on the upsampled time axis,
+        # relative to the first sample of the next input block.
+        self._position = 0
+
+    def _allocate(self, frame_samples: int) -> None:
+        # Carried-over history sits at the front of the block, new samples after.
+        block = np.zeros(self._history_len + frame_samples, dtype=np.float32)
+        block[: self._history_len] = self._block[: self._history_len]
+        self._block = block
+        self._frame_capacity = frame_samples
+        self._windows = sliding_window_view(block, self._bank.taps_per_phase)
+
+    def _plan(self, start: int, end: int) -> tuple[npt.NDArray[np.intp], int]:
+        # Frames arrive at a fixed size, so the same few plans repeat per call.
+        key = (start, end)
+        plan = self._plans.get(key)
+        if plan is None:
+            positions = np.arange(start, end, self._bank.down)
+            next_position = int(positions[-1]) + self._bank.down - end
+            plan = self._plans[key] = (positions // self._bank.up, next_position)
+        return plan
+
+    def reset(self) -> None:
+        self._block.fill(0)
+        self._position = 0
+
+    def process(self, pcm_bytes: bytes) -> bytes:
+        if self.in_rate == self.out_rate:
+            return pcm_bytes
+
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+        if samples.size == 0:
+            return b""
+
+        if samples.size > self._frame_capacity:
+            self._allocate(samples.size)
+
+        bank = self._bank
+        history = self._history_len
+        block = self._block
+        block[history : history + samples.size] = samples
+        end = samples.size * bank.up
+
+        if self._position >= end:
+            out = np.empty(0, dtype=np.float32)
+            self._position -= end
+        else:
+            rows, next_position = self._plan(self._position, end)
+            windows = self._windows[rows]
+            if bank.up == 1:
+                out = windows @ bank.phases[0]
+            else:
+                coeffs = bank.coefficients(self._position % bank.up, rows.size)
+                out = np.einsum("ij,ij->i", windows, coeffs)
+            self._position = next_position
+
+        block[:history] = block[samples.size : samples.size + history]
+
+        np.clip(out, -32768, 32767, out=out)
+        return np.rint(out).astype(np.int16).tobytes()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any, TypeVar, cast
+
+T = TypeVar("T")
+
+_CLOSED: Any = object()
+
+
+class ClosableQueue(asyncio.Queue[T]):
+    # Consumers of stream() sleep until an item or the close marker arrives,
+    # instead of waking on a timeout to re-check a running flag.
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = False
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.put_nowait(cast(T, _CLOSED))
+
+    def clear(self) -> None:
+        while not self.empty():
+            self.get_nowait()
+        if self.closed:
+            self.put_nowait(cast(T, _CLOSED))
+
+    def drain(self) -> list[T]:
+        items: list[T] = []
+        while not self.empty():
+            item = self.get_nowait()
+            if item is _CLOSED:
+                self.put_nowait(item)
+                break
+            items.append(item)
+        return items
+
+    async def stream(self) -> AsyncGenerator[T, None]:
+        while True:
+            item = await self.get()
+            if item is _CLOSED:
+                # Leave the marker in place so any other consumer also stops.
+                self.put_nowait(item)
+                return
+            yield item
@@ -3,45 +3,171 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from collections.abc import AsyncGenerator
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass
+from typing import Any
 
 import websockets
+from websockets.asyncio.client import ClientConnection
+from websockets.protocol import State
 
 from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.voice.codec import MulawCodec
+from src.api.voice.connection_pool import WarmConnectionPool
+from src.api.voice.endpointing import endpoint_hold_ms
+from src.api.voice.streams import ClosableQueue
+from src.api.voice.vad import VADConfig, VADEvent, VoiceActivityDetector
 
 logger = logging.getLogger(__name__)
 
-DEEPGRAM_WS_URL = "wss://api.deepgram.com/v1/listen"
+DEEPGRAM_WS_URL = f"{settings.deepgram_ws_url}/v1/listen"
+
+_BYTES_PER_SAMPLE = {"linear16": 2, "mulaw": 1, "alaw": 1}
+# Provider SpeechStarted events later than this are not matched to a local one.
+_VAD_LEAD_WINDOW = 2.0
+_KEEPALIVE_MESSAGE = json.dumps({"type": "KeepAlive"})
+
+
+@dataclass(frozen=True)
+class AudioProfile:
+    encoding: str
+    sample_rate: int
+    channels: int = 1
+
+    @property
+    def bytes_per_second(self) -> int:
+        return _BYTES_PER_SAMPLE[self.encoding] * self.sample_rate * self.channels
+
+    def query_params(self) -> str:
+        return (
+            f"encoding={self.encoding}&sample_rate={self.sample_rate}"
+            f"&channels={self.channels}"
+        )
+
+
+TWILIO_MULAW = AudioProfile(encoding="mulaw", sample_rate=8000)
+BROWSER_LINEAR16 = AudioProfile(encoding="linear16", sample_rate=16000)
+
+
+async def _open_socket(profile: AudioProfile) -> ClientConnection:
+    params = (
+        f"?{profile.query_params()}"
+        "&model=nova-2&punctuate=true&interim_results=true"
+        f"&endpointing={settings.stt_endpointing_ms}"
+        f"&utterance_end_ms={settings.stt_utterance_end_ms}&vad_events=true"
+    )
+    headers = {"Authorization": f"Token {settings.deepgram_api_key}"}
+    full_url = f"{DEEPGRAM_WS_URL}{params}"
+    logger.info("[Deepgram] Connecting to: %s", full_url)
+    return await websockets.connect(full_url, additional_headers=headers)
+
+
+async def _close_socket(ws: ClientConnection) -> None:
+    await ws.close()
+
+
+async def _send_keepalive(ws: ClientConnection) -> None:
+    await ws.send(_KEEPALIVE_MESSAGE)
+
+
+async def _keepalive_idle(profile: AudioProfile, ws: ClientConnection) -> None:
+    await _send_keepalive(ws)
+
+
+def _socket_is_open(ws: ClientConnection) -> bool:
+    return ws.state is State.OPEN
+
+
+STTPool = WarmConnectionPool[AudioProfile, ClientConnection]
+
+_stt_pool: STTPool | None = None
+
+
+def get_stt_pool() -> STTPool:
+    global _stt_pool
+    if _stt_pool is None:
+        _stt_pool = WarmConnectionPool(
+            "stt",
+            opener=_open_socket,
+            closer=_close_socket,
+            is_open=_socket_is_open,
+            size=settings.stt_pool_size,
+            max_age=settings.stt_pool_max_age_s,
+            keepalive=_keepalive_idle,
+            keepalive_interval=DeepgramSTT._KEEPALIVE_INTERVAL,
+        )
+    return _stt_pool
 
 
 class DeepgramSTT:
     _KEEPALIVE_INTERVAL = 8
 
-    def __init__(self) -> None:
-        self._ws: websockets.WebSocketClientProtocol | None = None
-        self._transcript_queue: asyncio.Queue[str] = asyncio.Queue()
+    def __init__(
+        self,
+        batch_ms: int | None = None,
+        batch_max_delay_ms: int | None = None,
+        vad_config: VADConfig | None = None,
+    ) -> None:
+        self._ws: ClientConnection | None = None
+        self._transcript_queue: ClosableQueue[str] = ClosableQueue()
+        # Final segments of the turn in progress, emitted as one transcript.
+        self._utterance_buffer: list[str] = []
+        self._endpoint_handle: asyncio.TimerHandle | None = None
         self._speech_started: asyncio.Event = asyncio.Event()
         self._running = False
+        self._profile = BROWSER_LINEAR16
+        self._batch_ms = settings.stt_batch_ms if batch_ms is None else batch_ms
+        self._batch_max_delay = (
+            settings.stt_batch_max_delay_ms
+            if batch_max_delay_ms is None
+            else batch_max_delay_ms
+        ) / 1000
         self._audio_buffer = bytearray()
-        self._sample_rate = 48000
-        self._buffer_duration = 0.25  # seconds
+        self._buffered = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self._bytes_sent = 0
+        self._sends = 0
         self._keepalive_task: asyncio.Task[None] | None = None
+        if vad_config is None and settings.vad_enabled:
+            vad_config = VADConfig.from_settings()
+        self._vad_config = vad_config
+        self._vad: VoiceActivityDetector | None = None
+        self._vad_codec: MulawCodec | None = None
+        self._preroll: deque[bytes] = deque()
+        self._preroll_bytes = 0
+        self._preroll_limit = 0
+        self._local_speech_at: float | None = None
+        self.last_final_at: float | None = None
+        self.speech_started_at: float | None = None
+        self.on_interim: Callable[[str], None] | None = None
 
-    async def connect(self, sample_rate: int = 48000) -> None:
-        params = (
-            f"?encoding=linear16&sample_rate={sample_rate}&channels=1"
-            "&model=nova-2&punctuate=true&interim_results=true"
-            "&endpointing=200&vad_events=true"
-        )
-        headers = {"Authorization": f"Token {settings.deepgram_api_key}"}
-        full_url = f"{DEEPGRAM_WS_URL}{params}"
-        logger.info("[Deepgram] Connecting to: %s", full_url)
-        self._ws = await websockets.connect(
-            full_url,
-            additional_headers=headers,
+    @property
+    def profile(self) -> AudioProfile:
+        return self._profile
+
+    @property
+    def bytes_sent(self) -> int:
+        return self._bytes_sent
+
+    async def connect(self, profile: AudioProfile = BROWSER_LINEAR16) -> None:
+        self._ws = await get_stt_pool().acquire(profile)
+        self._profile = profile
+        self._audio_buffer = bytearray(
+            profile.bytes_per_second * self._batch_ms // 1000
         )
-        self._sample_rate = sample_rate
-        self._audio_buffer = bytearray()
+        self._buffered = 0
+        self._bytes_sent = 0
+        self._sends = 0
+        if self._vad_config is not None:
+            self._vad = VoiceActivityDetector(profile.sample_rate, self._vad_config)
+            self._vad_codec = MulawCodec() if profile.encoding == "mulaw" else None
+            self._preroll_limit = (
+                profile.bytes_per_second * self._vad_config.preroll_ms // 1000
+            )
         self._running = True
         asyncio.create_task(self._receive_loop())
         self._keepalive_task = asyncio.create_task(self._keepalive_loop())
@@ -51,8 +177,7 @@ class DeepgramSTT:
             try:
                 await asyncio.sleep(self._KEEPALIVE_INTERVAL)
                 if self._ws and self._running:
-                    msg = {"type": "KeepAlive"}
-                    await self._ws.send(json.dumps(msg))
+                    await _send_keepalive(self._ws)
             except Exception:
                 break
 
@@ -61,33 +186,84 @@ class DeepgramSTT:
             return
         try:
             async for message in self._ws:
-                data = json.loads(message)
-                msg_type = data.get("type", "unknown")
-                print(f"[Deepgram] type={msg_type}")
-
-                if msg_type == "SpeechStarted":
-                    self._speech_started.set()
-                    continue
-
-                if msg_type == "Results":
-                    is_final = data.get("is_final", False)
-                    channel = data.get("channel", {})
-                    alternatives = channel.get("alternatives", [])
-                    transcript = (
-                        alternatives[0].get("transcript", "") if alternatives else ""
-                    )
-                    print(f"[Deepgram] is_final={is_final} transcript='{transcript}'")
-                    if transcript.strip() and is_final:
-                        await self._transcript_queue.put(transcript.strip())
-
-                if msg_type == "Error":
-                    print(f"[Deepgram] ERROR: {data}")
+                self._handle_message(json.loads(message))
         except websockets.exceptions.ConnectionClosed as e:
             print(f"[Deepgram] connection closed: {e}")
         except Exception as e:
             print(f"[Deepgram] receive error: {e}")
         finally:
             self._running = False
+            self._flush_utterance_buffer()
+            self._transcript_queue.close()
+
+    def _handle_message(self, data: dict[str, Any]) -> None:
+        msg_type = data.get("type", "unknown")
+        print(f"[Deepgram] type={msg_type}")
+
+        if msg_type == "SpeechStarted":
+            if self._local_speech_at is not None:
+                lead = time.monotonic() - self._local_speech_at
+                if lead < _VAD_LEAD_WINDOW:
+                    metrics.observe("vad.lead_ms", lead * 1000)
+                self._local_speech_at = None
+            self._on_speech_started()
+        elif msg_type == "Results":
+            is_final = data.get("is_final", False)
+            alternatives = data.get("channel", {}).get("alternatives", [])
+            transcript = alternatives[0].get("transcript", "") if alternatives else ""
+            print(f"[Deepgram] is_final={is_final} transcript='{transcript}'")
+            transcript = transcript.strip()
+            if is_final:
+                if transcript:
+                    self.last_final_at = time.monotonic()
+                    self._utterance_buffer.append(transcript)
+                self._on_final(speech_final=data.get("speech_final", False))
+            elif transcript:
+                # Still talking: whatever end of turn was pending is off.
+                self._cancel_endpoint()
+                if self.on_interim:
+                    self.on_interim(" ".join([*self._utterance_buffer, transcript]))
+        elif msg_type == "UtteranceEnd":
+            self._flush_utterance_buffer()
+        elif msg_type == "Error":
+            print(f"[Deepgram] ERROR: {data}")
+
+    def _on_final(self, speech_final: bool) -> None:
+        if not self._utterance_buffer:
+            return
+        # A final segment without speech_final is mid-sentence; the backstop
+        # covers UtteranceEnd never arriving because VAD gated the silence.
+        hold_ms = settings.stt_utterance_end_ms
+        if speech_final:
+            hold_ms = endpoint_hold_ms(" ".join(self._utterance_buffer))
+            if not hold_ms:
+                self._flush_utterance_buffer()
+                return
+            metrics.observe("stt.endpoint_hold_ms", hold_ms)
+        self._cancel_endpoint()
+        self._endpoint_handle = asyncio.get_running_loop().call_later(
+            hold_ms / 1000, self._flush_utterance_buffer
+        )
+
+    def _cancel_endpoint(self) -> None:
+        if self._endpoint_handle is not None:
+            self._endpoint_handle.cancel()
+            self._endpoint_handle = None
+
+    def _flush_utterance_buffer(self) -> None:
+        self._cancel_endpoint()
+        if not self._utterance_buffer:
+            return
+        metrics.observe("stt.segments_per_turn", len(self._utterance_buffer))
+        self._transcript_queue.put_nowait(" ".join(self._utterance_buffer))
+        self._utterance_buffer = []
+
+    def _on_speech_started(self) -> None:
+        # Keep the earliest start while the event is pending, so a provider
+        # SpeechStarted after the local VAD does not move it later.
+        if not self._speech_started.is_set():
+            self.speech_started_at = time.monotonic()
+        self._speech_started.set()
 
     async def wait_for_speech(self) -> None:
         self._speech_started.clear()
@@ -96,22 +272,102 @@ class DeepgramSTT:
     def clear_speech_flag(self) -> None:
         self._speech_started.clear()
 
-    async def send_audio(self, pcm_bytes: bytes) -> None:
+    async def send_audio(self, audio: bytes) -> None:
+        if not (self._ws and self._running):
+            return
+        if self._vad is None:
+            await self._enqueue(audio)
+            return
+
+        pcm = self._vad_codec.decode(audio) if self._vad_codec else audio
+        event = self._vad.process(pcm)
+        if event is VADEvent.SPEECH_START:
+            self._local_speech_at = time.monotonic()
+            self._on_speech_started()
+            metrics.incr("vad.speech_starts")
+            while self._preroll:
+                await self._enqueue(self._preroll.popleft())
+            self._preroll_bytes = 0
+        elif event is None and not self._vad.in_speech:
+            self._hold_preroll(audio)
+            return
+
+        await self._enqueue(audio)
+        if event is VADEvent.SPEECH_END:
+            await self.flush_audio()
+
+    def _hold_preroll(self, audio: bytes) -> None:
+        # Sustained silence is not forwarded; the keepalive loop holds the
+        # socket open and the most recent audio is replayed on speech start.
+        self._preroll.append(audio)
+        self._preroll_bytes += len(audio)
+        while self._preroll_bytes > self._preroll_limit and self._preroll:
+            dropped = self._preroll.popleft()
+            self._preroll_bytes -= len(dropped)
+            metrics.incr("stt.vad_gated_bytes", len(dropped))
+
+    async def _enqueue(self, audio: bytes) -> None:
+        capacity = len(self._audio_buffer)
+        if capacity == 0:
+            await self._send(audio)
+            return
+
+        view = memoryview(audio)
+        while view:
+            take = min(capacity - self._buffered, len(view))
+            self._audio_buffer[self._buffered : self._buffered + take] = view[:take]
+            self._buffered += take
+            view = view[take:]
+            if self._buffered == capacity:
+                await self.flush_audio()
+
+        if self._buffered and self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._batch_max_delay, self._on_flush_timer
+            )
+
+    def _on_flush_timer(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self.flush_audio())
+
+    async def flush_audio(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._buffered:
+            return
+        chunk = bytes(memoryview(self._audio_buffer)[: self._buffered])
+        self._buffered = 0
+        await self._send(chunk)
+
+    async def _send(self, audio: bytes) -> None:
         if self._ws and self._running:
-            await self._ws.send(pcm_bytes)
+            await self._ws.send(audio)
+            self._bytes_sent += len(audio)
+            self._sends += 1
 
     async def get_transcripts(self) -> AsyncGenerator[str, None]:
-        while self._running or not self._transcript_queue.empty():
-            try:
-                transcript = await asyncio.wait_for(
-                    self._transcript_queue.get(), timeout=0.1
-                )
-                yield transcript
-            except asyncio.TimeoutError:
-                continue
+        async for transcript in self._transcript_queue.stream():
+            # Turns that queued up while a response was being generated are
+            # answered together rather than one after another.
+            queued = self._transcript_queue.drain()
+            if queued:
+                metrics.incr("stt.merged_turns", len(queued))
+            yield " ".join([transcript, *queued])
 
     async def close(self) -> None:
+        if self._ws:
+            try:
+                await self.flush_audio()
+            except Exception:
+                pass
+            metrics.observe(
+                f"stt.bytes_per_call.{self._profile.encoding}", self._bytes_sent
+            )
+            metrics.observe("stt.sends_per_call", self._sends)
         self._running = False
+        self._cancel_endpoint()
+        self._transcript_queue.close()
         if self._keepalive_task:
             self._keepalive_task.cancel()
         if self._ws:
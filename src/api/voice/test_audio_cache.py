@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.api.agents.orchestrator import FILLER_PHRASES, greeting_for, template_replies
+from src.api.voice.audio_cache import RenderedAudioCache, phrases_for_business
+
+CLIP = b"\x7f\xff" * 400
+
+
+def _cache(tmp_path: Path, renderer: AsyncMock | None = None) -> RenderedAudioCache:
+    return RenderedAudioCache(tmp_path, renderer or AsyncMock(return_value=CLIP))
+
+
+def test_phrases_cover_greeting_fillers_and_templates() -> None:
+    phrases = phrases_for_business("Acme Dental")
+
+    assert phrases[0] == greeting_for("Acme Dental")
+    assert phrases[1 : len(FILLER_PHRASES) + 1] == list(FILLER_PHRASES)
+    assert phrases[len(FILLER_PHRASES) + 1 :] == template_replies("Acme Dental")
+
+
+def test_key_depends_on_voice(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+
+    with patch("src.api.voice.audio_cache.settings") as mock_settings:
+        mock_settings.tts_provider = "elevenlabs"
+        elevenlabs_key = cache.key("One moment.")
+        mock_settings.tts_provider = "deepgram"
+        deepgram_key = cache.key("One moment.")
+
+    assert elevenlabs_key != deepgram_key
+    assert cache.key("One moment.") == cache.key("One moment.")
+    assert cache.key("One moment.") != cache.key("Let me look into that.")
+
+
+@pytest.mark.asyncio
+async def test_miss_then_hit_after_render(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+
+    assert cache.get_or_schedule("One moment.") is None
+    await asyncio.gather(*cache._renders.values())
+
+    clip = cache.get("One moment.")
+    assert isinstance(clip, memoryview)
+    assert clip.tobytes() == CLIP
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+@pytest.mark.asyncio
+async def test_schedule_is_single_flight(tmp_path: Path) -> None:
+    renderer = AsyncMock(return_value=CLIP)
+    cache = _cache(tmp_path, renderer)
+
+    first = cache.schedule("One moment.")
+    second = cache.schedule("One moment.")
+    await first
+
+    assert first is second
+    renderer.assert_awaited_once()
+    assert cache._renders == {}
+
+
+@pytest.mark.asyncio
+async def test_warm_skips_cached_clips(tmp_path: Path) -> None:
+    renderer = AsyncMock(return_value=CLIP)
+    cache = _cache(tmp_path, renderer)
+
+    await cache.warm_business("Acme Dental")
+    await cache.warm_business("Acme Dental")
+
+    assert renderer.await_count == len(phrases_for_business("Acme Dental"))
+    assert all(cache.get(p) is not None for p in phrases_for_business("Acme Dental"))
+
+
+@pytest.mark.asyncio
+async def test_failed_render_leaves_cache_empty(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, AsyncMock(side_effect=RuntimeError("not configured")))
+
+    await cache.warm(["One moment."])
+
+    assert cache.get("One moment.") is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+
+from src.api.voice.browser_protocol import (
+    HEADER_SIZE,
+    TRANSPORT_BINARY,
+    TRANSPORT_JSON,
+    negotiate_transport,
+    pack_audio_frame,
+    unpack_audio_frame,
+)
+
+
+class TestNegotiateTransport:
+    def test_binary_when_requested(self) -> None:
+        config = {"event": "config", "sampleRate": 48000, "transport": "binary"}
+        assert negotiate_transport(config) == TRANSPORT_BINARY
+
+    @pytest.mark.parametrize("transport", [None, "json", "protobuf"])
+    def test_json_otherwise(self, transport: str | None) -> None:
+        config = {"event": "config", "sampleRate": 48000}
+        if transport is not None:
+            config["transport"] = transport
+        assert negotiate_transport(config) == TRANSPORT_JSON
+
+
+class TestAudioFrames:
+    def test_round_trip(self) -> None:
+        audio = bytes(range(256)) * 4
+
+        frame = pack_audio_frame(7, audio)
+
+        assert len(frame) == HEADER_SIZE + len(audio)
+        assert unpack_audio_frame(frame) == audio
+
+    def test_sequence_wraps(self) -> None:
+        frame = pack_audio_frame(65537, b"\x00")
+        assert frame[2:4] == b"\x00\x01"
+
+    def test_rejects_short_frame(self) -> None:
+        with pytest.raises(ValueError):
+            unpack_audio_frame(b"\x01\x00")
+
+    def test_rejects_unknown_kind(self) -> None:
+        with pytest.raises(ValueError):
+            unpack_audio_frame(b"\x09\x00\x00\x00audio")
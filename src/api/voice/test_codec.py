@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import warnings
+from types import ModuleType
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.api.voice.audio_utils import (
+    decode_twilio_media,
+    encode_for_twilio,
+    mulaw_to_pcm16,
+    pcm16_to_mulaw,
+)
+from src.api.voice.codec import (
+    MULAW_DECODE_TABLE,
+    MulawCodec,
+    decode_mulaw,
+    decode_mulaw_into,
+    encode_mulaw,
+    encode_mulaw_into,
+)
+
+ALL_MULAW = bytes(range(256))
+ALL_PCM = np.arange(-32768, 32768, dtype=np.int16).tobytes()
+
+audioop: ModuleType | None
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop
+    except ImportError:  # removed in Python 3.13
+        audioop = None
+
+
+@pytest.mark.skipif(audioop is None, reason="audioop not available")
+class TestTablesMatchAudioop:
+    def test_decode_all_codes(self) -> None:
+        assert audioop is not None
+        out = np.empty(256, dtype=np.int16)
+        expected = audioop.ulaw2lin(ALL_MULAW, 2)
+        assert decode_mulaw_into(ALL_MULAW, out).tobytes() == expected
+
+    def test_encode_all_samples(self) -> None:
+        assert audioop is not None
+        out = np.empty(65536, dtype=np.uint8)
+        expected = audioop.lin2ulaw(ALL_PCM, 2)
+        assert encode_mulaw_into(ALL_PCM, out).tobytes() == expected
+
+    def test_table_fallback_matches_audioop_path(self) -> None:
+        expected_pcm, expected_mulaw = decode_mulaw(ALL_MULAW), encode_mulaw(ALL_PCM)
+        with patch("src.api.voice.codec.audioop", None):
+            assert decode_mulaw(ALL_MULAW) == expected_pcm
+            assert encode_mulaw(ALL_PCM) == expected_mulaw
+            codec = MulawCodec(max_frame_samples=16)
+            assert bytes(codec.decode(ALL_MULAW)) == expected_pcm
+
+
+class TestCodec:
+    def test_round_trip_is_stable(self) -> None:
+        pcm = mulaw_to_pcm16(ALL_MULAW)
+        assert mulaw_to_pcm16(pcm16_to_mulaw(pcm)) == pcm
+
+    def test_decode_writes_into_caller_buffer(self) -> None:
+        out = np.zeros(512, dtype=np.int16)
+        result = decode_mulaw_into(ALL_MULAW, out)
+
+        assert result.base is out
+        assert result.size == 256
+        assert np.array_equal(out[:256], MULAW_DECODE_TABLE)
+
+    def test_encode_writes_into_caller_buffer(self) -> None:
+        out = np.zeros(160, dtype=np.uint8)
+        pcm = np.full(160, 1000, dtype=np.int16).tobytes()
+        result = encode_mulaw_into(pcm, out)
+
+        assert result.base is out
+        assert result.tobytes() == pcm16_to_mulaw(pcm)
+
+    def test_frame_codec_reuses_buffers(self) -> None:
+        codec = MulawCodec(max_frame_samples=160)
+        frame = ALL_MULAW[:160]
+
+        first = codec.decode(frame)
+        assert bytes(first) == mulaw_to_pcm16(frame)
+        assert bytes(codec.encode(first)) == pcm16_to_mulaw(bytes(first))
+
+    def test_frame_codec_grows_for_oversized_frames(self) -> None:
+        codec = MulawCodec(max_frame_samples=16)
+
+        assert bytes(codec.decode(ALL_MULAW)) == mulaw_to_pcm16(ALL_MULAW)
+
+    def test_twilio_payload_round_trip(self) -> None:
+        pcm = mulaw_to_pcm16(ALL_MULAW)
+        assert decode_twilio_media(encode_for_twilio(pcm)) == pcm
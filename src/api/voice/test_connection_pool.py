@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.api.metrics import metrics
+from src.api.voice.connection_pool import WarmConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, key: str, serial: int) -> None:
+        self.key = key
+        self.serial = serial
+        self.open = True
+        self.keepalives = 0
+
+
+class FakeOpener:
+    def __init__(self, fail: bool = False) -> None:
+        self.opened: list[FakeConnection] = []
+        self.fail = fail
+
+    async def __call__(self, key: str) -> FakeConnection:
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ConnectionError("handshake failed")
+        conn = FakeConnection(key, len(self.opened))
+        self.opened.append(conn)
+        return conn
+
+
+async def _close(conn: FakeConnection) -> None:
+    conn.open = False
+
+
+async def _keepalive(key: str, conn: FakeConnection) -> None:
+    if not conn.open:
+        raise ConnectionError("closed")
+    conn.keepalives += 1
+
+
+def _pool(
+    opener: FakeOpener, size: int = 2, max_age: float = 60.0
+) -> WarmConnectionPool[str, FakeConnection]:
+    return WarmConnectionPool(
+        "test",
+        opener=opener,
+        closer=_close,
+        is_open=lambda conn: conn.open,
+        size=size,
+        max_age=max_age,
+        keepalive=_keepalive,
+        keepalive_interval=0.01,
+    )
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_prewarm_fills_each_key() -> None:
+    opener = FakeOpener()
+    pool = _pool(opener)
+
+    pool.prewarm(["mulaw", "linear16"])
+    await _settle()
+
+    assert pool.idle_count("mulaw") == 2
+    assert pool.idle_count("linear16") == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_hit_hands_out_warm_connection_and_refills() -> None:
+    opener = FakeOpener()
+    pool = _pool(opener)
+    pool.prewarm(["mulaw"])
+    await _settle()
+
+    conn = await pool.acquire("mulaw")
+    await _settle()
+
+    assert conn.serial == 0
+    assert pool.idle_count("mulaw") == 2
+    assert len(opener.opened) == 3
+    assert metrics.counter("test.pool_hits") == 1
+    summary = metrics.summary("test.handshake_ms")
+    assert summary is not None and summary["count"] == 3
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_miss_opens_inline() -> None:
+    opener = FakeOpener()
+    pool = _pool(opener, size=0)
+
+    conn = await pool.acquire("mulaw")
+
+    assert conn.key == "mulaw"
+    assert metrics.counter("test.pool_misses") == 1
+    assert pool.idle_count("mulaw") == 0
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_closed_and_expired_connections_are_evicted() -> None:
+    opener = FakeOpener()
+    pool = _pool(opener, max_age=60.0)
+    pool.prewarm(["mulaw"])
+    await _settle()
+    opener.opened[0].open = False
+
+    with patch("src.api.voice.connection_pool.time.monotonic", return_value=1e9):
+        conn = await pool.acquire("mulaw")
+
+    assert conn.serial == 2
+    assert metrics.counter("test.pool_evictions") == 2
+    assert metrics.counter("test.pool_misses") == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_keepalive_pings_idle_and_replaces_dead() -> None:
+    opener = FakeOpener()
+    pool = _pool(opener, size=1)
+    pool.prewarm(["mulaw"])
+    await _settle()
+    opener.opened[0].open = False
+
+    await asyncio.sleep(0.05)
+
+    assert metrics.counter("test.pool_evictions") == 1
+    assert pool.idle_count("mulaw") == 1
+    assert opener.opened[1].keepalives > 0
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_open_is_counted_and_marks_key_unhealthy() -> None:
+    opener = FakeOpener(fail=True)
+    pool = _pool(opener, size=1)
+    assert pool.healthy("mulaw")
+
+    pool.prewarm(["mulaw"])
+    await _settle()
+
+    assert pool.idle_count("mulaw") == 0
+    assert metrics.counter("test.pool_open_failures") == 1
+    assert not pool.healthy("mulaw")
+
+    opener.fail = False
+    await pool.acquire("mulaw")
+    assert pool.healthy("mulaw")
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_close_discards_idle_connections() -> None:
+    opener = FakeOpener()
+    pool = _pool(opener)
+    pool.prewarm(["mulaw"])
+    await _settle()
+
+    await pool.close()
+
+    assert all(not conn.open for conn in opener.opened)
+    assert pool.idle_count("mulaw") == 0
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+
+from src.api.config import settings
+from src.api.voice.endpointing import endpoint_hold_ms
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "My number is 555 0134",
+        "My number is 5",
+        "It's four one five",
+        "It's 12/15/1990",
+        "Can I come in on March",
+        "My name is Sarah",
+        "My name is Sarah Jane Smith",
+        "It's spelled",
+        "That's S A",
+    ],
+)
+def test_dictation_waits_longest(text: str) -> None:
+    assert endpoint_hold_ms(text) == settings.stt_dictation_hold_ms
+
+
+@pytest.mark.parametrize("text", ["I'd like a cleaning and", "Can you check the"])
+def test_trailing_connective_waits(text: str) -> None:
+    assert endpoint_hold_ms(text) == settings.stt_continuation_hold_ms
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Yes.",
+        "No thanks",
+        "Two",
+        "10",
+        "I'd like to book a cleaning.",
+        "I need to come in at 3",
+        "Do you have anything at 10",
+        "Can I come at 3:30",
+        "What's your name",
+        "What name is the booking under",
+        "How is that spelled",
+        "",
+    ],
+)
+def test_complete_answers_end_turn_immediately(text: str) -> None:
+    assert endpoint_hold_ms(text) == 0
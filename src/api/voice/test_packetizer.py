@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.api.voice.packetizer import (
+    MULAW_SILENCE,
+    TWILIO_FRAME_BYTES,
+    FramePacketizer,
+    TwilioMediaSender,
+)
+
+
+def _payloads(ws: AsyncMock) -> list[bytes]:
+    return [
+        base64.b64decode(json.loads(call.args[0])["media"]["payload"])
+        for call in ws.send.await_args_list
+    ]
+
+
+class TestFramePacketizer:
+    def test_splits_into_fixed_frames(self) -> None:
+        packetizer = FramePacketizer()
+
+        frames = packetizer.push(bytes(range(200)) * 2)
+
+        assert [len(f) for f in frames] == [TWILIO_FRAME_BYTES] * 2
+        assert packetizer.pending == 80
+
+    def test_remainder_joins_next_chunk(self) -> None:
+        packetizer = FramePacketizer()
+
+        assert packetizer.push(b"\x01" * 100) == []
+        frames = packetizer.push(b"\x02" * 60)
+
+        assert frames == [b"\x01" * 100 + b"\x02" * 60]
+        assert packetizer.pending == 0
+
+    def test_flush_pads_with_silence(self) -> None:
+        packetizer = FramePacketizer()
+        packetizer.push(b"\x01" * 10)
+
+        frame = packetizer.flush()
+
+        assert frame == b"\x01" * 10 + bytes([MULAW_SILENCE]) * 150
+        assert packetizer.flush() is None
+
+
+class TestTwilioMediaSender:
+    @pytest.mark.asyncio
+    async def test_envelope_matches_twilio_media_message(self) -> None:
+        ws = AsyncMock()
+        sender = TwilioMediaSender(ws, max_lead_ms=1000)
+        sender.start("MZ123")
+
+        await sender.send(b"\x7f" * TWILIO_FRAME_BYTES)
+
+        message = json.loads(ws.send.await_args.args[0])
+        assert message == {
+            "event": "media",
+            "streamSid": "MZ123",
+            "media": {"payload": base64.b64encode(b"\x7f" * 160).decode()},
+        }
+
+    @pytest.mark.asyncio
+    async def test_drops_audio_before_stream_start(self) -> None:
+        ws = AsyncMock()
+        sender = TwilioMediaSender(ws)
+
+        await sender.send(b"\x7f" * TWILIO_FRAME_BYTES)
+
+        ws.send.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_paces_frames_to_max_lead(self) -> None:
+        ws = AsyncMock()
+        sender = TwilioMediaSender(ws, max_lead_ms=40)
+        sender.start("MZ1")
+
+        with (
+            patch("src.api.voice.packetizer.time.monotonic", return_value=100.0),
+            patch(
+                "src.api.voice.packetizer.asyncio.sleep", new=AsyncMock()
+            ) as mock_sleep,
+        ):
+            await sender.send(b"\x7f" * TWILIO_FRAME_BYTES * 5)
+
+        assert ws.send.await_count == 5
+        assert [c.args[0] for c in mock_sleep.await_args_list] == pytest.approx(
+            [0.02, 0.04]
+        )
+
+    @pytest.mark.asyncio
+    async def test_clear_abandons_paced_frames(self) -> None:
+        ws = AsyncMock()
+        sender = TwilioMediaSender(ws, max_lead_ms=0)
+        sender.start("MZ1")
+
+        send_task = asyncio.create_task(sender.send(b"\x7f" * TWILIO_FRAME_BYTES * 50))
+        await asyncio.sleep(0.05)
+        sender.clear()
+        await send_task
+
+        assert ws.send.await_count < 10
+        assert sender.in_flight() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_partial_frame_flushed_when_idle(self) -> None:
+        ws = AsyncMock()
+        sender = TwilioMediaSender(ws, max_lead_ms=1000)
+        sender.start("MZ1")
+
+        await sender.send(b"\x01" * 200)
+        assert len(_payloads(ws)) == 1
+        await asyncio.sleep(0.05)
+
+        frames = _payloads(ws)
+        assert len(frames) == 2
+        assert frames[1] == b"\x01" * 40 + bytes([MULAW_SILENCE]) * 120
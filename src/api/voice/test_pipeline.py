@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections.abc import AsyncGenerator, Iterator
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.api.agents.answer_cache import CachedAnswer
+from src.api.agents.orchestrator import BusinessContext, CallSession
+from src.api.metrics import metrics
+from src.api.voice.pipeline import TURN_FAILURE_REPLY, CallPipeline
+from src.api.voice.stt import TWILIO_MULAW
+
+
+class FakeTransport:
+    channel = "test"
+
+    def __init__(self, barge_in: bool = True, echo_suppression_s: float = 0.0) -> None:
+        self.barge_in = barge_in
+        self.echo_suppression_s = echo_suppression_s
+        self.sent: list[bytes] = []
+        self.cleared = 0
+        self.ready = asyncio.Event()
+        self.ready.set()
+
+    async def send_audio(self, audio: bytes | memoryview) -> bool:
+        self.sent.append(bytes(audio))
+        return True
+
+    async def clear(self) -> None:
+        self.cleared += 1
+
+    def in_flight(self) -> float:
+        return 0.0
+
+
+def _pipeline(transport: FakeTransport) -> CallPipeline:
+    context = BusinessContext(
+        business_id=uuid.uuid4(), name="Test", location="", hours="", policies=""
+    )
+    with (
+        patch("src.api.voice.pipeline.DeepgramSTT", return_value=AsyncMock()),
+        patch("src.api.voice.pipeline.TTSWithFallback", return_value=AsyncMock()),
+    ):
+        pipeline = CallPipeline(transport, TWILIO_MULAW, AsyncMock())
+    pipeline._call_session = CallSession(business=context, session=AsyncMock())
+    pipeline._stt_ready.set()
+    pipeline._tts_ready.set()
+    _stt(pipeline).speech_started_at = None
+    _tts(pipeline).pending = False
+    return pipeline
+
+
+# The providers are mocks under test; these give mypy the mock type.
+def _stt(pipeline: CallPipeline) -> AsyncMock:
+    return cast(AsyncMock, pipeline._stt)
+
+
+def _tts(pipeline: CallPipeline) -> AsyncMock:
+    return cast(AsyncMock, pipeline._tts)
+
+
+async def _reply(*tokens: str) -> AsyncGenerator[str, None]:
+    for token in tokens:
+        yield token
+
+
+@pytest.fixture(autouse=True)
+def no_audio_cache() -> Iterator[None]:
+    cache = MagicMock()
+    cache.get_or_schedule.return_value = None
+    with patch("src.api.voice.pipeline.get_audio_cache", return_value=cache):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_echo_suppression_drops_audio_right_after_playback() -> None:
+    pipeline = _pipeline(FakeTransport(echo_suppression_s=0.5))
+
+    await pipeline._send_audio(b"agent")
+    await pipeline.receive_audio(b"echo")
+    pipeline._playout_end_at = time.monotonic() - 1.0
+    await pipeline.receive_audio(b"caller")
+
+    _stt(pipeline).send_audio.assert_awaited_once_with(b"caller")
+
+
+@pytest.mark.asyncio
+async def test_echo_suppression_starts_when_client_playback_ends() -> None:
+    transport = FakeTransport(echo_suppression_s=0.5)
+    transport.in_flight = MagicMock(return_value=2.0)  # type: ignore[method-assign]
+    pipeline = _pipeline(transport)
+
+    await pipeline._send_audio(b"agent")
+    await pipeline.receive_audio(b"barge-in")
+    pipeline._playout_end_at = time.monotonic() - 0.1
+    await pipeline.receive_audio(b"echo")
+
+    _stt(pipeline).send_audio.assert_awaited_once_with(b"barge-in")
+
+
+@pytest.mark.asyncio
+async def test_respond_sends_chunked_reply_and_flushes() -> None:
+    pipeline = _pipeline(FakeTransport())
+
+    with patch(
+        "src.api.voice.pipeline.process_utterance",
+        return_value=_reply("Yes", ",", " we are open."),
+    ):
+        await pipeline._respond("are you open")
+
+    sent = [call.args[0] for call in _tts(pipeline).send_text.await_args_list]
+    assert sent[-2:] == ["Yes,", " we are open."]
+    _tts(pipeline).flush.assert_awaited()
+    assert not pipeline._is_speaking
+
+
+@pytest.mark.asyncio
+async def test_still_speaking_until_sent_audio_has_played() -> None:
+    transport = FakeTransport()
+    transport.in_flight = MagicMock(side_effect=[0.05, 0.0])  # type: ignore[method-assign]
+    pipeline = _pipeline(transport)
+
+    with patch("src.api.voice.pipeline.process_utterance", return_value=_reply("Yes.")):
+        task = asyncio.create_task(pipeline._respond("are you open"))
+        await asyncio.sleep(0.02)
+        assert pipeline._is_speaking
+        await task
+
+    assert not pipeline._is_speaking
+
+
+@pytest.mark.asyncio
+async def test_still_speaking_while_tts_renders_the_tail() -> None:
+    pipeline = _pipeline(FakeTransport())
+    _tts(pipeline).pending = True
+    pipeline._last_audio_at = time.monotonic()
+
+    with patch("src.api.voice.pipeline.process_utterance", return_value=_reply("Yes.")):
+        task = asyncio.create_task(pipeline._respond("are you open"))
+        await asyncio.sleep(0.05)
+        assert pipeline._is_speaking
+        _tts(pipeline).pending = False
+        await task
+
+    assert not pipeline._is_speaking
+
+
+@pytest.mark.asyncio
+async def test_filler_clip_does_not_hold_up_reply() -> None:
+    transport = FakeTransport()
+    released = asyncio.Event()
+
+    async def paced_send(audio: bytes | memoryview) -> bool:
+        await released.wait()
+        return True
+
+    transport.send_audio = paced_send  # type: ignore[method-assign]
+    pipeline = _pipeline(transport)
+    cache = MagicMock()
+    cache.get_or_schedule.return_value = b"\xff" * 4000
+
+    with (
+        patch("src.api.voice.pipeline.get_audio_cache", return_value=cache),
+        patch(
+            "src.api.voice.pipeline.process_utterance",
+            return_value=_reply("Sure thing."),
+        ),
+    ):
+        await pipeline._respond("something random blah")
+
+    _tts(pipeline).send_text.assert_awaited_with("Sure thing.")
+    assert pipeline._filler_task is not None
+    assert not pipeline._filler_task.done()
+    released.set()
+    await pipeline._filler_task
+
+
+@pytest.mark.asyncio
+async def test_tts_audio_waits_for_a_playing_clip() -> None:
+    transport = FakeTransport()
+
+    async def paced_send(audio: bytes | memoryview) -> bool:
+        transport.sent.append(bytes(audio))
+        await asyncio.sleep(0.01)
+        return True
+
+    transport.send_audio = paced_send  # type: ignore[method-assign]
+    pipeline = _pipeline(transport)
+
+    async def tts_audio() -> AsyncGenerator[bytes, None]:
+        await asyncio.sleep(0.005)
+        yield b"\x00" * 160
+
+    _tts(pipeline).get_audio = tts_audio
+    clip = asyncio.create_task(pipeline._play_clip(b"\xff" * 9600))
+    await pipeline._play_tts()
+    await clip
+
+    assert transport.sent[-1] == b"\x00" * 160
+    assert b"".join(transport.sent[:-1]) == b"\xff" * 9600
+
+
+@pytest.mark.asyncio
+async def test_template_reply_plays_cached_clip_without_llm() -> None:
+    transport = FakeTransport()
+    pipeline = _pipeline(transport)
+    pipeline._begin_turn()
+    cache = MagicMock()
+    cache.get_or_schedule.return_value = b"\xff" * 4000
+
+    with (
+        patch("src.api.voice.pipeline.get_audio_cache", return_value=cache),
+        patch("src.api.voice.pipeline.process_utterance") as mock_process,
+    ):
+        await pipeline._respond("hello")
+
+    mock_process.assert_not_called()
+    _tts(pipeline).send_text.assert_not_awaited()
+    assert b"".join(transport.sent) == b"\xff" * 4000
+    assert pipeline._trace is not None
+    assert pipeline._trace.finished
+    assert pipeline._trace.has("first_frame")
+
+
+def _cached_answer(audio: bytes | None) -> CachedAnswer:
+    return CachedAnswer(
+        query="What are your hours?",
+        key_terms=frozenset(),
+        answer="We are open 9-5.",
+        embedding=np.ones(2, dtype=np.float32),
+        expires_at=0.0,
+        answer_ms=0.0,
+        audio=audio,
+    )
+
+
+async def _answered_from_cache(
+    pipeline: CallPipeline, answer: CachedAnswer
+) -> AsyncGenerator[str, None]:
+    pipeline.call_session.cached_answer = answer
+    yield answer.answer
+
+
+@pytest.mark.asyncio
+async def test_cached_answer_with_audio_plays_clip_without_tts() -> None:
+    transport = FakeTransport()
+    pipeline = _pipeline(transport)
+    pipeline._begin_turn()
+    answer = _cached_answer(b"\xff" * 4000)
+
+    with patch(
+        "src.api.voice.pipeline.process_utterance",
+        return_value=_answered_from_cache(pipeline, answer),
+    ):
+        await pipeline._respond("When are you open?")
+
+    sent = [call.args[0] for call in _tts(pipeline).send_text.await_args_list]
+    assert sent == ["Let me look into that."]  # only the filler
+    assert b"".join(transport.sent) == b"\xff" * 4000
+    assert pipeline._trace is not None
+    assert pipeline._trace.finished
+
+
+@pytest.mark.asyncio
+async def test_cached_answer_without_audio_is_spoken_and_rendered() -> None:
+    pipeline = _pipeline(FakeTransport())
+    answer = _cached_answer(None)
+    answer_cache = MagicMock()
+
+    with (
+        patch(
+            "src.api.voice.pipeline.process_utterance",
+            return_value=_answered_from_cache(pipeline, answer),
+        ),
+        patch("src.api.voice.pipeline.get_answer_cache", return_value=answer_cache),
+    ):
+        await pipeline._respond("When are you open?")
+
+    _tts(pipeline).send_text.assert_awaited_with("We are open 9-5.")
+    answer_cache.schedule_audio.assert_called_once()
+    assert answer_cache.schedule_audio.call_args.args[0] is answer
+
+
+@pytest.mark.asyncio
+async def test_respond_speaks_failure_reply_on_error() -> None:
+    pipeline = _pipeline(FakeTransport())
+
+    with patch(
+        "src.api.voice.pipeline.process_utterance", side_effect=RuntimeError("boom")
+    ):
+        await pipeline._respond("what are your hours")
+
+    _tts(pipeline).send_text.assert_awaited_with(TURN_FAILURE_REPLY)
+
+
+@pytest.mark.asyncio
+async def test_bargein_cancels_turn_and_clears_transport() -> None:
+    transport = FakeTransport()
+    pipeline = _pipeline(transport)
+    pipeline._response_task = asyncio.create_task(asyncio.sleep(10))
+    pipeline._is_speaking = True
+
+    await pipeline._handle_bargein()
+    await asyncio.sleep(0)
+
+    assert pipeline._response_task.cancelled()
+    _tts(pipeline).interrupt.assert_awaited_once()
+    assert transport.cleared == 1
+    assert not pipeline._is_speaking
+
+
+@pytest.mark.asyncio
+async def test_bargein_mid_reply_closes_reply_stream() -> None:
+    metrics.reset()
+    pipeline = _pipeline(FakeTransport())
+    _stt(pipeline).speech_started_at = time.monotonic()
+    closed = asyncio.Event()
+
+    async def endless_reply() -> AsyncGenerator[str, None]:
+        try:
+            yield "We have openings on Tuesday."
+            await asyncio.sleep(10)
+            yield " And Wednesday."
+        finally:
+            closed.set()
+
+    with patch(
+        "src.api.voice.pipeline.process_utterance", return_value=endless_reply()
+    ):
+        pipeline._response_task = asyncio.create_task(pipeline._respond("book"))
+        await asyncio.sleep(0.01)
+        await pipeline._handle_bargein()
+        await asyncio.wait({pipeline._response_task})
+
+    assert closed.is_set()
+    summary = metrics.summary("test.bargein_time_to_clear_ms")
+    assert summary is not None and summary["count"] == 1
+
+
+async def _never() -> None:
+    await asyncio.Event().wait()
+
+
+async def _no_audio() -> AsyncGenerator[bytes, None]:
+    return
+    yield
+
+
+def _unopened_pipeline(transport: FakeTransport) -> CallPipeline:
+    with (
+        patch("src.api.voice.pipeline.DeepgramSTT", return_value=AsyncMock()),
+        patch("src.api.voice.pipeline.TTSWithFallback", return_value=AsyncMock()),
+    ):
+        pipeline = CallPipeline(transport, TWILIO_MULAW, AsyncMock())
+    _stt(pipeline).get_transcripts = MagicMock(return_value=_no_audio())
+    _tts(pipeline).get_audio = MagicMock(return_value=_no_audio())
+    _stt(pipeline).wait_for_speech.side_effect = _never
+    return pipeline
+
+
+async def _business() -> BusinessContext:
+    return BusinessContext(
+        business_id=uuid.uuid4(), name="Test", location="", hours="", policies=""
+    )
+
+
+@pytest.mark.asyncio
+async def test_open_plays_cached_greeting_before_providers_connect() -> None:
+    metrics.reset()
+    transport = FakeTransport()
+    pipeline = _unopened_pipeline(transport)
+    connected = asyncio.Event()
+
+    async def connect(*args: object) -> None:
+        await connected.wait()
+
+    _stt(pipeline).connect.side_effect = connect
+    _tts(pipeline).connect.side_effect = connect
+    cache = MagicMock()
+    cache.get_or_schedule.return_value = b"\xff" * 100
+
+    with patch("src.api.voice.pipeline.get_audio_cache", return_value=cache):
+        opening = asyncio.create_task(pipeline.open(_business()))
+        await asyncio.sleep(0.01)
+        assert transport.sent == [b"\xff" * 100]
+        connected.set()
+        assert await opening
+
+    summary = metrics.summary("test.time_to_first_audio_ms")
+    assert summary is not None and summary["count"] == 1
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_open_speaks_greeting_once_tts_connects_ahead_of_stt() -> None:
+    pipeline = _unopened_pipeline(FakeTransport())
+    stt_connected = asyncio.Event()
+
+    async def stt_connect(profile: object) -> None:
+        await stt_connected.wait()
+
+    _stt(pipeline).connect.side_effect = stt_connect
+
+    opening = asyncio.create_task(pipeline.open(_business()))
+    await asyncio.sleep(0.01)
+    _tts(pipeline).send_text.assert_awaited_once()
+    _tts(pipeline).flush.assert_awaited_once()
+    assert not opening.done()
+
+    stt_connected.set()
+    assert await opening
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_open_abandons_connects_for_unknown_business() -> None:
+    pipeline = _unopened_pipeline(FakeTransport())
+    stt_cancelled = asyncio.Event()
+
+    async def stt_connect(profile: object) -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            stt_cancelled.set()
+            raise
+
+    _stt(pipeline).connect.side_effect = stt_connect
+
+    async def not_found() -> None:
+        await asyncio.sleep(0)
+
+    assert not await pipeline.open(not_found())
+
+    assert stt_cancelled.is_set()
+    _tts(pipeline).send_text.assert_not_awaited()
+    with pytest.raises(RuntimeError):
+        pipeline.call_session  # noqa: B018
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.api.voice.resampler import COMMON_RATES, StreamingResampler, get_filter_bank
+
+
+def _tone(freq: float, rate: int, seconds: float = 1.0) -> bytes:
+    t = np.arange(int(rate * seconds)) / rate
+    return (8000 * np.sin(2 * np.pi * freq * t)).astype(np.int16).tobytes()
+
+
+def _samples(pcm: bytes) -> np.ndarray:
+    return np.frombuffer(pcm, dtype=np.int16)
+
+
+class TestStreamingResampler:
+    @pytest.mark.parametrize(("in_rate", "out_rate"), COMMON_RATES)
+    def test_output_length_matches_ratio(self, in_rate: int, out_rate: int) -> None:
+        resampler = StreamingResampler(in_rate, out_rate)
+
+        out = resampler.process(_tone(440, in_rate))
+
+        assert len(out) // 2 == out_rate
+
+    @pytest.mark.parametrize(("in_rate", "out_rate"), COMMON_RATES)
+    def test_streaming_matches_single_block(self, in_rate: int, out_rate: int) -> None:
+        audio = _tone(440, in_rate)
+        whole = StreamingResampler(in_rate, out_rate).process(audio)
+
+        streaming = StreamingResampler(in_rate, out_rate)
+        frame_bytes = in_rate // 50 * 2
+        chunks = [
+            streaming.process(audio[i : i + frame_bytes])
+            for i in range(0, len(audio), frame_bytes)
+        ]
+
+        assert b"".join(chunks) == whole
+
+    def test_odd_sized_frames_carry_state(self) -> None:
+        audio = _tone(440, 44100)
+        whole = StreamingResampler(44100, 16000).process(audio)
+
+        streaming = StreamingResampler(44100, 16000, max_frame_samples=64)
+        chunks = [
+            streaming.process(audio[i : i + 58]) for i in range(0, len(audio), 58)
+        ]
+
+        assert b"".join(chunks) == whole
+
+    def test_passband_tone_preserved(self) -> None:
+        out = _samples(StreamingResampler(48000, 16000).process(_tone(1000, 48000)))
+
+        assert np.abs(out[1000:]).max() == pytest.approx(8000, rel=0.02)
+
+    def test_tone_above_nyquist_rejected(self) -> None:
+        out = _samples(StreamingResampler(48000, 16000).process(_tone(11000, 48000)))
+
+        assert np.abs(out[1000:]).max() < 80
+
+    def test_same_rate_is_passthrough(self) -> None:
+        audio = _tone(440, 16000)
+
+        assert StreamingResampler(16000, 16000).process(audio) is audio
+
+    def test_empty_frame(self) -> None:
+        assert StreamingResampler(48000, 16000).process(b"") == b""
+
+    def test_invalid_rate_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            StreamingResampler(0, 16000)
+
+    def test_filter_banks_shared_between_calls(self) -> None:
+        assert get_filter_bank(48000, 16000) is get_filter_bank(48000, 16000)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from src.api.voice.streams import ClosableQueue
+from src.api.voice.stt import DeepgramSTT
+from src.api.voice.tts import DeepgramTTS
+
+
+async def _collect(queue: ClosableQueue[str]) -> list[str]:
+    return await _drain(queue.stream())
+
+
+async def _drain(stream: AsyncIterator[str]) -> list[str]:
+    return [item async for item in stream]
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_items_then_stops_on_close() -> None:
+    queue: ClosableQueue[str] = ClosableQueue()
+    await queue.put("a")
+    await queue.put("b")
+    queue.close()
+
+    assert await _collect(queue) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_close_wakes_blocked_consumers() -> None:
+    queue: ClosableQueue[str] = ClosableQueue()
+    consumers = [asyncio.create_task(_collect(queue)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    queue.close()
+
+    assert await asyncio.wait_for(asyncio.gather(*consumers), 1) == [[], [], []]
+
+
+@pytest.mark.asyncio
+async def test_clear_keeps_close_marker() -> None:
+    queue: ClosableQueue[str] = ClosableQueue()
+    await queue.put("stale")
+    queue.close()
+
+    queue.clear()
+
+    assert await _collect(queue) == []
+
+
+@pytest.mark.asyncio
+async def test_drain_returns_pending_items_and_keeps_close_marker() -> None:
+    queue: ClosableQueue[str] = ClosableQueue()
+    await queue.put("a")
+    await queue.put("b")
+    queue.close()
+
+    assert queue.drain() == ["a", "b"]
+    assert await _collect(queue) == []
+
+
+@pytest.mark.asyncio
+async def test_close_is_idempotent() -> None:
+    queue: ClosableQueue[str] = ClosableQueue()
+    queue.close()
+    queue.close()
+
+    assert queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_stt_transcripts_end_when_closed() -> None:
+    stt = DeepgramSTT()
+    await stt._transcript_queue.put("hello")
+    consumer = asyncio.create_task(asyncio.wait_for(_drain(stt.get_transcripts()), 1))
+    await asyncio.sleep(0)
+
+    await stt.close()
+
+    assert await consumer == ["hello"]
+
+
+@pytest.mark.asyncio
+async def test_tts_audio_ends_when_closed() -> None:
+    tts = DeepgramTTS()
+    await tts._audio_queue.put(b"audio")
+
+    await tts.close()
+
+    assert [chunk async for chunk in tts.get_audio()] == [b"audio"]
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from unittest.mock import AsyncMock, patch
 
-from src.api.voice.stt import DeepgramSTT
+import pytest
+
+from src.api.config import settings
+from src.api.voice.stt import BROWSER_LINEAR16, TWILIO_MULAW, DeepgramSTT
 
 
 def _make_result(transcript: str, is_final: bool, speech_final: bool = False) -> str:
@@ -71,3 +76,194 @@ class TestDeepgramSTTTurnDetection:
         stt._flush_utterance_buffer()
 
         assert stt._transcript_queue.empty()
+
+
+class TestTurnAssembly:
+    def _feed(self, stt: DeepgramSTT, *messages: str) -> None:
+        for message in messages:
+            stt._handle_message(json.loads(message))
+
+    @pytest.mark.asyncio
+    async def test_segments_join_into_one_turn_on_speech_final(self) -> None:
+        stt = DeepgramSTT()
+
+        self._feed(
+            stt,
+            _make_result("I want to", is_final=True),
+            _make_result("book a cleaning.", is_final=True, speech_final=True),
+            _make_utterance_end(),
+        )
+
+        assert stt._transcript_queue.get_nowait() == "I want to book a cleaning."
+        assert stt._transcript_queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_dictation_holds_turn_until_caller_continues(self) -> None:
+        stt = DeepgramSTT()
+
+        with patch.object(settings, "stt_dictation_hold_ms", 50):
+            self._feed(
+                stt,
+                _make_result("My number is 555", is_final=True, speech_final=True),
+            )
+            await asyncio.sleep(0.01)
+            assert stt._transcript_queue.empty()
+
+            self._feed(
+                stt,
+                _make_result("1234", is_final=False),
+                _make_result("123 4567.", is_final=True, speech_final=True),
+            )
+            await asyncio.sleep(0.1)
+
+        assert stt._transcript_queue.get_nowait() == "My number is 555 123 4567."
+
+    @pytest.mark.asyncio
+    async def test_dictation_hold_expires_into_turn(self) -> None:
+        stt = DeepgramSTT()
+
+        with patch.object(settings, "stt_dictation_hold_ms", 20):
+            self._feed(
+                stt,
+                _make_result("It's J O", is_final=True, speech_final=True),
+            )
+            await asyncio.sleep(0.05)
+
+        assert stt._transcript_queue.get_nowait() == "It's J O"
+
+    @pytest.mark.asyncio
+    async def test_interim_reported_with_buffered_segments(self) -> None:
+        stt = DeepgramSTT()
+        seen: list[str] = []
+        stt.on_interim = seen.append
+
+        self._feed(
+            stt,
+            _make_result("I want to", is_final=True),
+            _make_result("book a", is_final=False),
+        )
+        stt._flush_utterance_buffer()
+
+        assert seen == ["I want to book a"]
+
+    @pytest.mark.asyncio
+    async def test_queued_turns_are_merged(self) -> None:
+        stt = DeepgramSTT()
+        await stt._transcript_queue.put("Can I book")
+        await stt._transcript_queue.put("for Tuesday?")
+        stt._transcript_queue.close()
+
+        turns = [turn async for turn in stt.get_transcripts()]
+
+        assert turns == ["Can I book for Tuesday?"]
+
+
+class TestAudioProfiles:
+    def test_twilio_profile_declares_mulaw_8k(self) -> None:
+        assert TWILIO_MULAW.query_params() == (
+            "encoding=mulaw&sample_rate=8000&channels=1"
+        )
+        assert TWILIO_MULAW.bytes_per_second == 8000
+
+    def test_browser_profile_declares_linear16(self) -> None:
+        assert BROWSER_LINEAR16.encoding == "linear16"
+        assert BROWSER_LINEAR16.bytes_per_second == 32000
+
+    @pytest.mark.asyncio
+    async def test_connect_uses_profile(self) -> None:
+        stt = DeepgramSTT()
+        with (
+            patch("src.api.voice.stt._stt_pool", None),
+            patch.object(settings, "stt_pool_size", 0),
+            patch("src.api.voice.stt.websockets.connect", new=AsyncMock()) as mock,
+            patch(
+                "src.api.voice.stt.asyncio.create_task",
+                side_effect=lambda coro: coro.close(),
+            ),
+        ):
+            await stt.connect(TWILIO_MULAW)
+
+        url = mock.call_args[0][0]
+        assert "encoding=mulaw&sample_rate=8000&channels=1" in url
+        assert stt.profile is TWILIO_MULAW
+
+    @pytest.mark.asyncio
+    async def test_send_audio_counts_bytes(self) -> None:
+        stt = DeepgramSTT()
+        stt._ws = AsyncMock()
+        stt._running = True
+
+        await stt.send_audio(b"\xff" * 160)
+        await stt.send_audio(b"\xff" * 160)
+
+        assert stt.bytes_sent == 320
+
+
+class TestSendAggregation:
+    def _connected(
+        self, batch_ms: int, max_delay_ms: int = 1000
+    ) -> tuple[DeepgramSTT, AsyncMock]:
+        stt = DeepgramSTT(batch_ms=batch_ms, batch_max_delay_ms=max_delay_ms)
+        ws = AsyncMock()
+        stt._ws = ws
+        stt._running = True
+        stt._profile = TWILIO_MULAW
+        stt._audio_buffer = bytearray(TWILIO_MULAW.bytes_per_second * batch_ms // 1000)
+        return stt, ws
+
+    @pytest.mark.asyncio
+    async def test_batches_frames_until_window_full(self) -> None:
+        stt, ws = self._connected(batch_ms=60)
+
+        for i in range(3):
+            await stt.send_audio(bytes([i]) * 160)
+
+        ws.send.assert_awaited_once_with(b"\x00" * 160 + b"\x01" * 160 + b"\x02" * 160)
+        await stt.flush_audio()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_waits_for_flush(self) -> None:
+        stt, ws = self._connected(batch_ms=60)
+
+        await stt.send_audio(b"\x01" * 160)
+        ws.send.assert_not_awaited()
+
+        await stt.flush_audio()
+        ws.send.assert_awaited_once_with(b"\x01" * 160)
+
+    @pytest.mark.asyncio
+    async def test_timer_flushes_partial_batch(self) -> None:
+        stt, ws = self._connected(batch_ms=60, max_delay_ms=10)
+
+        await stt.send_audio(b"\x01" * 160)
+        await asyncio.sleep(0.05)
+
+        ws.send.assert_awaited_once_with(b"\x01" * 160)
+
+    @pytest.mark.asyncio
+    async def test_oversized_frame_split_across_batches(self) -> None:
+        stt, ws = self._connected(batch_ms=20)
+
+        await stt.send_audio(b"\x01" * 400)
+
+        assert ws.send.await_count == 2
+        assert stt._buffered == 80
+        await stt.flush_audio()
+        assert stt.bytes_sent == 400
+
+    @pytest.mark.asyncio
+    async def test_zero_window_sends_every_frame(self) -> None:
+        stt, ws = self._connected(batch_ms=0)
+
+        await stt.send_audio(b"\x01" * 160)
+
+        ws.send.assert_awaited_once_with(b"\x01" * 160)
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_audio(self) -> None:
+        stt, ws = self._connected(batch_ms=60)
+
+        await stt.send_audio(b"\x01" * 160)
+        await stt.close()
+
+        ws.send.assert_awaited_once_with(b"\x01" * 160)
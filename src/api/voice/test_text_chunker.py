@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from src.api.voice.text_chunker import TextChunker, chunk_text
+
+# Token streams as gpt-4o-mini emitted them for two receptionist replies.
+BOOKING_TOKENS = [
+    "Sure",
+    "!",
+    " I",
+    " can",
+    " help",
+    " you",
+    " book",
+    " that",
+    ".",
+    " We",
+    " have",
+    " openings",
+    " on",
+    " Tuesday",
+    " at",
+    " 3",
+    ".",
+    "30",
+    " PM",
+    " and",
+    " Wednesday",
+    " at",
+    " 10",
+    " AM",
+    ",",
+    " which",
+    " works",
+    " better",
+    " for",
+    " you",
+    "?",
+]
+HOURS_TOKENS = [
+    "Our",
+    " clinic",
+    " is",
+    " open",
+    " Monday",
+    " through",
+    " Friday",
+    " from",
+    " 8",
+    " AM",
+    " to",
+    " 6",
+    " PM",
+    " and",
+    " Saturday",
+    " mornings",
+    " until",
+    " noon",
+    " for",
+    " routine",
+    " check",
+    "-ups",
+    " and",
+    " vaccinations",
+]
+
+
+def _push_all(chunker: TextChunker, tokens: list[str]) -> list[str]:
+    chunks = [chunk for token in tokens for chunk in chunker.push(token)]
+    tail = chunker.flush()
+    return chunks + ([tail] if tail else [])
+
+
+async def _tokens(
+    tokens: list[str], delays: dict[int, float] | None = None
+) -> AsyncGenerator[str, None]:
+    for i, token in enumerate(tokens):
+        await asyncio.sleep((delays or {}).get(i, 0))
+        yield token
+
+
+class TestTextChunker:
+    def test_splits_recorded_stream_at_boundaries(self) -> None:
+        chunks = _push_all(TextChunker(), BOOKING_TOKENS)
+
+        assert chunks == [
+            "Sure!",
+            " I can help you book that.",
+            " We have openings on Tuesday at 3.30 PM and Wednesday at 10 AM,",
+            " which works better for you?",
+        ]
+        assert "".join(chunks) == "".join(BOOKING_TOKENS)
+
+    def test_decimal_point_is_not_a_boundary(self) -> None:
+        chunker = TextChunker()
+
+        assert chunker.push("It costs 3") == []
+        assert chunker.push(".") == []
+        assert chunker.push("50 dollars") == []
+        assert chunker.flush() == "It costs 3.50 dollars"
+
+    def test_digit_then_period_splits_once_followed_by_space(self) -> None:
+        chunker = TextChunker()
+
+        assert chunker.push("We open at 9.") == []
+        assert chunker.push(" Bring your card") == ["We open at 9."]
+
+    def test_long_text_without_punctuation_splits_on_words(self) -> None:
+        chunks = _push_all(TextChunker(first_chars=30, max_chars=50), HOURS_TOKENS)
+
+        assert all(len(chunk) <= 50 for chunk in chunks)
+        assert len(chunks[0]) <= 30
+        assert all(not chunk.endswith(("clin", "Satur")) for chunk in chunks)
+        assert "".join(chunks) == "".join(HOURS_TOKENS)
+
+    def test_clear_resets_first_chunk_threshold(self) -> None:
+        chunker = TextChunker(first_chars=10, max_chars=40)
+        chunker.push("one two three four")
+        chunker.clear()
+
+        assert chunker.pending == 0
+        assert chunker.push("five six seven") == ["five six"]
+
+
+class TestChunkText:
+    @pytest.mark.asyncio
+    async def test_yields_boundary_chunks_and_tail(self) -> None:
+        chunks = [c async for c in chunk_text(_tokens(BOOKING_TOKENS[:9] + [" We"]))]
+
+        assert chunks == ["Sure!", " I can help you book that.", " We"]
+
+    @pytest.mark.asyncio
+    async def test_stalled_stream_flushes_pending_text(self) -> None:
+        stream = chunk_text(
+            _tokens(["Let me", " check", " that"], delays={2: 0.5}),
+            max_delay_ms=20,
+        )
+
+        first = await asyncio.wait_for(anext(stream), 0.3)
+        rest = [c async for c in stream]
+
+        assert first == "Let me check"
+        assert rest == [" that"]
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_pending_token(self) -> None:
+        cancelled = asyncio.Event()
+
+        async def slow() -> AsyncGenerator[str, None]:
+            yield "Hold on"
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            yield "never"
+
+        stream = chunk_text(slow(), max_delay_ms=10)
+        assert await anext(stream) == "Hold on"
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_closes_token_source(self) -> None:
+        closed = asyncio.Event()
+
+        async def source() -> AsyncGenerator[str, None]:
+            try:
+                yield "Sure."
+                yield " Anything else?"
+            finally:
+                closed.set()
+
+        stream = chunk_text(source())
+        assert await anext(stream) == "Sure."
+        await stream.aclose()
+
+        assert closed.is_set()
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import base64
 import json
-from unittest.mock import AsyncMock, patch
+from collections.abc import AsyncGenerator
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.api.voice.tts import DeepgramTTS, TTSWithFallback
+from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.voice.streams import ClosableQueue
+from src.api.voice.tts import (
+    SPOKEN_BYTES_PER_CHAR,
+    DeepgramTTS,
+    ElevenLabsMultiContextTTS,
+    TTSWithFallback,
+)
 
 
 @pytest.mark.asyncio
@@ -102,3 +114,269 @@ async def test_deepgram_tts_interrupt_clears_queue() -> None:
     await tts.interrupt()
 
     assert tts._audio_queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_tts_with_fallback_skips_unhealthy_primary() -> None:
+    mock_primary = AsyncMock(provider="elevenlabs")
+    mock_fallback = AsyncMock(provider="deepgram")
+    pool = MagicMock()
+    pool.healthy.side_effect = lambda provider: provider != "elevenlabs"
+
+    with (
+        patch(
+            "src.api.voice.tts._build_provider_pair",
+            return_value=(mock_primary, mock_fallback),
+        ),
+        patch("src.api.voice.tts.get_tts_pool", return_value=pool),
+    ):
+        tts = TTSWithFallback()
+        await tts.connect()
+
+    mock_primary.connect.assert_not_awaited()
+    mock_fallback.connect.assert_awaited_once()
+    assert tts._active is mock_fallback
+
+
+@pytest.mark.asyncio
+async def test_deepgram_tts_connect_leases_from_pool() -> None:
+    tts = DeepgramTTS()
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=AsyncMock())
+
+    with (
+        patch("src.api.voice.tts.get_tts_pool", return_value=pool),
+        patch(
+            "src.api.voice.tts.asyncio.create_task",
+            side_effect=lambda coro: coro.close(),
+        ),
+    ):
+        await tts.connect()
+
+    pool.acquire.assert_awaited_once_with("deepgram")
+    assert tts._ws is pool.acquire.return_value
+
+
+class FakeProvider:
+    def __init__(self, provider: str) -> None:
+        self.provider = provider
+        self.sent: list[str] = []
+        self.flushes = 0
+        self.audio: ClosableQueue[bytes] = ClosableQueue()
+
+    async def connect(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+    async def flush(self) -> None:
+        self.flushes += 1
+
+    async def interrupt(self) -> None:
+        self.audio.clear()
+
+    async def get_audio(self) -> AsyncGenerator[bytes, None]:
+        async for chunk in self.audio.stream():
+            yield chunk
+
+    async def close(self) -> None:
+        self.audio.close()
+
+
+async def _failover_pair() -> tuple[TTSWithFallback, FakeProvider, FakeProvider]:
+    primary, standby = FakeProvider("deepgram"), FakeProvider("elevenlabs")
+    with (
+        patch(
+            "src.api.voice.tts._build_provider_pair", return_value=(primary, standby)
+        ),
+        patch("src.api.voice.tts.get_tts_pool", return_value=MagicMock()),
+        patch(
+            "src.api.voice.tts.configured_providers",
+            return_value=["deepgram", "elevenlabs"],
+        ),
+    ):
+        tts = TTSWithFallback()
+        await tts.connect()
+    return tts, primary, standby
+
+
+async def _wait_for_failover(tts: TTSWithFallback) -> None:
+    while tts._failover_task is None:
+        await asyncio.sleep(0.005)
+    await asyncio.wait_for(tts._failover_task, 1)
+
+
+async def _drain(tts: TTSWithFallback, chunks: list[bytes]) -> None:
+    async for chunk in tts.get_audio():
+        chunks.append(chunk)
+
+
+@pytest.mark.asyncio
+async def test_tts_fails_over_when_provider_stream_dies() -> None:
+    tts, primary, standby = await _failover_pair()
+    heard: list[bytes] = []
+    consumer = asyncio.create_task(_drain(tts, heard))
+
+    await tts.send_text("Hi. ")
+    await tts.send_text("Your visit is booked.")
+    await tts.flush()
+    await primary.audio.put(bytes(4 * SPOKEN_BYTES_PER_CHAR))
+    await asyncio.sleep(0)
+    primary.audio.close()
+    await _wait_for_failover(tts)
+
+    assert tts._active is standby
+    assert standby.sent == ["Your visit is booked."]
+    assert standby.flushes == 1
+
+    await standby.audio.put(b"replayed")
+    await asyncio.sleep(0.01)
+    await tts.close()
+    await asyncio.wait_for(consumer, 1)
+    assert heard[-1] == b"replayed"
+
+
+@pytest.mark.asyncio
+async def test_tts_fails_over_on_audio_stall_after_flush() -> None:
+    tts, primary, standby = await _failover_pair()
+    consumer = asyncio.create_task(_drain(tts, []))
+    before = metrics.counter("tts.failovers")
+
+    with patch.object(settings, "tts_stall_timeout_ms", 20):
+        await tts.send_text("Let me check that for you.")
+        await tts.flush()
+        await _wait_for_failover(tts)
+
+    assert tts._active is standby
+    assert standby.sent == ["Let me check that for you."]
+    assert metrics.counter("tts.failovers") == before + 1
+    await tts.close()
+    await asyncio.wait_for(consumer, 1)
+
+
+@pytest.mark.asyncio
+async def test_primary_keeps_playing_when_standby_cannot_connect() -> None:
+    tts, primary, standby = await _failover_pair()
+    standby.connect = AsyncMock(  # type: ignore[method-assign]
+        side_effect=ConnectionError("standby down")
+    )
+    heard: list[bytes] = []
+    consumer = asyncio.create_task(_drain(tts, heard))
+
+    with patch.object(settings, "tts_stall_timeout_ms", 20):
+        await tts.send_text("Let me check that for you.")
+        await tts.flush()
+        await _wait_for_failover(tts)
+
+    assert tts._active is primary
+    await primary.audio.put(b"late audio")
+    await asyncio.sleep(0.01)
+    assert heard == [b"late audio"]
+    await tts.close()
+    await asyncio.wait_for(consumer, 1)
+
+
+@pytest.mark.asyncio
+async def test_unconfigured_standby_is_never_used() -> None:
+    primary, standby = FakeProvider("deepgram"), FakeProvider("elevenlabs")
+    with (
+        patch(
+            "src.api.voice.tts._build_provider_pair", return_value=(primary, standby)
+        ),
+        patch("src.api.voice.tts.get_tts_pool", return_value=MagicMock()),
+        patch("src.api.voice.tts.configured_providers", return_value=["deepgram"]),
+    ):
+        tts = TTSWithFallback()
+        await tts.connect()
+
+    assert tts._active is primary
+    assert tts._standby is None
+
+
+@pytest.mark.asyncio
+async def test_tts_does_not_fail_over_once_turn_is_spoken() -> None:
+    tts, primary, standby = await _failover_pair()
+    consumer = asyncio.create_task(_drain(tts, []))
+
+    with patch.object(settings, "tts_stall_timeout_ms", 20):
+        await tts.send_text("Okay.")
+        await tts.flush()
+        await primary.audio.put(bytes(5 * SPOKEN_BYTES_PER_CHAR))
+        await asyncio.sleep(0.05)
+
+    assert tts._active is primary
+    assert tts._failover_task is None
+    await tts.close()
+    await asyncio.wait_for(consumer, 1)
+
+
+def _multi_context() -> ElevenLabsMultiContextTTS:
+    tts = ElevenLabsMultiContextTTS()
+    tts._ws = AsyncMock()
+    tts._running = True
+    return tts
+
+
+def _sent(tts: ElevenLabsMultiContextTTS) -> list[dict[str, object]]:
+    ws = cast(AsyncMock, tts._ws)
+    return [json.loads(call.args[0]) for call in ws.send.await_args_list]
+
+
+def _audio(context_id: str, audio: bytes) -> dict[str, object]:
+    encoded = base64.b64encode(audio).decode("ascii")
+    return {"audio": encoded, "contextId": context_id}
+
+
+@pytest.mark.asyncio
+async def test_multi_context_opens_one_context_per_turn() -> None:
+    tts = _multi_context()
+
+    await tts.send_text("Hello")
+    await tts.send_text(" there.")
+    await tts.flush()
+    await tts.send_text("Anything else?")
+
+    sent = _sent(tts)
+    assert sent[0]["context_id"] == "turn-1" and "voice_settings" in sent[0]
+    assert sent[1] == {"text": " there.", "context_id": "turn-1"}
+    assert sent[2:4] == [
+        {"context_id": "turn-1", "flush": True},
+        {"context_id": "turn-1", "close_context": True},
+    ]
+    assert sent[4]["context_id"] == "turn-2" and "voice_settings" in sent[4]
+
+
+@pytest.mark.asyncio
+async def test_multi_context_plays_contexts_in_order() -> None:
+    tts = _multi_context()
+    await tts.send_text("One moment.")
+    await tts.flush()
+    await tts.send_text("We open at nine.")
+
+    await tts._handle_message(_audio("turn-2", b"reply"))
+    await tts._handle_message(_audio("turn-1", b"filler"))
+    assert tts._audio_queue.get_nowait() == b"filler"
+    assert tts._audio_queue.empty()
+
+    await tts._handle_message({"isFinal": True, "contextId": "turn-1"})
+    assert tts._audio_queue.get_nowait() == b"reply"
+
+
+@pytest.mark.asyncio
+async def test_multi_context_interrupt_cancels_without_reconnecting() -> None:
+    tts = _multi_context()
+    ws = cast(AsyncMock, tts._ws)
+    await tts.send_text("Our hours are")
+    await tts._handle_message(_audio("turn-1", b"old"))
+
+    await tts.interrupt()
+    await tts._handle_message(_audio("turn-1", b"late"))
+    await tts.send_text("Sure, go ahead.")
+    await tts._handle_message(_audio("turn-2", b"new"))
+
+    assert tts._ws is ws
+    ws.close.assert_not_awaited()
+    assert {"context_id": "turn-1", "close_context": True} in _sent(tts)
+    assert tts._audio_queue.get_nowait() == b"new"
+    assert tts._audio_queue.empty()
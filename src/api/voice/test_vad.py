@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import cast
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from src.api.voice.audio_utils import pcm16_to_mulaw
+from src.api.voice.codec import MulawCodec
+from src.api.voice.stt import TWILIO_MULAW, DeepgramSTT
+from src.api.voice.vad import VADConfig, VADEvent, VoiceActivityDetector
+
+RATE = 16000
+FRAME = RATE // 50  # 20 ms
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(RATE * seconds), dtype=np.int16)
+
+
+def _room_noise(seconds: float, level: float = 30.0) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    return (rng.normal(0, level, int(RATE * seconds))).astype(np.int16)
+
+
+def _hiss(seconds: float, level: float = 400.0) -> np.ndarray:
+    rng = np.random.default_rng(2)
+    return (rng.normal(0, level, int(RATE * seconds))).astype(np.int16)
+
+
+def _voiced(seconds: float, f0: float = 140.0, level: float = 6000.0) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    harmonics = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+    syllables = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    signal = level * harmonics * syllables / 2
+    return signal.astype(np.int16)
+
+
+CORPUS = {
+    "silence": (_silence(2.0), []),
+    "room_noise": (_room_noise(2.0), []),
+    "hiss": (_hiss(2.0), []),
+    "utterance": (
+        np.concatenate((_silence(0.5), _voiced(1.0), _silence(1.0))),
+        [VADEvent.SPEECH_START, VADEvent.SPEECH_END],
+    ),
+    "two_utterances": (
+        np.concatenate(
+            (_voiced(0.6), _silence(0.8), _voiced(0.6, f0=220), _silence(0.8))
+        ),
+        [
+            VADEvent.SPEECH_START,
+            VADEvent.SPEECH_END,
+            VADEvent.SPEECH_START,
+            VADEvent.SPEECH_END,
+        ],
+    ),
+    "short_pause_inside_utterance": (
+        np.concatenate((_voiced(0.5), _silence(0.2), _voiced(0.5), _silence(1.0))),
+        [VADEvent.SPEECH_START, VADEvent.SPEECH_END],
+    ),
+    "click": (
+        np.concatenate((_silence(0.5), _voiced(0.02), _silence(0.5))),
+        [],
+    ),
+}
+
+
+def _events(signal: np.ndarray, frame: int = FRAME) -> list[tuple[VADEvent, int]]:
+    vad = VoiceActivityDetector(RATE)
+    events = []
+    for start in range(0, signal.size, frame):
+        event = vad.process(signal[start : start + frame].tobytes())
+        if event is not None:
+            events.append((event, start))
+    return events
+
+
+class TestVoiceActivityDetector:
+    @pytest.mark.parametrize("name", sorted(CORPUS))
+    def test_corpus(self, name: str) -> None:
+        signal, expected = CORPUS[name]
+
+        assert [event for event, _ in _events(signal)] == expected
+
+    def test_speech_start_latency_bounded_by_start_window(self) -> None:
+        signal, _ = CORPUS["utterance"]
+
+        (start_event, start_at), _ = _events(signal)
+
+        assert start_event is VADEvent.SPEECH_START
+        onset = int(0.5 * RATE)
+        assert start_at - onset <= int(0.08 * RATE)
+
+    def test_unaligned_frames_carry_over(self) -> None:
+        signal, expected = CORPUS["utterance"]
+
+        assert [event for event, _ in _events(signal, frame=137)] == expected
+
+    def test_thresholds_configurable(self) -> None:
+        vad = VoiceActivityDetector(RATE, VADConfig(energy_threshold_db=-10.0))
+
+        events = [vad.process(f.tobytes()) for f in np.split(_voiced(1.0), 50)]
+
+        assert VADEvent.SPEECH_START not in events
+
+
+class TestSTTGating:
+    def _connected(self) -> DeepgramSTT:
+        stt = DeepgramSTT(batch_ms=0, vad_config=VADConfig(preroll_ms=100))
+        stt._ws = AsyncMock()
+        stt._running = True
+        stt._profile = TWILIO_MULAW
+        stt._vad = VoiceActivityDetector(8000, stt._vad_config)
+        stt._vad_codec = MulawCodec()
+        stt._preroll_limit = TWILIO_MULAW.bytes_per_second * 100 // 1000
+        return stt
+
+    @pytest.mark.asyncio
+    async def test_silence_not_forwarded(self) -> None:
+        stt = self._connected()
+        frame = pcm16_to_mulaw(np.zeros(160, dtype=np.int16).tobytes())
+
+        for _ in range(50):
+            await stt.send_audio(frame)
+
+        cast(AsyncMock, stt._ws).send.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_speech_start_sets_flag_and_replays_preroll(self) -> None:
+        stt = self._connected()
+        t = np.arange(8000) / 8000
+        tone = (6000 * np.sin(2 * np.pi * 200 * t)).astype(np.int16)
+        silence = pcm16_to_mulaw(np.zeros(160, dtype=np.int16).tobytes())
+
+        for _ in range(20):
+            await stt.send_audio(silence)
+        for start in range(0, 800, 160):
+            await stt.send_audio(pcm16_to_mulaw(tone[start : start + 160].tobytes()))
+
+        # 100 ms of pre-roll replayed, then the triggering frame and the rest
+        assert stt._speech_started.is_set()
+        assert stt.bytes_sent == 800 + 160 * 3
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterable
+
+from src.api.config import settings
+from src.api.metrics import metrics
+
+BOUNDARY_PUNCTUATION = frozenset(".!?;:,")
+# A trailing "." or "," after a digit may be a decimal point or thousands
+# separator, so it only counts once the following character is whitespace.
+NUMERIC_PUNCTUATION = frozenset(".,")
+
+
+class TextChunker:
+    def __init__(
+        self, first_chars: int | None = None, max_chars: int | None = None
+    ) -> None:
+        self._first_chars = first_chars or settings.tts_chunk_first_chars
+        self._max_chars = max_chars or settings.tts_chunk_max_chars
+        self._buffer = ""
+        self._scanned = 0
+        self._emitted = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def push(self, token: str) -> list[str]:
+        self._buffer += token
+        chunks: list[str] = []
+        cut = self._last_boundary()
+        if cut:
+            chunks.append(self._take(cut))
+        limit = self._max_chars if self._emitted else self._first_chars
+        while len(self._buffer) >= limit:
+            space = self._buffer.rfind(" ", 1, limit + 1)
+            chunks.append(self._take(space if space > 0 else len(self._buffer)))
+            limit = self._max_chars
+        # The last character's successor is unknown, so it is rescanned.
+        self._scanned = max(len(self._buffer) - 1, 0)
+        return chunks
+
+    def flush(self) -> str | None:
+        if not self._buffer:
+            return None
+        return self._take(len(self._buffer))
+
+    def clear(self) -> None:
+        self._buffer = ""
+        self._scanned = 0
+        self._emitted = False
+
+    def _last_boundary(self) -> int:
+        buffer = self._buffer
+        end = len(buffer)
+        for i in range(end - 1, self._scanned - 1, -1):
+            char = buffer[i]
+            if char not in BOUNDARY_PUNCTUATION:
+                continue
+            if i + 1 < end:
+                if buffer[i + 1].isspace():
+                    return i + 1
+            elif not (
+                char in NUMERIC_PUNCTUATION and i > 0 and buffer[i - 1].isdigit()
+            ):
+                return end
+        return 0
+
+    def _take(self, cut: int) -> str:
+        chunk, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        self._emitted = True
+        return chunk
+
+
+async def chunk_text(
+    tokens: AsyncIterable[str],
+    chunker: TextChunker | None = None,
+    max_delay_ms: int | None = None,
+) -> AsyncGenerator[str, None]:
+    chunker = chunker or TextChunker()
+    delay_ms = settings.tts_chunk_max_delay_ms if max_delay_ms is None else max_delay_ms
+    iterator = aiter(tokens)
+    next_token: asyncio.Future[str] | None = None
+    try:
+        while True:
+            if next_token is None and not chunker.pending:
+                try:
+                    token = await anext(iterator)
+                except StopAsyncIteration:
+                    break
+            else:
+                # Text is waiting, so a stalled LLM must not hold it back:
+                # wait on the next token without cancelling it on timeout.
+                if next_token is None:
+                    next_token = asyncio.ensure_future(anext(iterator))
+                timeout = delay_ms / 1000 if chunker.pending else None
+                done, _ = await asyncio.wait({next_token}, timeout=timeout)
+                if not done:
+                    held = chunker.flush()
+                    if held:
+                        metrics.incr("tts_chunker.timed_flushes")
+                        yield held
+                    continue
+                pending, next_token = next_token, None
+                try:
+                    token = pending.result()
+                except StopAsyncIteration:
+                    break
+            for chunk in chunker.push(token):
+                yield chunk
+        tail = chunker.flush()
+        if tail:
+            yield tail
+    finally:
+        if next_token is not None:
+            next_token.cancel()
+            await asyncio.wait({next_token})
+        # Pass an early close on to the token source (and so to the LLM
+        # stream behind it); the pending anext has to finish first.
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -4,23 +4,53 @@ import asyncio
 import base64
 import json
 import logging
+import time
+from collections import deque
 from collections.abc import AsyncGenerator
-from typing import Protocol, runtime_checkable
+from typing import Any, Protocol, runtime_checkable
 
+import httpx
 import websockets
+from websockets.asyncio.client import ClientConnection
+from websockets.protocol import State
 
 from src.api.config import settings
+from src.api.metrics import metrics
+from src.api.voice.connection_pool import WarmConnectionPool
+from src.api.voice.streams import ClosableQueue
 
 logger = logging.getLogger(__name__)
 
-ELEVENLABS_WS_URL = "wss://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream-input"
+ELEVENLABS_WS_URL = (
+    f"{settings.elevenlabs_ws_url}/v1/text-to-speech/{{voice_id}}/stream-input"
+)
+ELEVENLABS_MULTI_WS_URL = (
+    f"{settings.elevenlabs_ws_url}/v1/text-to-speech/{{voice_id}}/multi-stream-input"
+)
 DEEPGRAM_WS_URL = (
-    "wss://api.deepgram.com/v1/speak?encoding=mulaw&sample_rate=8000&model={model}"
+    f"{settings.deepgram_ws_url}/v1/speak"
+    "?encoding=mulaw&sample_rate=8000&model={model}"
 )
+ELEVENLABS_REST_URL = f"{settings.elevenlabs_api_url}/v1/text-to-speech/{{voice_id}}"
+DEEPGRAM_REST_URL = f"{settings.deepgram_api_url}/v1/speak"
+ELEVENLABS_VOICE_SETTINGS = {"stability": 0.5, "similarity_boost": 0.75}
+OUTPUT_FORMAT = "ulaw_8000"
+# ElevenLabs closes stream-input sockets after 20 s without text; a lone space
+# resets that timer without producing audio.
+ELEVENLABS_KEEPALIVE = json.dumps({"text": " "})
+# Multi-context sockets stay open up to this long without text; empty text
+# to a context that never speaks resets the timer.
+ELEVENLABS_INACTIVITY_TIMEOUT_S = 180
+ELEVENLABS_MULTI_KEEPALIVE = json.dumps({"context_id": "keepalive", "text": ""})
+# 8 kHz μ-law per character of speech, at a brisk 20 chars/s, so text counts
+# as spoken slightly early rather than being replayed twice after a failover.
+SPOKEN_BYTES_PER_CHAR = 400
 
 
 @runtime_checkable
 class TTSProvider(Protocol):
+    provider: str
+
     async def connect(self) -> None: ...
     async def send_text(self, text: str) -> None: ...
     async def flush(self) -> None: ...
@@ -29,25 +59,99 @@ class TTSProvider(Protocol):
     async def close(self) -> None: ...
 
 
+async def _open_elevenlabs_ws() -> ClientConnection:
+    model = settings.elevenlabs_model_id
+    params = f"?model_id={model}&output_format={OUTPUT_FORMAT}"
+    if settings.elevenlabs_multi_context:
+        # Voice settings go with each context's first message instead.
+        url = ELEVENLABS_MULTI_WS_URL.format(voice_id=settings.elevenlabs_voice_id)
+        return await websockets.connect(
+            f"{url}{params}&inactivity_timeout={ELEVENLABS_INACTIVITY_TIMEOUT_S}",
+            additional_headers={"xi-api-key": settings.elevenlabs_api_key},
+        )
+    url = ELEVENLABS_WS_URL.format(voice_id=settings.elevenlabs_voice_id)
+    ws = await websockets.connect(f"{url}{params}")
+    init_msg = {
+        "text": " ",
+        "voice_settings": ELEVENLABS_VOICE_SETTINGS,
+        "xi_api_key": settings.elevenlabs_api_key,
+    }
+    await ws.send(json.dumps(init_msg))
+    return ws
+
+
+async def _open_deepgram_ws() -> ClientConnection:
+    url = DEEPGRAM_WS_URL.format(model=settings.deepgram_tts_model)
+    return await websockets.connect(
+        url,
+        additional_headers={"Authorization": f"Token {settings.deepgram_api_key}"},
+    )
+
+
+async def _open_provider_ws(provider: str) -> ClientConnection:
+    if provider == "elevenlabs":
+        return await _open_elevenlabs_ws()
+    return await _open_deepgram_ws()
+
+
+async def _close_ws(ws: ClientConnection) -> None:
+    await ws.close()
+
+
+async def _keepalive_idle(provider: str, ws: ClientConnection) -> None:
+    if provider == "elevenlabs" and settings.elevenlabs_multi_context:
+        await ws.send(ELEVENLABS_MULTI_KEEPALIVE)
+    elif provider == "elevenlabs":
+        await ws.send(ELEVENLABS_KEEPALIVE)
+    else:
+        await ws.ping()
+
+
+def _ws_is_open(ws: ClientConnection) -> bool:
+    return ws.state is State.OPEN
+
+
+def configured_providers() -> list[str]:
+    providers = []
+    if settings.deepgram_api_key:
+        providers.append("deepgram")
+    if settings.elevenlabs_api_key:
+        providers.append("elevenlabs")
+    return providers
+
+
+TTSPool = WarmConnectionPool[str, ClientConnection]
+
+_tts_pool: TTSPool | None = None
+
+
+def get_tts_pool() -> TTSPool:
+    global _tts_pool
+    if _tts_pool is None:
+        _tts_pool = WarmConnectionPool(
+            "tts",
+            opener=_open_provider_ws,
+            closer=_close_ws,
+            is_open=_ws_is_open,
+            size=settings.tts_pool_size,
+            max_age=settings.tts_pool_max_age_s,
+            keepalive=_keepalive_idle,
+            keepalive_interval=DeepgramTTS._KEEPALIVE_INTERVAL,
+        )
+    return _tts_pool
+
+
 class ElevenLabsTTS:
+    provider = "elevenlabs"
+
     def __init__(self) -> None:
         self._ws: websockets.WebSocketClientProtocol | None = None
-        self._audio_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._audio_queue: ClosableQueue[bytes] = ClosableQueue()
         self._running = False
         self._reconnect_task: asyncio.Task[None] | None = None
 
-    async def _open_ws(self) -> websockets.WebSocketClientProtocol:
-        url = ELEVENLABS_WS_URL.format(voice_id=settings.elevenlabs_voice_id)
-        model = settings.elevenlabs_model_id
-        params = f"?model_id={model}&output_format=ulaw_8000"
-        ws = await websockets.connect(f"{url}{params}")
-        init_msg = {
-            "text": " ",
-            "voice_settings": {"stability": 0.5, "similarity_boost": 0.75},
-            "xi_api_key": settings.elevenlabs_api_key,
-        }
-        await ws.send(json.dumps(init_msg))
-        return ws
+    async def _open_ws(self) -> ClientConnection:
+        return await get_tts_pool().acquire(self.provider)
 
     async def connect(self) -> None:
         self._ws = await self._open_ws()
@@ -85,8 +189,13 @@ class ElevenLabsTTS:
                 await self._ws.close()
         except Exception:
             pass
-        self._ws = await self._open_ws()
-        asyncio.create_task(self._receive_loop())
+        try:
+            self._ws = await self._open_ws()
+            asyncio.create_task(self._receive_loop())
+        except Exception as e:
+            logger.error("ElevenLabs TTS reconnect failed: %s", e)
+            self._running = False
+            self._audio_queue.close()
 
     async def _ensure_connected(self) -> None:
         if self._reconnect_task is not None:
@@ -109,47 +218,172 @@ class ElevenLabsTTS:
             await self._ws.send(json.dumps(msg))
 
     async def interrupt(self) -> None:
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        self._audio_queue.clear()
         if self._ws and self._running:
             await self._ws.close()
             await self.connect()
 
     async def get_audio(self) -> AsyncGenerator[bytes, None]:
-        while True:
-            if not self._running and self._audio_queue.empty():
-                break
+        async for audio in self._audio_queue.stream():
+            yield audio
+
+    async def close(self) -> None:
+        self._running = False
+        self._audio_queue.close()
+        if self._ws:
+            await self._ws.close()
+
+
+class ElevenLabsMultiContextTTS:
+    # One socket for the whole call: each turn is spoken in its own context,
+    # and an interrupt closes contexts instead of reopening the socket.
+    provider = "elevenlabs"
+    _KEEPALIVE_INTERVAL = 15
+
+    def __init__(self) -> None:
+        self._ws: ClientConnection | None = None
+        self._audio_queue: ClosableQueue[bytes] = ClosableQueue()
+        self._running = False
+        self._keepalive_task: asyncio.Task[None] | None = None
+        self._contexts = 0
+        # Context taking text for the turn in progress.
+        self._context_id: str | None = None
+        # Contexts still producing audio, in the order they are heard. Audio
+        # for a later context is held until the ones before it are final;
+        # audio for contexts not listed here (interrupted) is dropped.
+        self._playing: deque[str] = deque()
+        self._held: dict[str, list[bytes]] = {}
+        self._final: set[str] = set()
+
+    async def connect(self) -> None:
+        self._ws = await get_tts_pool().acquire(self.provider)
+        self._running = True
+        asyncio.create_task(self._receive_loop())
+        self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _keepalive_loop(self) -> None:
+        while self._running and self._ws:
             try:
-                audio = await asyncio.wait_for(self._audio_queue.get(), timeout=0.5)
-                yield audio
-            except asyncio.TimeoutError:
-                continue
+                await asyncio.sleep(self._KEEPALIVE_INTERVAL)
+                if self._ws and self._running:
+                    await self._ws.send(ELEVENLABS_MULTI_KEEPALIVE)
+            except Exception:
+                break
+
+    async def _receive_loop(self) -> None:
+        if not self._ws:
+            return
+        try:
+            async for message in self._ws:
+                await self._handle_message(json.loads(message))
+        except websockets.exceptions.ConnectionClosed:
+            if self._running:
+                logger.warning("ElevenLabs TTS connection closed")
+        except Exception as e:
+            logger.error("ElevenLabs TTS receive error: %s", e)
+        finally:
+            # No reconnect: TTSWithFallback fails over once this stream ends.
+            self._running = False
+            self._audio_queue.close()
+
+    async def _handle_message(self, data: dict[str, Any]) -> None:
+        if "error" in data:
+            logger.error("ElevenLabs error: %s", data)
+        context_id = data.get("contextId", "")
+        audio_b64 = data.get("audio")
+        if audio_b64 and context_id in self._held:
+            await self._deliver(context_id, base64.b64decode(audio_b64))
+        if data.get("isFinal"):
+            await self._finish(context_id)
+
+    async def _deliver(self, context_id: str, audio: bytes) -> None:
+        if self._playing[0] == context_id:
+            await self._audio_queue.put(audio)
+        else:
+            self._held[context_id].append(audio)
+
+    async def _finish(self, context_id: str) -> None:
+        if context_id not in self._held:
+            return
+        self._final.add(context_id)
+        while self._playing and self._playing[0] in self._final:
+            done = self._playing.popleft()
+            self._final.discard(done)
+            del self._held[done]
+            if self._playing:
+                head = self._playing[0]
+                for chunk in self._held[head]:
+                    await self._audio_queue.put(chunk)
+                self._held[head].clear()
+
+    async def send_text(self, text: str) -> None:
+        if not (self._ws and self._running):
+            return
+        msg: dict[str, object] = {"text": text}
+        if self._context_id is None:
+            self._contexts += 1
+            self._context_id = f"turn-{self._contexts}"
+            self._playing.append(self._context_id)
+            self._held[self._context_id] = []
+            msg["voice_settings"] = ELEVENLABS_VOICE_SETTINGS
+        msg["context_id"] = self._context_id
+        await self._ws.send(json.dumps(msg))
+
+    async def flush(self) -> None:
+        context_id, self._context_id = self._context_id, None
+        if context_id is None or not (self._ws and self._running):
+            return
+        # Closing after the flush lets the flushed text finish, then the
+        # context reports isFinal.
+        await self._ws.send(json.dumps({"context_id": context_id, "flush": True}))
+        await self._ws.send(
+            json.dumps({"context_id": context_id, "close_context": True})
+        )
+
+    async def interrupt(self) -> None:
+        self._audio_queue.clear()
+        self._context_id = None
+        cancelled = list(self._playing)
+        self._playing.clear()
+        self._held.clear()
+        self._final.clear()
+        # Audio still in flight for these contexts is dropped on arrival.
+        metrics.incr("tts.contexts_cancelled", len(cancelled))
+        if self._ws and self._running:
+            for context_id in cancelled:
+                msg = {"context_id": context_id, "close_context": True}
+                await self._ws.send(json.dumps(msg))
+
+    async def get_audio(self) -> AsyncGenerator[bytes, None]:
+        async for audio in self._audio_queue.stream():
+            yield audio
 
     async def close(self) -> None:
         self._running = False
+        self._audio_queue.close()
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
         if self._ws:
+            try:
+                await self._ws.send(json.dumps({"close_socket": True}))
+            except Exception:
+                pass
             await self._ws.close()
 
 
 class DeepgramTTS:
+    provider = "deepgram"
     _KEEPALIVE_INTERVAL = 8
 
     def __init__(self) -> None:
         self._ws: websockets.WebSocketClientProtocol | None = None
-        self._audio_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._audio_queue: ClosableQueue[bytes] = ClosableQueue()
         self._running = False
         self._keepalive_task: asyncio.Task[None] | None = None
         self._reconnect_task: asyncio.Task[None] | None = None
 
-    async def _open_ws(self) -> websockets.WebSocketClientProtocol:
-        url = DEEPGRAM_WS_URL.format(model=settings.deepgram_tts_model)
-        return await websockets.connect(
-            url,
-            additional_headers={"Authorization": f"Token {settings.deepgram_api_key}"},
-        )
+    async def _open_ws(self) -> ClientConnection:
+        return await get_tts_pool().acquire(self.provider)
 
     async def connect(self) -> None:
         self._ws = await self._open_ws()
@@ -184,6 +418,7 @@ class DeepgramTTS:
         except Exception as e:
             logger.error("Deepgram TTS reconnect failed: %s", e)
             self._running = False
+            self._audio_queue.close()
 
     async def _ensure_connected(self) -> None:
         if self._reconnect_task is not None:
@@ -231,11 +466,7 @@ class DeepgramTTS:
                 self._start_background_reconnect()
 
     async def interrupt(self) -> None:
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        self._audio_queue.clear()
         if self._ws and self._running:
             msg = {"type": "Clear"}
             try:
@@ -244,17 +475,12 @@ class DeepgramTTS:
                 pass
 
     async def get_audio(self) -> AsyncGenerator[bytes, None]:
-        while True:
-            if not self._running and self._audio_queue.empty():
-                break
-            try:
-                audio = await asyncio.wait_for(self._audio_queue.get(), timeout=0.5)
-                yield audio
-            except asyncio.TimeoutError:
-                continue
+        async for audio in self._audio_queue.stream():
+            yield audio
 
     async def close(self) -> None:
         self._running = False
+        self._audio_queue.close()
         if self._keepalive_task:
             self._keepalive_task.cancel()
         if self._ws:
@@ -266,11 +492,64 @@ class DeepgramTTS:
             await self._ws.close()
 
 
+def provider_voice(provider: str) -> str:
+    if provider == "elevenlabs":
+        return f"{settings.elevenlabs_voice_id}:{settings.elevenlabs_model_id}"
+    return settings.deepgram_tts_model
+
+
+async def synthesize_clip(text: str, provider: str) -> bytes:
+    api_key = (
+        settings.elevenlabs_api_key
+        if provider == "elevenlabs"
+        else settings.deepgram_api_key
+    )
+    if not api_key:
+        raise RuntimeError(f"TTS provider {provider} is not configured")
+
+    async with httpx.AsyncClient(timeout=15.0) as client:
+        if provider == "elevenlabs":
+            response = await client.post(
+                ELEVENLABS_REST_URL.format(voice_id=settings.elevenlabs_voice_id),
+                params={"output_format": OUTPUT_FORMAT},
+                headers={"xi-api-key": settings.elevenlabs_api_key},
+                json={
+                    "text": text,
+                    "model_id": settings.elevenlabs_model_id,
+                    "voice_settings": ELEVENLABS_VOICE_SETTINGS,
+                },
+            )
+        else:
+            response = await client.post(
+                DEEPGRAM_REST_URL,
+                params={
+                    "model": settings.deepgram_tts_model,
+                    "encoding": "mulaw",
+                    "sample_rate": 8000,
+                    "container": "none",
+                },
+                headers={"Authorization": f"Token {settings.deepgram_api_key}"},
+                json={"text": text},
+            )
+        response.raise_for_status()
+        return response.content
+
+
+def _elevenlabs() -> TTSProvider:
+    if settings.elevenlabs_multi_context:
+        return ElevenLabsMultiContextTTS()
+    return ElevenLabsTTS()
+
+
+def _new_provider(provider: str) -> TTSProvider:
+    return _elevenlabs() if provider == "elevenlabs" else DeepgramTTS()
+
+
 def _build_provider_pair() -> tuple[TTSProvider, TTSProvider]:
     primary_name = settings.tts_provider.lower()
     if primary_name == "elevenlabs":
-        return ElevenLabsTTS(), DeepgramTTS()
-    return DeepgramTTS(), ElevenLabsTTS()
+        return _elevenlabs(), DeepgramTTS()
+    return DeepgramTTS(), _elevenlabs()
 
 
 class TTSWithFallback:
@@ -279,37 +558,188 @@ class TTSWithFallback:
         self._primary: TTSProvider = primary
         self._fallback: TTSProvider = fallback
         self._active: TTSProvider | None = None
+        self._standby: TTSProvider | None = None
+        self._audio: ClosableQueue[bytes] = ClosableQueue()
+        self._lock = asyncio.Lock()
+        self._pump_task: asyncio.Task[None] | None = None
+        self._stall_task: asyncio.Task[None] | None = None
+        self._failover_task: asyncio.Task[None] | None = None
+        self._switching = False
+        self._closed = False
+        # Text sent this turn that the audio heard so far does not cover yet.
+        self._unspoken: deque[str] = deque()
+        self._heard_bytes = 0
+        self._flushed = False
+        self._flush_at = 0.0
+        self._last_audio_at = 0.0
+
+    def _connect_order(self) -> tuple[TTSProvider, TTSProvider]:
+        # Skip straight to the fallback while the pool has seen the primary
+        # fail, so call setup does not wait on a dead provider's handshake.
+        pool = get_tts_pool()
+        primary, fallback = self._primary, self._fallback
+        if not pool.healthy(primary.provider) and pool.healthy(fallback.provider):
+            return fallback, primary
+        return primary, fallback
 
     async def connect(self) -> None:
+        first, second = self._connect_order()
         try:
-            await self._primary.connect()
-            self._active = self._primary
+            await first.connect()
+            # Without credentials the standby could never connect, and a
+            # failover to it would only leave the call silent.
+            standby = second if second.provider in configured_providers() else None
+            self._active, self._standby = first, standby
         except Exception:
             logger.warning(
-                "Primary TTS (%s) failed, falling back to %s",
-                type(self._primary).__name__,
-                type(self._fallback).__name__,
+                "TTS (%s) failed, falling back to %s",
+                type(first).__name__,
+                type(second).__name__,
             )
-            await self._fallback.connect()
-            self._active = self._fallback
+            await second.connect()
+            self._active, self._standby = second, None
 
     async def send_text(self, text: str) -> None:
-        if self._active:
-            await self._active.send_text(text)
+        if not self._active:
+            return
+        async with self._lock:
+            self._unspoken.append(text)
+            if self._switching:
+                return  # replayed once the standby is connected
+            try:
+                await self._active.send_text(text)
+            except Exception as e:
+                self._start_failover(f"send_text failed: {e}")
 
     async def flush(self) -> None:
-        if self._active:
-            await self._active.flush()
+        if not self._active:
+            return
+        async with self._lock:
+            self._flushed = True
+            self._flush_at = time.monotonic()
+            if self._switching:
+                return
+            try:
+                await self._active.flush()
+            except Exception as e:
+                self._start_failover(f"flush failed: {e}")
+                return
+        if self._unspoken and (self._stall_task is None or self._stall_task.done()):
+            self._stall_task = asyncio.create_task(self._watch_for_stall())
+
+    @property
+    def pending(self) -> bool:
+        # Text has been sent that the audio so far does not cover yet.
+        return bool(self._unspoken)
 
     async def interrupt(self) -> None:
-        if self._active:
+        self._reset_turn()
+        self._audio.clear()
+        if self._active and not self._switching:
             await self._active.interrupt()
 
     async def get_audio(self) -> AsyncGenerator[bytes, None]:
-        if self._active:
-            async for chunk in self._active.get_audio():
-                yield chunk
+        if self._pump_task is None and self._active:
+            self._pump_task = asyncio.create_task(self._pump(self._active))
+        async for chunk in self._audio.stream():
+            yield chunk
 
     async def close(self) -> None:
+        self._closed = True
+        for task in (self._pump_task, self._stall_task, self._failover_task):
+            if task:
+                task.cancel()
         if self._active:
             await self._active.close()
+        self._audio.close()
+
+    def _reset_turn(self) -> None:
+        self._unspoken.clear()
+        self._heard_bytes = 0
+        self._flushed = False
+
+    async def _pump(self, provider: TTSProvider) -> None:
+        async for chunk in provider.get_audio():
+            self._last_audio_at = time.monotonic()
+            self._mark_spoken(len(chunk))
+            await self._audio.put(chunk)
+        # Providers only close their audio stream on close() or after
+        # giving up on reconnecting.
+        self._start_failover(f"{provider.provider} audio stream closed")
+
+    def _mark_spoken(self, audio_bytes: int) -> None:
+        self._heard_bytes += audio_bytes
+        unspoken = self._unspoken
+        while unspoken:
+            needed = len(unspoken[0]) * SPOKEN_BYTES_PER_CHAR
+            if self._heard_bytes < needed:
+                break
+            self._heard_bytes -= needed
+            unspoken.popleft()
+        if not unspoken:
+            self._reset_turn()
+
+    async def _watch_for_stall(self) -> None:
+        timeout = settings.tts_stall_timeout_ms / 1000
+        while self._unspoken and not self._closed:
+            quiet = time.monotonic() - max(self._flush_at, self._last_audio_at)
+            if quiet >= timeout:
+                self._start_failover(f"no audio for {quiet * 1000:.0f} ms after flush")
+                return
+            await asyncio.sleep(timeout - quiet)
+
+    def _start_failover(self, reason: str) -> None:
+        if self._closed or self._switching or self._standby is None:
+            return
+        self._switching = True
+        self._failover_task = asyncio.create_task(self._failover(reason))
+
+    async def _failover(self, reason: str) -> None:
+        started = time.monotonic()
+        failed, standby = self._active, self._standby
+        if failed is None or standby is None:
+            self._switching = False
+            return
+        logger.warning(
+            "TTS %s failed mid-call (%s), switching to %s",
+            failed.provider,
+            reason,
+            standby.provider,
+        )
+        metrics.incr("tts.failovers")
+        # The failed provider's pump keeps running until the standby is up:
+        # if the standby cannot connect, the primary is still all there is.
+        try:
+            await asyncio.wait_for(
+                standby.connect(), timeout=settings.tts_failover_timeout_ms / 1000
+            )
+        except Exception as e:
+            logger.error("TTS failover to %s failed: %s", standby.provider, e)
+            metrics.incr("tts.failover_failures")
+            self._switching = False
+            return
+
+        if self._pump_task:
+            self._pump_task.cancel()
+        async with self._lock:
+            self._active, self._standby = standby, _new_provider(failed.provider)
+            self._heard_bytes = 0
+            if self._unspoken:
+                await standby.send_text("".join(self._unspoken))
+                if self._flushed:
+                    self._flush_at = time.monotonic()
+                    await standby.flush()
+            self._switching = False
+        if self._pump_task:
+            self._pump_task = asyncio.create_task(self._pump(standby))
+        metrics.observe("tts.failover_ms", (time.monotonic() - started) * 1000)
+        asyncio.create_task(_close_quietly(failed))
+        if self._flushed and self._unspoken:
+            self._stall_task = asyncio.create_task(self._watch_for_stall())
+
+
+async def _close_quietly(provider: TTSProvider) -> None:
+    try:
+        await provider.close()
+    except Exception:
+        pass
@@ -3,118 +3,108 @@ from __future__ import annotations
 import asyncio
 import base64
 import json
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING
 
-from src.api.agents.orchestrator import BusinessContext, CallSession, process_utterance
-from src.api.voice.audio_utils import decode_twilio_media
-from src.api.voice.stt import DeepgramSTT
-from src.api.voice.tts import TTSWithFallback
+from src.api.voice.packetizer import TwilioMediaSender
+from src.api.voice.pipeline import CallPipeline
+from src.api.voice.stt import TWILIO_MULAW
 
 if TYPE_CHECKING:
-    import websockets
+    from collections.abc import Awaitable
+
+    from fastapi import WebSocket
     from sqlalchemy.ext.asyncio import AsyncSession
+    from websockets.asyncio.server import ServerConnection
 
+    from src.api.agents.orchestrator import BusinessContext
 
-class TwilioCallHandler:
-    def __init__(
-        self,
-        twilio_ws: websockets.WebSocketServerProtocol,
-        business_context: BusinessContext,
-        db_session: AsyncSession,
-    ) -> None:
-        self._twilio_ws = twilio_ws
-        self._stt = DeepgramSTT()
-        self._tts = TTSWithFallback()
-        self._call_session = CallSession(business=business_context, session=db_session)
-        self._stream_sid: str | None = None
-        self._is_speaking = False
-        self._current_response_task: asyncio.Task | None = None
 
-    async def handle(self) -> None:
-        await self._stt.connect()
-        await self._tts.connect()
-
-        greeting = (
-            f"Hi, thanks for calling {self._call_session.business.name}. "
-            "How can I help you?"
-        )
-        await self._tts.send_text(greeting)
-        await self._tts.flush()
-        self._call_session.conversation_history.append(
-            {"role": "agent", "content": greeting}
-        )
-
-        transcription_task = asyncio.create_task(self._process_transcriptions())
-        tts_playback_task = asyncio.create_task(self._stream_tts_to_twilio())
-        bargein_task = asyncio.create_task(self._monitor_bargein())
+class TwilioSocket:
+    # Gives a FastAPI WebSocket the iterate/send(str) interface of a
+    # websockets connection, which is what the handler is written against.
+    def __init__(self, websocket: WebSocket) -> None:
+        self._websocket = websocket
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._websocket.iter_text()
+
+    async def send(self, message: str) -> None:
+        await self._websocket.send_text(message)
+
+    async def close(self, code: int, reason: str = "") -> None:
+        await self._websocket.close(code=code, reason=reason)
 
-        try:
-            async for message in self._twilio_ws:
-                data = json.loads(message)
-                event = data.get("event")
-
-                if event == "start":
-                    self._stream_sid = data["start"]["streamSid"]
-                elif event == "media":
-                    payload = data["media"]["payload"]
-                    pcm = decode_twilio_media(payload)
-                    await self._stt.send_audio(pcm)
-                elif event == "stop":
-                    break
-        finally:
-            await self._stt.close()
-            await self._tts.close()
-            transcription_task.cancel()
-            tts_playback_task.cancel()
-            bargein_task.cancel()
 
-    async def _handle_bargein(self) -> None:
-        if self._current_response_task and not self._current_response_task.done():
-            self._current_response_task.cancel()
+class TwilioTransport:
+    channel = "twilio"
+    barge_in = True
+    echo_suppression_s = 0.0
 
-        await self._tts.interrupt()
+    def __init__(self, twilio_ws: TwilioSocket | ServerConnection) -> None:
+        self._ws = twilio_ws
+        self._sender = TwilioMediaSender(twilio_ws)
+        self._stream_sid: str | None = None
+        # Media sent before Twilio's "start" event has no streamSid to go to.
+        self.ready = asyncio.Event()
+
+    def start(self, stream_sid: str) -> None:
+        self._stream_sid = stream_sid
+        self._sender.start(stream_sid)
+        self.ready.set()
+
+    async def send_audio(self, audio: bytes | memoryview) -> bool:
+        frames_sent = self._sender.frames_sent
+        await self._sender.send(audio)
+        return self._sender.frames_sent > frames_sent
+
+    def in_flight(self) -> float:
+        return self._sender.in_flight()
 
+    async def clear(self) -> None:
+        self._sender.clear()
         if self._stream_sid:
             clear_msg = {
                 "event": "clear",
                 "streamSid": self._stream_sid,
             }
-            await self._twilio_ws.send(json.dumps(clear_msg))
-
-        self._is_speaking = False
-
-    async def _monitor_bargein(self) -> None:
-        while True:
-            await self._stt.wait_for_speech()
-            if self._is_speaking:
-                await self._handle_bargein()
-            self._stt.clear_speech_flag()
-
-    async def _process_transcriptions(self) -> None:
-        async for transcript in self._stt.get_transcripts():
-            self._current_response_task = asyncio.create_task(
-                self._generate_and_speak(transcript)
-            )
-            await self._current_response_task
-
-    async def _generate_and_speak(self, transcript: str) -> None:
-        self._is_speaking = True
+            await self._ws.send(json.dumps(clear_msg))
+
+
+class TwilioCallHandler:
+    def __init__(
+        self,
+        twilio_ws: TwilioSocket | ServerConnection,
+        business: Awaitable[BusinessContext | None],
+        db_session: AsyncSession,
+    ) -> None:
+        self._twilio_ws = twilio_ws
+        self._business = business
+        self._transport = TwilioTransport(twilio_ws)
+        self._pipeline = CallPipeline(self._transport, TWILIO_MULAW, db_session)
+
+    async def handle(self) -> None:
+        # Messages are read while the call is being set up, so Twilio's
+        # "start" event can release the greeting as soon as it is ready.
+        reader = asyncio.create_task(self._read_messages())
         try:
-            async for text_chunk in process_utterance(self._call_session, transcript):
-                await self._tts.send_text(text_chunk)
-            await self._tts.flush()
-        except asyncio.CancelledError:
-            pass
+            if not await self._pipeline.open(self._business):
+                await self._twilio_ws.close(code=1008, reason="Business not found")
+                return
+            await reader
         finally:
-            self._is_speaking = False
-
-    async def _stream_tts_to_twilio(self) -> None:
-        async for audio_chunk in self._tts.get_audio():
-            if self._stream_sid:
-                payload = base64.b64encode(audio_chunk).decode("ascii")
-                msg = {
-                    "event": "media",
-                    "streamSid": self._stream_sid,
-                    "media": {"payload": payload},
-                }
-                await self._twilio_ws.send(json.dumps(msg))
+            reader.cancel()
+            await self._pipeline.close()
+
+    async def _read_messages(self) -> None:
+        async for message in self._twilio_ws:
+            data = json.loads(message)
+            event = data.get("event")
+
+            if event == "start":
+                self._transport.start(data["start"]["streamSid"])
+            elif event == "media":
+                payload = data["media"]["payload"]
+                await self._pipeline.receive_audio(base64.b64decode(payload))
+            elif event == "stop":
+                break
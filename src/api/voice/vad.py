@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import enum
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.api.config import settings
+
+_FULL_SCALE_POWER = 32768.0**2
+
+
+class VADEvent(enum.Enum):
+    SPEECH_START = "speech_start"
+    SPEECH_END = "speech_end"
+
+
+@dataclass(frozen=True)
+class VADConfig:
+    window_ms: int = 20
+    energy_threshold_db: float = -45.0
+    # Above this many zero crossings per sample a window reads as noise or
+    # hiss unless it is also well above the energy threshold.
+    zcr_max: float = 0.3
+    loud_margin_db: float = 12.0
+    start_ms: int = 60
+    hangover_ms: int = 500
+    preroll_ms: int = 300
+
+    @classmethod
+    def from_settings(cls) -> VADConfig:
+        return cls(
+            energy_threshold_db=settings.vad_energy_threshold_db,
+            zcr_max=settings.vad_zcr_max,
+            start_ms=settings.vad_start_ms,
+            hangover_ms=settings.vad_hangover_ms,
+            preroll_ms=settings.vad_preroll_ms,
+        )
+
+
+class VoiceActivityDetector:
+    def __init__(self, sample_rate: int, config: VADConfig | None = None) -> None:
+        self.config = config or VADConfig()
+        self._window = sample_rate * self.config.window_ms // 1000
+        self._start_windows = max(1, self.config.start_ms // self.config.window_ms)
+        self._end_windows = max(1, self.config.hangover_ms // self.config.window_ms)
+        self._pending = np.empty(0, dtype=np.int16)
+        self._speech_run = 0
+        self._silence_run = 0
+        self.in_speech = False
+
+    def reset(self) -> None:
+        self._pending = np.empty(0, dtype=np.int16)
+        self._speech_run = 0
+        self._silence_run = 0
+        self.in_speech = False
+
+    def classify(self, samples: np.ndarray) -> np.ndarray:
+        count = samples.size // self._window
+        windows = samples[: count * self._window].reshape(count, self._window)
+        as_float = windows.astype(np.float32)
+        power = np.einsum("ij,ij->i", as_float, as_float) / self._window
+        level_db = 10 * np.log10(power / _FULL_SCALE_POWER + 1e-12)
+        crossings = np.count_nonzero(np.diff(np.signbit(windows), axis=1), axis=1)
+        zcr = crossings / self._window
+
+        cfg = self.config
+        loud = level_db > cfg.energy_threshold_db
+        voiced = zcr < cfg.zcr_max
+        very_loud = level_db > cfg.energy_threshold_db + cfg.loud_margin_db
+        result: np.ndarray = loud & (voiced | very_loud)
+        return result
+
+    def process(self, pcm: bytes | memoryview) -> VADEvent | None:
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if self._pending.size:
+            samples = np.concatenate((self._pending, samples))
+        whole = samples.size - samples.size % self._window
+        self._pending = samples[whole:].copy()
+        if not whole:
+            return None
+
+        event: VADEvent | None = None
+        for is_speech in self.classify(samples[:whole]).tolist():
+            if is_speech:
+                self._speech_run += 1
+                self._silence_run = 0
+            else:
+                self._silence_run += 1
+                self._speech_run = 0
+
+            if not self.in_speech and self._speech_run >= self._start_windows:
+                self.in_speech = True
+                event = VADEvent.SPEECH_START
+            elif self.in_speech and self._silence_run >= self._end_windows:
+                self.in_speech = False
+                event = VADEvent.SPEECH_END
+        return event
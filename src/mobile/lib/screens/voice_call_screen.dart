@@ -43,8 +43,8 @@ class _VoiceCallScreenState extends State<VoiceCallScreen> {
     setState(() => _status = 'Requesting mic access...');
 
     _audioService = WebAudioService(
-      onAudioCaptured: (base64Pcm) {
-        _voiceService?.sendAudio(base64Pcm);
+      onAudioCaptured: (pcm) {
+        _voiceService?.sendAudio(pcm);
         if (mounted) setState(() => _sentChunks++);
       },
     );
@@ -62,6 +62,7 @@ class _VoiceCallScreenState extends State<VoiceCallScreen> {
         _audioService?.playAudioChunk(audio);
         if (mounted) setState(() => _receivedChunks++);
       },
+      onClear: () => _audioService?.stopPlayback(),
       onDisconnected: () {
         if (mounted) _disconnect();
       },
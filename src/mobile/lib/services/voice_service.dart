@@ -1,26 +1,37 @@
 import 'dart:async';
 import 'dart:convert';
+import 'dart:typed_data';
 
 import 'package:flutter/foundation.dart';
 import 'package:web_socket_channel/web_socket_channel.dart';
 
 import '../config.dart';
 
+// Binary audio frames: kind (u8), flags (u8), sequence (u16 BE), raw audio.
+const int _frameAudio = 0x01;
+const int _frameHeaderSize = 4;
+
 class VoiceService {
   WebSocketChannel? _channel;
   StreamSubscription<dynamic>? _subscription;
-  final void Function(String base64Audio)? onAudioReceived;
+  final void Function(Uint8List audio)? onAudioReceived;
+  // The caller barged in: drop any agent audio still queued for playback.
+  final void Function()? onClear;
   final void Function()? onDisconnected;
   bool _intentionalClose = false;
   bool _configSent = false;
+  bool _binaryTransport = false;
+  int _sequence = 0;
 
-  VoiceService({this.onAudioReceived, this.onDisconnected});
+  VoiceService({this.onAudioReceived, this.onClear, this.onDisconnected});
 
   bool get isConnected => _channel != null;
 
   Future<void> connect(String businessPhone, {int sampleRate = 48000}) async {
     _intentionalClose = false;
     _configSent = false;
+    _binaryTransport = false;
+    _sequence = 0;
     final uri =
         Uri.parse('${AppConfig.wsBaseUrl}/voice/browser-ws/$businessPhone');
     debugPrint('VoiceService: connecting to $uri');
@@ -32,6 +43,7 @@ class VoiceService {
       _channel!.sink.add(jsonEncode({
         'event': 'config',
         'sampleRate': sampleRate,
+        'transport': 'binary',
       }));
       _configSent = true;
     } catch (error) {
@@ -42,11 +54,24 @@ class VoiceService {
     _subscription = _channel!.stream.listen(
       (message) {
         try {
+          if (message is List<int>) {
+            final frame = Uint8List.fromList(message);
+            if (frame.length > _frameHeaderSize && frame[0] == _frameAudio) {
+              onAudioReceived
+                  ?.call(Uint8List.sublistView(frame, _frameHeaderSize));
+            }
+            return;
+          }
           final data = jsonDecode(message as String) as Map<String, dynamic>;
-          if (data['event'] == 'media') {
+          if (data['event'] == 'config_ack') {
+            // Older servers never ack, so audio stays on JSON for them.
+            _binaryTransport = data['transport'] == 'binary';
+          } else if (data['event'] == 'media') {
             final payload =
                 (data['media'] as Map<String, dynamic>)['payload'] as String;
-            onAudioReceived?.call(payload);
+            onAudioReceived?.call(base64Decode(payload));
+          } else if (data['event'] == 'clear') {
+            onClear?.call();
           }
         } catch (e) {
           debugPrint('VoiceService: error parsing message: $e');
@@ -69,12 +94,22 @@ class VoiceService {
     );
   }
 
-  void sendAudio(String base64Audio) {
+  void sendAudio(Uint8List pcm) {
     if (_channel == null || !_configSent) return;
     try {
+      if (_binaryTransport) {
+        final frame = Uint8List(_frameHeaderSize + pcm.length);
+        frame[0] = _frameAudio;
+        frame[2] = (_sequence >> 8) & 0xFF;
+        frame[3] = _sequence & 0xFF;
+        frame.setRange(_frameHeaderSize, frame.length, pcm);
+        _sequence = (_sequence + 1) & 0xFFFF;
+        _channel!.sink.add(frame);
+        return;
+      }
       _channel!.sink.add(jsonEncode({
         'event': 'media',
-        'media': {'payload': base64Audio},
+        'media': {'payload': base64Encode(pcm)},
       }));
     } catch (e) {
       debugPrint('VoiceService: error sending audio: $e');
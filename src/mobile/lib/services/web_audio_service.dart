@@ -1,5 +1,4 @@
 import 'dart:async';
-import 'dart:convert';
 import 'dart:js_interop';
 import 'dart:typed_data';
 
@@ -45,7 +44,9 @@ class WebAudioService {
   web.AudioContext? _captureContext;
   web.AudioContext? _playbackContext;
   double _playbackTime = 0;
-  final void Function(String base64Pcm)? onAudioCaptured;
+  // Sources started or scheduled to start, so a clear can stop them.
+  final List<web.AudioBufferSourceNode> _scheduled = [];
+  final void Function(Uint8List pcm)? onAudioCaptured;
   bool _capturing = false;
   int sampleRate = 48000;
 
@@ -85,8 +86,7 @@ class WebAudioService {
       final float32List = channelData.toDart;
 
       final pcm16 = _float32ToPcm16(float32List);
-      final b64 = base64Encode(pcm16.buffer.asUint8List());
-      onAudioCaptured?.call(b64);
+      onAudioCaptured?.call(pcm16.buffer.asUint8List());
     }.toJS;
 
     source.connect(processor);
@@ -101,9 +101,8 @@ class WebAudioService {
     _mediaStream = null;
   }
 
-  void playAudioChunk(String base64Audio) {
+  void playAudioChunk(Uint8List bytes) {
     _playbackContext ??= web.AudioContext();
-    final bytes = base64Decode(base64Audio);
 
     final float32 = Float32List(bytes.length);
     for (var i = 0; i < bytes.length; i++) {
@@ -116,6 +115,10 @@ class WebAudioService {
     final source = _playbackContext!.createBufferSource();
     source.buffer = buffer;
     source.connect(_playbackContext!.destination);
+    _scheduled.add(source);
+    source.onended = ((web.Event _) {
+      _scheduled.remove(source);
+    }).toJS;
 
     final now = _playbackContext!.currentTime;
     if (_playbackTime < now) _playbackTime = now;
@@ -123,8 +126,17 @@ class WebAudioService {
     _playbackTime += float32.length / 8000;
   }
 
+  void stopPlayback() {
+    for (final source in _scheduled) {
+      source.stop();
+    }
+    _scheduled.clear();
+    _playbackTime = 0;
+  }
+
   void dispose() {
     stopCapture();
+    stopPlayback();
     _playbackContext?.close();
     _playbackContext = null;
   }